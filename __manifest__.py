@@ -33,10 +33,15 @@
     'data': [
         'jewellery_evaluator/security/jewellery_evaluator_security.xml',
         'jewellery_evaluator/security/ir.model.access.csv',
+        'jewellery_evaluator/views/gold_price_source_views.xml',
+        'jewellery_evaluator/views/diamond_price_grid_views.xml',
+        'jewellery_evaluator/views/jewellery_job_views.xml',
+        'jewellery_evaluator/views/pricing_run_views.xml',
         'jewellery_evaluator/views/jewellery_evaluator_config_views.xml',
         'jewellery_evaluator/views/pos_config_views.xml',
         'jewellery_evaluator/views/pos_order_views.xml',
         'jewellery_evaluator/views/product_template_views.xml',
+        'jewellery_evaluator/views/product_pricelist_item_views.xml',
         'jewellery_evaluator/views/account_move_views.xml',
         'jewellery_evaluator/report/paperformat_gold.xml',
         'jewellery_evaluator/report/report_invoice_gold.xml',
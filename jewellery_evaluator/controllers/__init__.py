@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+from . import main  # noqa: F401
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import hmac
+import json
+import logging
+import math
+import os
+
+from odoo import http
+from odoo.http import request
+
+from .. import metrics
+
+_logger = logging.getLogger(__name__)
+
+INGEST_METALS = ('gold', 'silver')
+
+
+def _json_response(payload, status=200):
+    return request.make_response(
+        json.dumps(payload),
+        headers=[('Content-Type', 'application/json')],
+        status=status,
+    )
+
+
+def _check_bearer_token(param_key):
+    """
+    True if the request carries 'Authorization: Bearer <token>' matching the
+    system parameter. An empty parameter disables the endpoint.
+    """
+    expected = request.env['ir.config_parameter'].sudo().get_param(param_key, '')
+    if not expected:
+        return False
+    header = request.httprequest.headers.get('Authorization', '')
+    scheme, _sep, token = header.partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return False
+    return hmac.compare_digest(token.strip().encode(), expected.encode())
+
+
+class JewelleryPriceIngestController(http.Controller):
+
+    @http.route('/jewellery_evaluator/prices', type='http', auth='public',
+                methods=['POST'], csrf=False, save_session=False)
+    def ingest_prices(self, **kwargs):
+        """
+        Accept pushed prices as a JSON body, e.g.
+        {"gold": 5415.0, "silver": 53.2, "source": "upstream-feed"}.
+        Records a tick per metal and triggers repricing immediately. The body's
+        "source" only labels the ticks; their source is always 'push'.
+        """
+        if not _check_bearer_token('jewellery_evaluator.price_ingest_token'):
+            _logger.warning('Rejected price push from %s: invalid or missing token',
+                            request.httprequest.remote_addr)
+            return _json_response({'error': 'Unauthorized'}, status=401)
+
+        try:
+            payload = json.loads(request.httprequest.get_data(as_text=True) or '{}')
+        except ValueError:
+            return _json_response({'error': 'Body must be valid JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return _json_response({'error': 'Body must be a JSON object'}, status=400)
+
+        prices = {}
+        for metal in INGEST_METALS:
+            if payload.get(metal) is None:
+                continue
+            try:
+                price = float(payload[metal])
+            except (TypeError, ValueError):
+                return _json_response({'error': f'Invalid {metal} price'}, status=400)
+            if not math.isfinite(price):
+                return _json_response({'error': f'{metal} price must be finite'}, status=400)
+            if price <= 0:
+                return _json_response(
+                    {'error': f'{metal} price must be greater than 0'}, status=400)
+            prices[metal] = price
+        if not prices:
+            return _json_response(
+                {'error': 'No price given; expected "gold" and/or "silver"'}, status=400)
+
+        # The client's source is only a label: tick sources drive how ticks are applied
+        label = str(payload.get('source') or '')[:64] or None
+        ticks = request.env['jewellery.price.tick'].sudo().record_ticks(
+            prices, source='push', label=label)
+        _logger.info('Price push from %s recorded: %s', label or 'unnamed feed', prices)
+        return _json_response({'ticks': ticks.ids, 'prices': prices})
+
+
+class JewelleryMetricsController(http.Controller):
+
+    @http.route('/jewellery_evaluator/metrics', type='http', auth='public',
+                methods=['GET'], csrf=False, save_session=False)
+    def scrape_metrics(self, **kwargs):
+        """
+        Prometheus scrape endpoint: the in-process metrics of the worker serving
+        the request, labelled with its pid, plus the age of each price source.
+        Needs 'Authorization: Bearer <jewellery_evaluator.metrics_token>'.
+        """
+        if not _check_bearer_token('jewellery_evaluator.metrics_token'):
+            return request.make_response(
+                'Unauthorized\n', headers=[('Content-Type', 'text/plain')], status=401)
+        pricing_run = request.env['jewellery.pricing.run'].sudo()
+        for metal in ('gold', 'silver', 'diamond'):
+            age = pricing_run._get_price_age(metal)
+            if age is not None:
+                metrics.PRICE_AGE_SECONDS.set(age, metal=metal)
+        return request.make_response(
+            metrics.REGISTRY.render({'pid': os.getpid()}),
+            headers=[('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')],
+        )
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+Diamond price grid: parsing and lookups (no ORM access).
+
+A grid file is CSV with a header naming the columns
+``shape,color,clarity,carat_from,carat_to,price_per_carat``; each line prices
+one cell, i.e. one carat band (inclusive bounds) of one shape/color/clarity
+grade, in USD per carat. Files are read line by line, so any grid size is
+imported with flat memory.
+"""
+
+import bisect
+import csv
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+GRID_COLUMNS = ('shape', 'color', 'clarity', 'carat_from', 'carat_to', 'price_per_carat')
+
+DIAMOND_SHAPE_SELECTION = [
+    ('round', 'Round'),
+    ('princess', 'Princess'),
+    ('cushion', 'Cushion'),
+    ('oval', 'Oval'),
+    ('emerald', 'Emerald'),
+    ('pear', 'Pear'),
+    ('marquise', 'Marquise'),
+    ('radiant', 'Radiant'),
+    ('asscher', 'Asscher'),
+    ('heart', 'Heart'),
+]
+DIAMOND_COLOR_SELECTION = [(color, color) for color in 'DEFGHIJKLM']
+DIAMOND_CLARITY_SELECTION = [(clarity, clarity) for clarity in (
+    'FL', 'IF', 'VVS1', 'VVS2', 'VS1', 'VS2', 'SI1', 'SI2', 'SI3', 'I1', 'I2', 'I3')]
+
+
+class GridCell(NamedTuple):
+    """One priced cell of the grid."""
+
+    shape: str
+    color: str
+    clarity: str
+    carat_from: float
+    carat_to: float
+    price_per_carat: float
+
+    @property
+    def key(self) -> tuple:
+        """Identity of the cell: its grade and the start of its carat band."""
+        return (self.shape, self.color, self.clarity, self.carat_from)
+
+
+def grade_key(shape: str, color: str, clarity: str) -> tuple[str, str, str]:
+    """Normalized (shape, color, clarity): shape lower case, grades upper case."""
+    return ((shape or '').strip().lower(), (color or '').strip().upper(),
+            (clarity or '').strip().upper())
+
+
+def iter_grid_cells(lines: Iterable[str]) -> Iterator[GridCell]:
+    """
+    Stream the cells of a grid file.
+
+    Args:
+        lines: Text lines of the file, e.g. an open file object
+
+    Yields:
+        GridCell: One cell per data line
+
+    Raises:
+        ValueError: On a missing column or an invalid line (message gives the line number)
+    """
+    reader = csv.DictReader(lines)
+    missing = set(GRID_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f'Missing grid columns: {", ".join(sorted(missing))}')
+    shapes = {key for key, _label in DIAMOND_SHAPE_SELECTION}
+    colors = {key for key, _label in DIAMOND_COLOR_SELECTION}
+    clarities = {key for key, _label in DIAMOND_CLARITY_SELECTION}
+    for row in reader:
+        line_no = reader.line_num
+        shape, color, clarity = grade_key(row['shape'], row['color'], row['clarity'])
+        if shape not in shapes or color not in colors or clarity not in clarities:
+            raise ValueError(f'Line {line_no}: unknown grade {shape}/{color}/{clarity}')
+        try:
+            carat_from = float(row['carat_from'])
+            carat_to = float(row['carat_to'])
+            price = float(row['price_per_carat'])
+        except (TypeError, ValueError):
+            raise ValueError(f'Line {line_no}: invalid number') from None
+        if carat_from < 0 or carat_to < carat_from:
+            raise ValueError(f'Line {line_no}: invalid carat band {carat_from}-{carat_to}')
+        if price <= 0:
+            raise ValueError(f'Line {line_no}: price per carat must be positive')
+        yield GridCell(shape, color, clarity, carat_from, carat_to, price)
+
+
+class DiamondPriceGrid:
+    """
+    In-memory index of a price grid: a hash lookup on the grade, then a binary
+    search over that grade's few carat bands.
+    """
+
+    def __init__(self, cells: Iterable[GridCell]):
+        bands: dict[tuple, list[GridCell]] = {}
+        for cell in cells:
+            bands.setdefault((cell.shape, cell.color, cell.clarity), []).append(cell)
+        self._index = {}
+        for grade, grade_cells in bands.items():
+            grade_cells.sort()
+            self._index[grade] = ([cell.carat_from for cell in grade_cells], grade_cells)
+
+    def __len__(self):
+        return sum(len(cells) for _starts, cells in self._index.values())
+
+    def lookup(self, carat: float, shape: str, color: str, clarity: str) -> GridCell | None:
+        """Cell whose grade matches and whose carat band contains carat, or None."""
+        entry = self._index.get(grade_key(shape, color, clarity))
+        if not entry or not carat or carat <= 0:
+            return None
+        starts, cells = entry
+        index = bisect.bisect_right(starts, carat) - 1
+        if index < 0 or carat > cells[index].carat_to:
+            return None
+        return cells[index]
+
+    def price_usd(self, carat: float, shape: str, color: str, clarity: str) -> float | None:
+        """USD price of a stone (carat x the cell's price per carat), or None if not in the grid."""
+        cell = self.lookup(carat, shape, color, clarity)
+        return round(carat * cell.price_per_carat, 2) if cell else None
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+Exchange rate histories and rate files (no ORM access).
+
+A rate file is CSV text with one ``date,rate`` line per day, e.g.::
+
+    date,usd_egp
+    2026-03-01,50.35
+    2026-03-02,50.41
+
+An optional header line, blank lines and ``#`` comments are ignored.
+"""
+
+import bisect
+import csv
+import io
+from collections.abc import Iterable
+from datetime import date, datetime
+
+
+def parse_rate_file(content: str) -> list[tuple[date, float]]:
+    """
+    Parse a rate file into (date, rate) pairs sorted by date.
+
+    Args:
+        content: CSV text, see the module docstring
+
+    Returns:
+        list: (date, rate) pairs; a later line for the same date wins
+
+    Raises:
+        ValueError: On a malformed line or a non-positive rate (message gives the line number)
+    """
+    rates: dict[date, float] = {}
+    for line_no, row in enumerate(csv.reader(io.StringIO(content)), start=1):
+        if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+            continue
+        if len(row) < 2:
+            raise ValueError(f'Line {line_no}: expected "date,rate"')
+        raw_date, raw_rate = row[0].strip(), row[1].strip()
+        try:
+            day = date.fromisoformat(raw_date)
+        except ValueError:
+            if line_no == 1:
+                continue  # header
+            raise ValueError(f'Line {line_no}: invalid date {raw_date!r}') from None
+        try:
+            rate = float(raw_rate)
+        except ValueError:
+            raise ValueError(f'Line {line_no}: invalid rate {raw_rate!r}') from None
+        if rate <= 0:
+            raise ValueError(f'Line {line_no}: rate must be positive')
+        rates[day] = rate
+    return sorted(rates.items())
+
+
+class RateHistory:
+    """
+    Immutable rate history: rate_at() finds the rate in effect on a date
+    with a binary search.
+    """
+
+    def __init__(self, points: Iterable[tuple[date, float]], default: float | None = None):
+        """
+        Args:
+            points: (date, rate) pairs, in any order
+            default: Rate returned for dates before the first point (or without points)
+        """
+        ordered = sorted(points)
+        self._dates = [day for day, _rate in ordered]
+        self._rates = [rate for _day, rate in ordered]
+        self.default = default
+
+    def __len__(self):
+        return len(self._dates)
+
+    def rate_at(self, when: date | datetime) -> float | None:
+        """Rate of the latest point on or before when (a datetime counts by its date)."""
+        if isinstance(when, datetime):
+            when = when.date()
+        index = bisect.bisect_right(self._dates, when)
+        return self._rates[index - 1] if index else self.default
+
+    def date_at(self, when: date | datetime) -> date | None:
+        """Date of the point rate_at(when) comes from, or None when it is the default."""
+        if isinstance(when, datetime):
+            when = when.date()
+        index = bisect.bisect_right(self._dates, when)
+        return self._dates[index - 1] if index else None
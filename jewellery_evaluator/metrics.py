@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+In-process metrics rendered in the Prometheus text format (no ORM access).
+
+Counters, gauges and histograms live in the memory of each worker process and
+are safe to update from any thread. The metrics controller renders the
+registry of the worker serving the scrape, labelled with its pid, so every
+series stays monotonic although scrapes hit different workers; aggregate
+them with ``sum without (pid)``.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+# Latency buckets in seconds, from cache hits to slow scrapes
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Buckets for counts of SQL queries
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, Any] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f'{self.name} takes labels {self.labelnames}, got {tuple(sorted(labels))}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple, const_labels: tuple) -> list[tuple[str, str]]:
+        return list(const_labels) + list(zip(self.labelnames, key, strict=True))
+
+    def samples(self, const_labels: tuple = ()) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self, const_labels: tuple = ()) -> list[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+            *self.samples(const_labels),
+        ]
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. fetches or rows written."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError('Counters can only increase')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            value: float = self._values.get(self._key(labels), 0)
+        return value
+
+    def samples(self, const_labels=()):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield (f'{self.name}{_format_labels(self._labels(key, const_labels))} '
+                   f'{_format_value(value)}')
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. the age of the last fetched price."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, with their sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the seconds spent in the block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self, const_labels=()):
+        with self._lock:
+            items = sorted((key, (list(counts), total))
+                           for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            labels = self._labels(key, const_labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                yield (f'{self.name}_bucket'
+                       f'{_format_labels(labels + [("le", _format_value(bound))])} {cumulative}')
+            yield f'{self.name}_sum{_format_labels(labels)} {_format_value(total)}'
+            yield f'{self.name}_count{_format_labels(labels)} {cumulative}'
+
+
+_M = TypeVar('_M', bound=_Metric)
+
+
+class Registry:
+    """Named metrics of a process, rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _M) -> _M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self, const_labels: dict | None = None) -> str:
+        """
+        Text exposition of every metric.
+
+        Args:
+            const_labels: Labels added to every sample, e.g. {'pid': 1234}
+
+        Returns:
+            str: Prometheus text format (version 0.0.4)
+        """
+        const = tuple((name, str(value)) for name, value in (const_labels or {}).items())
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(const))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+PRICE_FETCH_SECONDS = REGISTRY.histogram(
+    'jewellery_price_fetch_seconds',
+    'Latency of price source fetches by source, host and outcome (ok, error, timeout).',
+    ('source', 'host', 'outcome'),
+)
+PRICE_FALLBACKS = REGISTRY.counter(
+    'jewellery_price_fallbacks_total',
+    'Prices served from a stored fallback (or default rate) instead of a fetch.',
+    ('source',),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    'jewellery_cache_lookups_total',
+    'Lookups of worker caches; the hit ratio is 1 - misses / lookups.',
+    ('cache',),
+)
+CACHE_MISSES = REGISTRY.counter(
+    'jewellery_cache_misses_total',
+    'Worker cache lookups that had to be rebuilt from the database.',
+    ('cache',),
+)
+REPRICING_SECONDS = REGISTRY.histogram(
+    'jewellery_repricing_seconds',
+    'Duration of gold, silver and diamond pricing runs.',
+    ('metal', 'success'),
+)
+REPRICING_ROWS = REGISTRY.counter(
+    'jewellery_repricing_rows_written_total',
+    'Products repriced by pricing runs.',
+    ('metal',),
+)
+POS_ORDER_VALIDATION_SECONDS = REGISTRY.histogram(
+    'jewellery_pos_order_validation_seconds',
+    'Time spent in pos.order._order_fields, jewellery price and stock checks included.',
+)
+POS_STOCK_CHECK_QUERIES = REGISTRY.histogram(
+    'jewellery_pos_stock_check_queries',
+    'SQL queries run by one POS order stock check.',
+    buckets=QUERY_COUNT_BUCKETS,
+)
+PRICE_AGE_SECONDS = REGISTRY.gauge(
+    'jewellery_price_age_seconds',
+    'Seconds since each price source was last fetched successfully (set at scrape time).',
+    ('metal',),
+)
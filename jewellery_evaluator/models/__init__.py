@@ -6,13 +6,23 @@
 from . import (
     account_move,  # noqa: F401
     account_move_line,  # noqa: F401
+    diamond_price_grid,  # noqa: F401
     diamond_price_service,  # noqa: F401
     gold_price_service,  # noqa: F401
+    gold_price_source,  # noqa: F401
     jewellery_evaluator_config,  # noqa: F401
+    jewellery_job,  # noqa: F401
     pos_config,  # noqa: F401
     pos_make_payment,  # noqa: F401
     pos_order,  # noqa: F401
     pos_session,  # noqa: F401
+    price_scheduler,  # noqa: F401
+    price_tick,  # noqa: F401
+    pricing_run,  # noqa: F401
+    product_pricelist_item,  # noqa: F401
+    product_product,  # noqa: F401
     product_template,  # noqa: F401
+    profiler,  # noqa: F401
+    res_currency_rate,  # noqa: F401
     silver_price_service,  # noqa: F401
 )
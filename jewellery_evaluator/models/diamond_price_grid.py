@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+from odoo import api, fields, models
+
+from ..diamond_grid import (
+    DIAMOND_CLARITY_SELECTION,
+    DIAMOND_COLOR_SELECTION,
+    DIAMOND_SHAPE_SELECTION,
+    GridCell,
+)
+from .diamond_price_service import DIAMOND_GRID_CHANGED
+
+
+class JewelleryDiamondPrice(models.Model):
+    _name = 'jewellery.diamond.price'
+    _description = 'Diamond Price Grid Cell'
+    _order = 'shape, color, clarity, carat_from'
+
+    shape = fields.Selection(selection=DIAMOND_SHAPE_SELECTION, string='Shape', required=True)
+    color = fields.Selection(selection=DIAMOND_COLOR_SELECTION, string='Color', required=True)
+    clarity = fields.Selection(selection=DIAMOND_CLARITY_SELECTION, string='Clarity', required=True)
+    carat_from = fields.Float(string='From (ct)', digits=(16, 3), required=True)
+    carat_to = fields.Float(string='To (ct)', digits=(16, 3), required=True)
+    price_per_carat = fields.Float(
+        string='USD per Carat',
+        digits=(16, 2),
+        required=True,
+        help='Price in USD per carat for stones of this grade in this carat band.',
+    )
+
+    _sql_constraints = [
+        ('cell_unique', 'unique(shape, color, clarity, carat_from)',
+         'Each grade and carat band can only be priced once.'),
+    ]
+
+    def _to_grid_cell(self):
+        self.ensure_one()
+        return GridCell(self.shape, self.color, self.clarity,
+                        self.carat_from, self.carat_to, self.price_per_carat)
+
+    def _mark_grid_changed(self):
+        """
+        Make diamond.price.service read the grid uncached for the rest of the
+        transaction; other workers see the change through the grid version once
+        it is committed.
+        """
+        self.env.cr.precommit.data[DIAMOND_GRID_CHANGED] = True
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._mark_grid_changed()
+        if not self.env.context.get('skip_diamond_price_update'):
+            self.env['diamond.price.service']._reprice_grid_cells(
+                [cell._to_grid_cell() for cell in records])
+        return records
+
+    def write(self, vals):
+        old_cells = [cell._to_grid_cell() for cell in self]
+        res = super().write(vals)
+        self._mark_grid_changed()
+        if not self.env.context.get('skip_diamond_price_update'):
+            self.env['diamond.price.service']._reprice_grid_cells(
+                old_cells + [cell._to_grid_cell() for cell in self])
+        return res
+
+    def unlink(self):
+        # Products of removed cells are repriced from a remaining cell covering
+        # them, if any; the others keep their current USD price
+        old_cells = [cell._to_grid_cell() for cell in self]
+        self._mark_grid_changed()
+        res = super().unlink()
+        if not self.env.context.get('skip_diamond_price_update'):
+            self.env['diamond.price.service']._reprice_grid_cells(old_cells)
+        return res
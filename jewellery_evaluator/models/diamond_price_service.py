@@ -3,7 +3,30 @@
 # Author: Mohamed A. Abdallah
 # Website: https://www.revenax.com
 
-from odoo import models
+import logging
+from datetime import datetime, time
+
+from odoo import _, fields, models, tools
+from odoo.exceptions import UserError
+from odoo.tools import float_compare, float_round
+
+from .. import metrics, run_stats
+from ..diamond_grid import DiamondPriceGrid, GridCell, iter_grid_cells
+from ..fx_rates import RateHistory, parse_rate_file
+from ..repricing_pipeline import ValuesPriceWriter
+
+_logger = logging.getLogger(__name__)
+
+# Used until USD and EGP rates are available in res.currency.rate
+DEFAULT_USD_EGP_RATE = 50.0
+# Currencies whose res.currency.rate records make up the USD to EGP rate
+USD_EGP_CURRENCIES = ('USD', 'EGP')
+# Transaction data key set when the transaction changed USD or EGP rates
+USD_EGP_RATES_CHANGED = 'jewellery_evaluator.usd_egp_rates_changed'
+# Transaction data key set when the transaction changed diamond price grid cells
+DIAMOND_GRID_CHANGED = 'jewellery_evaluator.diamond_grid_changed'
+# New grid cells created per create() call during a grid import
+GRID_IMPORT_BATCH_SIZE = 1000
 
 
 class DiamondPriceService(models.Model):
@@ -24,14 +47,133 @@ class DiamondPriceService(models.Model):
         """True if a global diamond price is used (cron may overwrite product diamond_usd_price)."""
         return self.get_current_diamond_price_usd() is not None
 
-    def get_usd_to_egp_rate(self):
+    def get_usd_to_egp_rate(self, at=None):
         """
-        Placeholder for USD to EGP exchange rate.
+        USD to EGP rate from the company's currency rates (res.currency.rate).
+        Rate histories are cached per worker, so each lookup is a binary search.
 
-        Returns:
-            float: USD to EGP exchange rate
+        :param at: Date or datetime of the wanted rate (default: today)
+        :return: float - EGP per USD, or DEFAULT_USD_EGP_RATE when no rates are recorded
+        """
+        metrics.CACHE_LOOKUPS.inc(cache='usd_egp_rates')
+        usd_history, egp_history = self._get_usd_egp_histories(self.env.company.id)
+        day = at or fields.Date.context_today(self)
+        usd_rate, egp_rate = usd_history.rate_at(day), egp_history.rate_at(day)
+        if not usd_rate or not egp_rate:
+            _logger.debug('No USD/EGP currency rate on %s; using %s', day, DEFAULT_USD_EGP_RATE)
+            run_stats.mark_fallback()
+            metrics.PRICE_FALLBACKS.inc(source='usd_egp')
+            return DEFAULT_USD_EGP_RATE
+        return egp_rate / usd_rate
+
+    def _get_usd_egp_rate_age(self):
+        """
+        :return: float|None - Seconds since the start of the day of the older of
+            today's USD and EGP rates, or None when the default rate is used
+        """
+        today = fields.Date.context_today(self)
+        metrics.CACHE_LOOKUPS.inc(cache='usd_egp_rates')
+        histories = self._get_usd_egp_histories(self.env.company.id)
+        days = [history.date_at(today) for history in histories if len(history)]
+        if not days or None in days:
+            return None
+        rate_start = datetime.combine(min(days), time.min)
+        return max((fields.Datetime.now() - rate_start).total_seconds(), 0.0)
+
+    def _get_usd_egp_histories(self, company_id):
+        """
+        Rate histories of USD and EGP relative to the company currency (rate 1.0),
+        company-specific rates overriding shared ones. Cached per worker under the
+        version of the USD and EGP rates, so changes made by other workers are
+        picked up without clearing any cache; read uncached once the current
+        transaction changed them, as its changes are not committed yet.
+
+        :param company_id: Company id
+        :return: tuple - (USD RateHistory, EGP RateHistory)
         """
-        return 50.0
+        if self.env.cr.precommit.data.get(USD_EGP_RATES_CHANGED):
+            return self._read_usd_egp_histories(company_id)
+        return self._cached_usd_egp_histories(company_id, self._get_usd_egp_rates_version())
+
+    def _get_usd_egp_rates_version(self):
+        """
+        :return: tuple - (number of USD and EGP rates, latest write date), which
+            changes whenever one of these rates is created, written or deleted
+        """
+        self.env.cr.execute("""
+            SELECT count(*), max(rate.write_date)
+              FROM res_currency_rate rate
+              JOIN res_currency currency ON currency.id = rate.currency_id
+             WHERE currency.name IN %s
+        """, (USD_EGP_CURRENCIES,))
+        return tuple(self.env.cr.fetchone())
+
+    @tools.ormcache('company_id', 'version')
+    def _cached_usd_egp_histories(self, company_id, version):
+        return self._read_usd_egp_histories(company_id)
+
+    def _read_usd_egp_histories(self, company_id):
+        metrics.CACHE_MISSES.inc(cache='usd_egp_rates')
+        company = self.env['res.company'].browse(company_id)
+        currencies = self.env['res.currency'].with_context(active_test=False)
+        histories = []
+        for code in USD_EGP_CURRENCIES:
+            currency = currencies.search([('name', '=', code)], limit=1)
+            if currency and currency == company.currency_id:
+                histories.append(RateHistory([], default=1.0))
+                continue
+            points = {}
+            for rate in self.env['res.currency.rate'].sudo().search_read([
+                ('currency_id', '=', currency.id),
+                ('company_id', 'in', (company_id, False)),
+            ], ['name', 'rate', 'company_id']):
+                if rate['company_id'] or rate['name'] not in points:
+                    points[rate['name']] = rate['rate']
+            histories.append(RateHistory(points.items()))
+        return tuple(histories)
+
+    def import_usd_egp_rates(self, content):
+        """
+        Import a USD to EGP rate file (see fx_rates) into res.currency.rate for
+        the current company, updating the rates of dates already recorded.
+        Needs no network access, so histories can be loaded offline.
+
+        :param content: str - Rate file text, one "date,rate" line per day
+        :return: int - Number of imported dates
+        """
+        try:
+            points = parse_rate_file(content)
+        except ValueError as e:
+            raise UserError(_('Invalid USD/EGP rate file: %s') % e) from e
+        company = self.env.company
+        currencies = self.env['res.currency'].with_context(active_test=False)
+        if company.currency_id.name == 'EGP':
+            currency = currencies.search([('name', '=', 'USD')], limit=1)
+            points = [(day, 1.0 / rate) for day, rate in points]
+        elif company.currency_id.name == 'USD':
+            currency = currencies.search([('name', '=', 'EGP')], limit=1)
+        else:
+            raise UserError(_('USD/EGP rates can only be imported for a company in USD or EGP.'))
+        if not currency:
+            raise UserError(_('Currency %s is not defined.')
+                            % ('USD' if company.currency_id.name == 'EGP' else 'EGP'))
+
+        Rate = self.env['res.currency.rate'].sudo()
+        existing = {rate.name: rate for rate in Rate.search([
+            ('currency_id', '=', currency.id),
+            ('company_id', '=', company.id),
+            ('name', 'in', [day for day, _rate in points]),
+        ])}
+        to_create = []
+        for day, rate in points:
+            if day in existing:
+                existing[day].rate = rate
+            else:
+                to_create.append({'name': day, 'rate': rate,
+                                  'currency_id': currency.id, 'company_id': company.id})
+        Rate.create(to_create)
+        _logger.info('Imported %s USD/EGP rates into %s', len(points), currency.name)
+        return len(points)
 
     def get_global_diamond_discount(self):
         """
@@ -50,23 +192,256 @@ class DiamondPriceService(models.Model):
         except (TypeError, ValueError):
             return 80
 
-    def update_all_diamond_product_prices(self):
+    def _get_diamond_price_grid(self):
+        """
+        Indexed diamond price grid built from jewellery.diamond.price, cached per
+        worker under the version of the grid cells (their count and latest write
+        date); read uncached once the current transaction changed cells.
+
+        :return: DiamondPriceGrid
+        """
+        metrics.CACHE_LOOKUPS.inc(cache='diamond_price_grid')
+        if self.env.cr.precommit.data.get(DIAMOND_GRID_CHANGED):
+            return self._read_diamond_price_grid()
+        self.env.cr.execute('SELECT count(*), max(write_date) FROM jewellery_diamond_price')
+        return self._cached_diamond_price_grid(tuple(self.env.cr.fetchone()))
+
+    @tools.ormcache('version')
+    def _cached_diamond_price_grid(self, version):
+        return self._read_diamond_price_grid()
+
+    def _read_diamond_price_grid(self):
+        metrics.CACHE_MISSES.inc(cache='diamond_price_grid')
+        cells = self.env['jewellery.diamond.price'].sudo().search_read(
+            [], ['shape', 'color', 'clarity', 'carat_from', 'carat_to', 'price_per_carat'])
+        return DiamondPriceGrid(
+            GridCell(cell['shape'], cell['color'], cell['clarity'], cell['carat_from'],
+                     cell['carat_to'], cell['price_per_carat'])
+            for cell in cells
+        )
+
+    def import_diamond_price_grid(self, lines):
+        """
+        Import a diamond price grid (see diamond_grid), streaming its lines.
+        Cells of the file are created or updated, others are kept; then only
+        the products priced by created or changed cells are repriced.
+
+        :param lines: Iterable of text lines, e.g. an open file or io.StringIO
+        :return: dict - cells_created, cells_updated, products_updated
+        """
+        Cell = self.env['jewellery.diamond.price'].sudo().with_context(
+            skip_diamond_price_update=True)
+        existing = {
+            (cell['shape'], cell['color'], cell['clarity'], cell['carat_from']): cell
+            for cell in Cell.search_read([], ['shape', 'color', 'clarity', 'carat_from',
+                                              'carat_to', 'price_per_carat'])
+        }
+        changed_cells = []
+        to_create = []
+        created = 0
+        Cell.flush_model()
+        with ValuesPriceWriter(self.env.cr, ['carat_to', 'price_per_carat'], self.env.uid,
+                               table=Cell._table) as writer:
+            try:
+                for cell in iter_grid_cells(lines):
+                    old = existing.get(cell.key)
+                    if old is None:
+                        to_create.append(cell._asdict())
+                        created += 1
+                        if len(to_create) >= GRID_IMPORT_BATCH_SIZE:
+                            Cell.create(to_create)
+                            to_create = []
+                    elif (old['carat_to'], old['price_per_carat']) != (
+                            cell.carat_to, cell.price_per_carat):
+                        writer.write((old['id'], cell.carat_to, cell.price_per_carat))
+                        # Products of the old band are repriced too when the band shrinks
+                        changed_cells.append(cell._replace(carat_to=old['carat_to']))
+                    else:
+                        continue
+                    changed_cells.append(cell)
+            except ValueError as e:
+                raise UserError(_('Invalid diamond price grid: %s') % e) from e
+        Cell.create(to_create)
+        Cell.invalidate_model(['carat_to', 'price_per_carat', 'write_uid', 'write_date'])
+        self.env.cr.precommit.data[DIAMOND_GRID_CHANGED] = True
+        products_updated = self._reprice_grid_cells(changed_cells)
+        _logger.info('Diamond price grid imported: %s cells created, %s updated, %s products repriced',
+                     created, writer.updated, products_updated)
+        return {
+            'cells_created': created,
+            'cells_updated': writer.updated,
+            'products_updated': products_updated,
+        }
+
+    def import_diamond_price_grid_file(self, path):
+        """
+        Import a diamond price grid file from the server filesystem, read line by line.
+
+        :param path: str - Path of the CSV grid file
+        :return: dict - See import_diamond_price_grid()
+        """
+        with open(path, newline='', encoding='utf-8') as grid_file:
+            return self.import_diamond_price_grid(grid_file)
+
+    def _reprice_grid_cells(self, cells):
+        """
+        Reprice the graded diamond products falling in any of the given grid cells
+        (carat bands as given, so pass a changed cell's old band too).
+
+        :param cells: Iterable of GridCell
+        :return: int - Number of products repriced
+        """
+        bands: dict = {}
+        for cell in cells:
+            bands.setdefault((cell.shape, cell.color, cell.clarity), []).append(
+                (cell.carat_from, cell.carat_to))
+        if not bands:
+            return 0
+        candidates = self.env['product.template'].search_fetch([
+            ('jewellery_type', '=', 'diamond_jewellery'),
+            ('diamond_carat', '>', 0),
+            ('diamond_shape', 'in', list({grade[0] for grade in bands})),
+            ('diamond_color', 'in', list({grade[1] for grade in bands})),
+            ('diamond_clarity', 'in', list({grade[2] for grade in bands})),
+        ], ['diamond_carat', 'diamond_shape', 'diamond_color', 'diamond_clarity',
+            'diamond_usd_price', 'list_price'])
+        affected = candidates.filtered(lambda p: any(
+            low <= p.diamond_carat <= high
+            for low, high in bands.get((p.diamond_shape, p.diamond_color, p.diamond_clarity), ())
+        ))
+        return self.reprice_diamonds_from_grid(affected)
+
+    def reprice_diamonds_from_grid(self, products=None):
+        """
+        Set diamond_usd_price and list_price of graded diamond products from the
+        price grid, with one grid lookup per product and one bulk write. Products
+        outside the grid or already at their grid price are left untouched.
+
+        :param products: product.template recordset (default: all graded diamond products)
+        :return: int - Number of products repriced
+        """
+        if products is None:
+            products = self.env['product.template'].search_fetch([
+                ('jewellery_type', '=', 'diamond_jewellery'),
+                ('diamond_carat', '>', 0),
+            ], ['diamond_carat', 'diamond_shape', 'diamond_color', 'diamond_clarity',
+                'diamond_usd_price', 'list_price'])
+        if not products:
+            return 0
+        grid = self._get_diamond_price_grid()
+        exchange_rate = self.get_usd_to_egp_rate()
+        discount_pct = self.get_global_diamond_discount()
+        digits = self.env['decimal.precision'].precision_get('Product Price')
+        rows = []
+        for product in products:
+            price_usd = grid.price_usd(product.diamond_carat, product.diamond_shape,
+                                       product.diamond_color, product.diamond_clarity)
+            if price_usd is None:
+                continue
+            price_egp = float_round(
+                price_usd * exchange_rate * (100 - discount_pct) / 100.0, precision_digits=digits)
+            if product.diamond_usd_price == price_usd and not float_compare(
+                    product.list_price, price_egp, precision_digits=digits):
+                continue
+            rows.append((product.id, price_usd, price_egp))
+        if not rows:
+            return 0
+        return self.env['product.template']._write_jewellery_prices(
+            ['diamond_usd_price', 'list_price'], rows)
+
+    def _set_applied_usd_to_egp_rate(self, exchange_rate):
+        """Remember the USD to EGP rate the catalog was last repriced with."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'jewellery_evaluator.applied_usd_egp_rate', str(exchange_rate)
+        )
+        self.env['jewellery.price.scheduler']._set_applied_signature('usd_egp', exchange_rate)
+
+    def update_all_diamond_product_prices(self, exchange_rate=None):
         """
         Update prices for all diamond products.
         When a global diamond price API is available, overwrites diamond_usd_price and list_price.
         When not (placeholder), only refreshes list_price from each product's diamond_usd_price.
+        A rate fetched here skips the run when it and the discount match the last applied run.
+        In event-driven repricing mode a fetched rate only queues repricing on input changes.
+
+        :param exchange_rate: Already fetched USD to EGP rate (e.g. from the price
+            scheduler); when omitted get_usd_to_egp_rate() is used
+        :return: dict - Execution summary, with per-stage measurements under 'stats'
+        """
+        return self.env['jewellery.pricing.run']._instrument(
+            'diamond', self._update_all_diamond_product_prices, exchange_rate)
 
+    def _update_all_diamond_product_prices(self, exchange_rate=None):
+        if exchange_rate is None:
+            with run_stats.stage('fetch'):
+                exchange_rate = self.get_usd_to_egp_rate()
+            scheduler = self.env['jewellery.price.scheduler']
+            if scheduler._is_on_change_mode():
+                return scheduler._queue_repricing_if_changed('usd_egp', exchange_rate)
+            if not scheduler._inputs_changed('usd_egp', exchange_rate):
+                return {
+                    'success': True,
+                    'products_updated': 0,
+                    'exchange_rate': exchange_rate,
+                    'unchanged': True,
+                    'message': 'USD/EGP rate unchanged',
+                }
+        return self.env['jewellery.price.scheduler']._run_coalesced(
+            'usd_egp', exchange_rate, self._reprice_all_diamond_products)
+
+    def _changed_list_prices(self, products, prices):
+        """
+        New list_price of the products whose list_price is not already correct
+        at 'Product Price' precision.
+
+        :param products: product.template recordset (list_price fetched)
+        :param prices: dict - product id -> new list_price
+        :return: dict - product id -> rounded list_price
+        """
+        digits = self.env['decimal.precision'].precision_get('Product Price')
+        changed = {}
+        for product in products:
+            price = float_round(prices[product.id], precision_digits=digits)
+            if float_compare(product.list_price, price, precision_digits=digits):
+                changed[product.id] = price
+        return changed
+
+    def _write_list_prices(self, prices, vals=None):
+        """
+        Write the list prices, with the extra values, through the internal bulk
+        price write (no write() override, one recompute).
+
+        :param prices: dict - product id -> list_price
+        :param vals: dict - Extra price values written with every product
+        :return: int - Number of products written
+        """
+        if not prices:
+            return 0
+        vals = vals or {}
+        return self.env['product.template']._write_jewellery_prices(
+            list(vals) + ['list_price'],
+            ((product_id, *vals.values(), price) for product_id, price in prices.items()),
+        )
+
+    def _reprice_all_diamond_products(self, exchange_rate):
+        """
+        Repricing stage of update_all_diamond_product_prices, run under the
+        USD/EGP run lock. Products whose price does not change are not written;
+        the others are written with one bulk price write.
+
+        :param exchange_rate: USD to EGP rate
         :return: dict - Execution summary
         """
         price_usd = self.get_current_diamond_price_usd()
-        exchange_rate = self.get_usd_to_egp_rate()
         discount_pct = self.get_global_diamond_discount()
 
-        diamond_products = self.env['product.template'].search([
-            ('jewellery_type', '=', 'diamond_jewellery'),
-        ])
+        with run_stats.stage('search'):
+            diamond_products = self.env['product.template'].search_fetch([
+                ('jewellery_type', '=', 'diamond_jewellery'),
+            ], ['diamond_usd_price', 'list_price'])
 
         if not diamond_products:
+            self._set_applied_usd_to_egp_rate(exchange_rate)
             return {
                 'success': True,
                 'products_updated': 0,
@@ -77,33 +452,42 @@ class DiamondPriceService(models.Model):
         if self._has_global_diamond_price_api():
             price_egp = (price_usd * exchange_rate) * \
                 (100 - discount_pct) / 100.0
-            for product in diamond_products:
-                product.with_context(skip_diamond_price_update=True).write({
-                    'diamond_usd_price': price_usd,
-                    'list_price': price_egp,
-                })
+            with run_stats.stage('compute'):
+                stale_usd = diamond_products.filtered(lambda p: p.diamond_usd_price != price_usd)
+                # A changed USD price has to be written even when list_price already matches.
+                prices = self._changed_list_prices(
+                    diamond_products - stale_usd,
+                    dict.fromkeys(diamond_products.ids, price_egp),
+                )
+                if stale_usd:
+                    digits = self.env['decimal.precision'].precision_get('Product Price')
+                    prices.update(dict.fromkeys(
+                        stale_usd.ids, float_round(price_egp, precision_digits=digits)))
+            updated = self._write_list_prices(prices, {'diamond_usd_price': price_usd})
+            self._set_applied_usd_to_egp_rate(exchange_rate)
             return {
                 'success': True,
-                'products_updated': len(diamond_products),
+                'products_updated': updated,
                 'price_usd': price_usd,
                 'price_egp': price_egp,
                 'exchange_rate': exchange_rate,
-                'message': f'Successfully updated {len(diamond_products)} products',
+                'message': f'Successfully updated {updated} products',
             }
 
-        for product in diamond_products:
-            if product.diamond_usd_price and product.diamond_usd_price > 0:
-                price_egp = (product.diamond_usd_price * exchange_rate) * (
-                    100 - discount_pct
-                ) / 100.0
-                product.with_context(skip_diamond_price_update=True).write({
-                    'list_price': price_egp,
-                })
+        with run_stats.stage('compute'):
+            priced = diamond_products.filtered(
+                lambda p: p.diamond_usd_price and p.diamond_usd_price > 0)
+            prices = self._changed_list_prices(priced, {
+                product.id: (product.diamond_usd_price * exchange_rate) * (100 - discount_pct) / 100.0
+                for product in priced
+            })
+        updated = self._write_list_prices(prices)
+        self._set_applied_usd_to_egp_rate(exchange_rate)
 
         return {
             'success': True,
-            'products_updated': len(diamond_products),
+            'products_updated': updated,
             'price_usd': None,
             'exchange_rate': exchange_rate,
-            'message': f'Refreshed list_price for {len(diamond_products)} products (no global price API)',
+            'message': f'Refreshed list_price for {updated} products (no global price API)',
         }
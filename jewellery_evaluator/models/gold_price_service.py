@@ -3,15 +3,44 @@
 # Author: Mohamed A. Abdallah
 # Website: https://www.revenax.com
 
+import functools
 import logging
 
 import requests
 from odoo import api, models
 
-from ..utils import parse_gold_price_with_regex  # noqa: E402
+from .. import metrics, run_stats
+from ..price_feeds import fetch_gold_price, fetch_with_consensus  # noqa: E402
 
 _logger = logging.getLogger(__name__)
 
+GOLD_API_TIMEOUT = 10
+
+
+def _fetch_gold_price_consensus(sources, timeout, mode, tolerance_pct):
+    """
+    Fetch the 21K price from several (endpoint, regex) sources with hedging or
+    median consensus. Thread-safe: takes plain values only.
+
+    :return: float - Agreed 21K gold price per gram
+    """
+    result = fetch_with_consensus(
+        [
+            (endpoint, functools.partial(fetch_gold_price, endpoint, regex, timeout=timeout))
+            for endpoint, regex in sources
+        ],
+        timeout=timeout,
+        mode=mode,
+        tolerance_pct=tolerance_pct,
+    )
+    for outcome in result.outcomes:
+        if outcome.value is None:
+            _logger.warning('Gold source %s failed: %s', outcome.source, outcome.error)
+    if result.rejected:
+        _logger.warning('Gold price outliers rejected: %s (consensus %s)',
+                        result.rejected, result.value)
+    return result.value
+
 
 class GoldPriceService(models.Model):
     _name = 'gold.price.service'
@@ -32,15 +61,16 @@ class GoldPriceService(models.Model):
         except Exception as e:
             _logger.error('Failed to fetch gold price from API: %s', str(e))
             # Fallback to last known price from config or default
+            run_stats.mark_fallback()
+            metrics.PRICE_FALLBACKS.inc(source='gold')
             return self._get_fallback_price()
 
-    def _fetch_gold_price_from_api(self):
+    def _get_gold_api_config(self):
         """
-        Fetch gold price from external API via GET request.
-        On HTTP 200, treats the response body as HTML/text and extracts the 21K
-        price using the configurable regex from settings (Gold 21K Regex Formula).
+        Read and validate the gold API endpoint and 21K regex from system parameters.
 
-        :return: float - Gold price per gram (21K price)
+        :return: tuple - (api_endpoint, regex_formula)
+        :raises ValueError: If either parameter is missing or the endpoint is not HTTP(S)
         """
         api_endpoint = self.env['ir.config_parameter'].sudo().get_param(
             'jewellery_evaluator.gold_api_endpoint',
@@ -73,29 +103,85 @@ class GoldPriceService(models.Model):
                 'Gold API endpoint must be a valid HTTP/HTTPS URL. '
                 f'Current value: {api_endpoint[:50]}...'
             )
+        return api_endpoint, regex_formula
 
-        timeout = 10
-        headers = {
-            'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
-        }
+    def _get_gold_sources(self):
+        """
+        Return every configured gold source in priority order: the endpoint and
+        regex from Settings first, then active gold.price.source records.
 
+        :return: list - (endpoint, regex_formula) tuples
+        :raises ValueError: If no source is configured
+        """
+        sources = []
         try:
-            response = requests.get(
-                api_endpoint,
-                headers=headers,
-                timeout=timeout
-            )
-            response.raise_for_status()
+            sources.append(self._get_gold_api_config())
+        except ValueError:
+            if not self.env['gold.price.source'].sudo().search_count([]):
+                raise
+        for source in self.env['gold.price.source'].sudo().search([]):
+            sources.append((source.endpoint, source.regex_formula))
+        return sources
 
-            text = response.text
-            price = parse_gold_price_with_regex(text, regex_formula)
-            self.env['ir.config_parameter'].sudo().set_param(
-                'jewellery_evaluator.fallback_price',
-                str(price),
-            )
-            _logger.info(
-                'Gold price fetched: %s; fallback price updated', price)
+    def _get_gold_consensus_settings(self):
+        """
+        :return: tuple - (mode, tolerance_pct); mode is 'first' or 'median'
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        mode = ICP.get_param('jewellery_evaluator.gold_consensus_mode', 'first')
+        if mode not in ('first', 'median'):
+            mode = 'first'
+        try:
+            tolerance_pct = float(ICP.get_param(
+                'jewellery_evaluator.gold_consensus_tolerance_pct', '2.0'))
+        except (TypeError, ValueError):
+            tolerance_pct = 2.0
+        return mode, max(tolerance_pct, 0.0)
+
+    def _prepare_gold_fetch(self, timeout=GOLD_API_TIMEOUT):
+        """
+        Build a callable fetching the 21K price with plain values only, so it can
+        run outside the cron thread. A single source is fetched directly; several
+        sources use hedged requests or median consensus.
+
+        :param timeout: Request timeout (and overall deadline) in seconds
+        :return: callable - No-argument function returning the price
+        """
+        sources = self._get_gold_sources()
+        if len(sources) == 1:
+            api_endpoint, regex_formula = sources[0]
+            return functools.partial(
+                fetch_gold_price, api_endpoint, regex_formula, timeout=timeout)
+        mode, tolerance_pct = self._get_gold_consensus_settings()
+        return functools.partial(
+            _fetch_gold_price_consensus, sources, timeout, mode, tolerance_pct)
+
+    def _set_fetched_gold_price(self, price):
+        """Store a freshly fetched price as the fallback for later API failures."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'jewellery_evaluator.fallback_price',
+            str(price),
+        )
+        self.env['jewellery.pricing.run']._set_fetched_at('gold')
+        _logger.info(
+            'Gold price fetched: %s; fallback price updated', price)
+
+    def _fetch_gold_price_from_api(self):
+        """
+        Fetch gold price from external API via GET request.
+        On HTTP 200, treats the response body as HTML/text and extracts the 21K
+        price using the configurable regex from settings (Gold 21K Regex Formula).
+        When additional gold.price.source records exist, all sources are queried
+        with hedging or median consensus (see _prepare_gold_fetch).
+
+        :return: float - Gold price per gram (21K price)
+        """
+        timeout = GOLD_API_TIMEOUT
+        fetch = self._prepare_gold_fetch(timeout)
+
+        try:
+            price = fetch()
+            self._set_fetched_gold_price(price)
             return price
 
         except requests.exceptions.Timeout as e:
@@ -152,23 +238,112 @@ class GoldPriceService(models.Model):
             )
             return 75.0
 
+    def get_applied_gold_price(self):
+        """
+        Get the 21K price per gram the catalog was last repriced with.
+        Never fetches: used by stored computes, which may run over the whole
+        catalog (module upgrade, import). Before the first repricing run the
+        fallback price is used.
+
+        :return: float - 21K gold price per gram
+        """
+        raw = self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.applied_gold_price', '0.0'
+        )
+        try:
+            applied = float(raw)
+        except (TypeError, ValueError):
+            applied = 0.0
+        return applied if applied > 0 else self._get_fallback_price()
+
+    def _set_applied_gold_price(self, base_gold_price):
+        """Remember the base price the catalog was last repriced with."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'jewellery_evaluator.applied_gold_price', str(base_gold_price)
+        )
+        self.env['jewellery.price.scheduler']._set_applied_signature('gold', base_gold_price)
+
     @api.model
-    def update_all_gold_product_prices(self):
+    def update_all_gold_product_prices(self, base_gold_price=None):
         """
         Update prices for all gold products.
-        Called by cron job every 10 minutes.
+        Called by cron job every 10 minutes. In event-driven repricing mode the
+        cron only fetches and queues repricing when the pricing inputs changed.
+        The run is recorded as a jewellery.pricing.run.
 
-        :return: dict - Execution summary
+        :param base_gold_price: Already fetched 21K price per gram (e.g. from the
+            price scheduler); when omitted the price is fetched from the API
+        :return: dict - Execution summary, with per-stage measurements under 'stats'
         """
+        return self.env['jewellery.pricing.run']._instrument(
+            'gold', self._update_all_gold_product_prices, base_gold_price)
+
+    @api.model
+    def _update_all_gold_product_prices(self, base_gold_price=None):
         _logger.info('Starting gold price update for all products')
 
         try:
             # Fetch current gold price
-            base_gold_price = self._fetch_gold_price_from_api()
+            if base_gold_price is None:
+                with run_stats.stage('fetch'):
+                    base_gold_price = self._fetch_gold_price_from_api()
+                scheduler = self.env['jewellery.price.scheduler']
+                if scheduler._is_on_change_mode():
+                    return scheduler._queue_repricing_if_changed('gold', base_gold_price)
             _logger.info('Fetched gold price: %s per gram', base_gold_price)
 
-            # Get all gold products with required data
-            # Only update products that have weight, purity, and type configured
+            return self.env['jewellery.price.scheduler']._run_coalesced(
+                'gold', base_gold_price, self._reprice_all_gold_products)
+
+        except Exception as e:
+            _logger.error('Gold price update failed: %s',
+                          str(e), exc_info=True)
+            return {
+                'success': False,
+                'products_updated': 0,
+                'base_price': None,
+                'message': f'Update failed: {str(e)}',
+                'error': str(e),
+            }
+
+    @api.model
+    def _reprice_all_gold_products(self, base_gold_price):
+        """
+        Repricing stage of update_all_gold_product_prices, run under the gold run lock.
+
+        :param base_gold_price: 21K price per gram
+        :return: dict - Execution summary
+        """
+        product_model = self.env['product.template']
+        if product_model._is_lazy_repricing():
+            self._set_applied_gold_price(base_gold_price)
+            version = product_model._bump_price_version()
+            return {
+                'success': True,
+                'products_updated': 0,
+                'base_price': base_gold_price,
+                'message': f'Price version {version} published; products reprice on read',
+            }
+        engine = product_model._get_repricing_engine()
+        if engine != 'orm':
+            with run_stats.stage('write'):
+                if engine == 'sql':
+                    total_updated = product_model._sql_update_gold_prices(base_gold_price)
+                else:
+                    total_updated = product_model._stream_update_gold_prices(base_gold_price)
+            self._set_applied_gold_price(base_gold_price)
+            _logger.info('Gold %s repricing: %d products updated with base price %s',
+                         engine, total_updated, base_gold_price)
+            return {
+                'success': True,
+                'products_updated': total_updated,
+                'base_price': base_gold_price,
+                'message': f'Successfully updated {total_updated} products',
+            }
+
+        # Get all gold products with required data
+        # Only update products that have weight, purity, and type configured
+        with run_stats.stage('search'):
             gold_products = self.env['product.template'].search([
                 ('jewellery_type', 'in', [
                  'gold_local', 'gold_foreign', 'gold_bars']),
@@ -176,46 +351,53 @@ class GoldPriceService(models.Model):
                 ('jewellery_weight_g', '>', 0),
             ])
 
-            if not gold_products:
-                _logger.info('No gold products found to update')
-                return {
-                    'success': True,
-                    'products_updated': 0,
-                    'base_price': base_gold_price,
-                    'message': 'No gold products found',
-                }
-
-            # Update prices in batches for performance
-            batch_size = 100
-            total_updated = 0
-
-            for i in range(0, len(gold_products), batch_size):
-                batch = gold_products[i:i + batch_size]
-                batch.update_gold_prices(base_gold_price)
-                total_updated += len(batch)
-                _logger.info('Updated batch: %d products (total: %d)',
-                             len(batch), total_updated)
-
-            _logger.info(
-                'Gold price update completed: %d products updated with base price %s',
-                total_updated,
-                base_gold_price
-            )
-
+        if not gold_products:
+            _logger.info('No gold products found to update')
+            self._set_applied_gold_price(base_gold_price)
             return {
                 'success': True,
-                'products_updated': total_updated,
+                'products_updated': 0,
                 'base_price': base_gold_price,
-                'message': f'Successfully updated {total_updated} products',
+                'message': 'No gold products found',
             }
 
-        except Exception as e:
-            _logger.error('Gold price update failed: %s',
-                          str(e), exc_info=True)
+        if product_model._is_skip_locked_repricing():
+            total_updated, skipped = product_model._reprice_skip_locked(
+                'gold', base_gold_price, gold_products.ids)
+            self._set_applied_gold_price(base_gold_price)
             return {
-                'success': False,
-                'products_updated': 0,
-                'base_price': None,
-                'message': f'Update failed: {str(e)}',
-                'error': str(e),
+                'success': True,
+                'products_updated': total_updated,
+                'skipped_locked': len(skipped),
+                'base_price': base_gold_price,
+                'message': f'Successfully updated {total_updated} products'
+                           + (f', {len(skipped)} locked ones queued' if skipped else ''),
             }
+
+        # Update prices in batches for performance; with COPY writes one
+        # batch holds the whole catalog (one COPY and one UPDATE)
+        batch_size = 100
+        if product_model._is_copy_price_apply():
+            batch_size = len(gold_products)
+        total_updated = 0
+
+        for i in range(0, len(gold_products), batch_size):
+            batch = gold_products[i:i + batch_size]
+            batch.update_gold_prices(base_gold_price)
+            total_updated += len(batch)
+            _logger.info('Updated batch: %d products (total: %d)',
+                         len(batch), total_updated)
+
+        self._set_applied_gold_price(base_gold_price)
+        _logger.info(
+            'Gold price update completed: %d products updated with base price %s',
+            total_updated,
+            base_gold_price
+        )
+
+        return {
+            'success': True,
+            'products_updated': total_updated,
+            'base_price': base_gold_price,
+            'message': f'Successfully updated {total_updated} products',
+        }
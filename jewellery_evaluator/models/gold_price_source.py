@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import re
+
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+
+
+class GoldPriceSource(models.Model):
+    _name = 'gold.price.source'
+    _description = 'Gold Price Source'
+    _order = 'sequence, id'
+
+    name = fields.Char(string='Name', required=True)
+    sequence = fields.Integer(
+        string='Sequence',
+        default=10,
+        help='Priority order: backups are hedged in this order after the primary endpoint from Settings.',
+    )
+    active = fields.Boolean(string='Active', default=True)
+    endpoint = fields.Char(
+        string='Endpoint',
+        required=True,
+        help='URL returning HTML/text with the 21K gold price (GET, HTTP 200).',
+    )
+    regex_formula = fields.Char(
+        string='21K Regex Formula',
+        required=True,
+        help='Regular expression extracting the 21K price per gram. Use one capturing group for the number.',
+    )
+
+    @api.constrains('endpoint', 'regex_formula')
+    def _check_endpoint_and_regex(self):
+        for source in self:
+            if not source.endpoint.startswith(('http://', 'https://')):
+                raise ValidationError(
+                    f'Gold price source "{source.name}" must use an HTTP/HTTPS URL.'
+                )
+            try:
+                re.compile(source.regex_formula)
+            except re.error as e:
+                raise ValidationError(
+                    f'Invalid regex formula for gold price source "{source.name}": {e}'
+                ) from e
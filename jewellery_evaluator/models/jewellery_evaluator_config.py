@@ -6,6 +6,19 @@
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
 
+# Fetch crons whose interval follows the repricing mode, and their interval (minutes) per mode.
+# The crons fetching silver start a Selenium browser and keep their own interval.
+FETCH_CRON_XMLIDS = (
+    'jewellery_evaluator.ir_cron_update_gold_prices',
+    'jewellery_evaluator.ir_cron_update_diamond_prices',
+)
+FETCH_CRON_INTERVALS = {
+    'interval': 10,
+    'on_change': 1,
+}
+# Silver cron, woken when the manual silver 999 price (its fetch fallback) is changed
+SILVER_CRON_XMLID = 'jewellery_evaluator.ir_cron_update_silver_prices'
+
 
 class ResConfigSettings(models.TransientModel):
     _inherit = 'res.config.settings'
@@ -33,6 +46,124 @@ class ResConfigSettings(models.TransientModel):
              'Automatically updated to the last fetched price whenever the API returns successfully.',
     )
 
+    gold_consensus_mode = fields.Selection(
+        selection=[
+            ('first', 'First answer (hedged requests)'),
+            ('median', 'Median of all sources'),
+        ],
+        string='Gold Source Consensus',
+        config_parameter='jewellery_evaluator.gold_consensus_mode',
+        default='first',
+        help='Used when additional gold price sources are configured. "First answer" fires '
+             'backup sources only when the previous one is slower than its p95 latency. '
+             '"Median" queries all sources and rejects outliers beyond the tolerance.',
+    )
+
+    gold_consensus_tolerance_pct = fields.Float(
+        string='Gold Consensus Tolerance (%)',
+        config_parameter='jewellery_evaluator.gold_consensus_tolerance_pct',
+        digits=(16, 2),
+        default=2.0,
+        help='Maximum deviation from the median price, in percent, for a source to be accepted.',
+    )
+
+    repricing_mode = fields.Selection(
+        selection=[
+            ('interval', 'Reprice every run'),
+            ('on_change', 'Reprice only when inputs change (event-driven)'),
+        ],
+        string='Repricing Mode',
+        config_parameter='jewellery_evaluator.repricing_mode',
+        default='interval',
+        help='Event-driven mode runs the gold and USD/EGP fetch crons every minute and only '
+             'queues the catalog repricing when a base price, the USD/EGP rate or a markup '
+             'changed. The Selenium silver fetch keeps its own interval.',
+    )
+
+    repricing_engine = fields.Selection(
+        selection=[
+            ('orm', 'ORM (product by product)'),
+            ('sql', 'SQL (one UPDATE per metal)'),
+            ('stream', 'Streaming (chunked read, bulk writes)'),
+        ],
+        string='Repricing Engine',
+        config_parameter='jewellery_evaluator.repricing_engine',
+        default='orm',
+        help='SQL reprices the whole gold or silver catalog with a single UPDATE using the '
+             'jewellery_compute_prices() database function. Streaming reads only the pricing '
+             'columns in chunks from a server-side cursor and writes prices in bulk, with '
+             'flat memory use. Same prices either way, no per-product writes through the '
+             'ORM (no write hooks or tracking).',
+    )
+
+    price_apply_backend = fields.Selection(
+        selection=[
+            ('standard', 'Standard'),
+            ('copy', 'COPY into a temporary table'),
+        ],
+        string='Price Write Backend',
+        config_parameter='jewellery_evaluator.price_apply_backend',
+        default='standard',
+        help='How repricing runs write computed prices. Standard writes product by product '
+             '(streaming engine: multi-row UPDATE batches). COPY streams all computed prices '
+             'into a temporary table and applies them with one UPDATE, for catalogs of '
+             'millions of products; ORM write hooks and tracking are skipped.',
+    )
+
+    skip_locked_repricing = fields.Boolean(
+        string='Skip Locked Products',
+        config_parameter='jewellery_evaluator.skip_locked_repricing',
+        help='Product-by-product gold and silver runs skip products locked by another '
+             'transaction (a product being saved, a POS session closing) instead of waiting; '
+             'skipped products are repriced by background jobs 30 seconds later.',
+    )
+
+    lazy_repricing = fields.Boolean(
+        string='Reprice on Read',
+        config_parameter='jewellery_evaluator.lazy_repricing',
+        help='Gold and silver price runs only publish a new price version; each product is '
+             'repriced when it is next read (POS, website, pricelist, forms) and a low-priority '
+             'background sweep catches up the rest.',
+    )
+
+    price_ingest_token = fields.Char(
+        string='Price Push Token',
+        config_parameter='jewellery_evaluator.price_ingest_token',
+        help='Bearer token required by POST /jewellery_evaluator/prices. '
+             'Leave empty to disable price pushes.',
+    )
+    metrics_token = fields.Char(
+        string='Metrics Token',
+        config_parameter='jewellery_evaluator.metrics_token',
+        help='Bearer token required by GET /jewellery_evaluator/metrics (Prometheus format). '
+             'Leave empty to disable the endpoint.',
+    )
+    profiling_mode = fields.Selection(
+        selection=[
+            ('off', 'Off'),
+            ('cprofile', 'cProfile'),
+        ],
+        string='Profiling',
+        config_parameter='jewellery_evaluator.profiling_mode',
+        default='off',
+        help='Profile a sample of pricing runs, POS order intakes and product creates/writes '
+             'with cProfile. Each profile is logged as a top-N summary and stored as a '
+             'downloadable attachment. Adds overhead to the profiled calls only.',
+    )
+    profiling_sample_rate = fields.Float(
+        string='Profiling Sample Rate',
+        config_parameter='jewellery_evaluator.profiling_sample_rate',
+        digits=(16, 3),
+        default=0.1,
+        help='Fraction of calls profiled, from 0 (none) to 1 (every call).',
+    )
+    profiling_top_n = fields.Integer(
+        string='Profile Summary Size',
+        config_parameter='jewellery_evaluator.profiling_top_n',
+        default=25,
+        help='Number of functions listed in the logged summary of each profile.',
+    )
+
     silver_fallback_price = fields.Float(
         string='Silver 999 Price (EGP/g)',
         config_parameter='jewellery_evaluator.silver_fallback_price',
@@ -221,14 +352,54 @@ class ResConfigSettings(models.TransientModel):
         return res
 
     def set_values(self):
+        ICP = self.env['ir.config_parameter'].sudo()
+        previous_mode = ICP.get_param('jewellery_evaluator.repricing_mode', 'interval')
+        was_lazy = bool(ICP.get_param('jewellery_evaluator.lazy_repricing'))
+        products = self.env['product.template']
+        previous_markups = products._get_markup_snapshot()
+        silver_service = self.env['silver.price.service']
+        previous_silver = silver_service._get_fallback_silver_price()
         super().set_values()
+        if self.repricing_mode and self.repricing_mode != previous_mode:
+            self._apply_repricing_mode_to_crons(self.repricing_mode)
+        if was_lazy and not self.lazy_repricing:
+            # Stale products still carry old prices: force the next run to reprice all
+            for source in ('gold', 'silver'):
+                ICP.set_param(f'jewellery_evaluator.applied_signature_{source}', False)
         if self.pos_config_id:
             self.pos_config_id.write({
                 "require_customer": self.require_customer,
                 "default_to_invoice": self.pos_to_invoice_by_default,
             })
-        # Trigger silver product price recalculation when silver settings change
-        self.env['silver.price.service'].update_all_silver_product_prices()
+        # Reprice only the segments whose markup changed, in the background
+        new_markups = products._get_markup_snapshot()
+        changed = [segment for segment, markup in new_markups.items()
+                   if previous_markups.get(segment) != markup]
+        if changed:
+            self.env['jewellery.job'].enqueue(
+                f"Reprice after markup change: {', '.join(changed)}",
+                'product.template', '_reprice_markup_segments', changed)
+        if silver_service._get_fallback_silver_price() != previous_silver:
+            # Reprice silver at the new manual price unless a fresh fetch replaces it
+            cron = self.env.ref(SILVER_CRON_XMLID, raise_if_not_found=False)
+            if cron and cron.active:
+                cron._trigger()
+        if self.repricing_mode == 'on_change':
+            # Markups may have changed: let the fetch crons compare signatures now
+            for xmlid in FETCH_CRON_XMLIDS:
+                cron = self.env.ref(xmlid, raise_if_not_found=False)
+                if cron and cron.active:
+                    cron._trigger()
+
+    def _apply_repricing_mode_to_crons(self, mode):
+        """Set the interval of the price fetch crons for the given repricing mode."""
+        for xmlid in FETCH_CRON_XMLIDS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron.sudo().write({
+                    'interval_number': FETCH_CRON_INTERVALS[mode],
+                    'interval_type': 'minutes',
+                })
 
     def get_markup_for_type(self, gold_type, weight_g=None):
         """
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import logging
+import time
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError, ValidationError
+
+_logger = logging.getLogger(__name__)
+
+# Cron draining the queue. Jobs are claimed with SKIP LOCKED, so a manual run
+# of the runner next to the cron never runs the same job twice.
+JOB_RUNNER_CRON_XMLID = 'jewellery_evaluator.ir_cron_run_jewellery_jobs'
+# Methods jobs may run, per model; anything else is refused when queued and when run
+JOB_ENTRY_POINTS = {
+    'product.template': frozenset({
+        '_reprice_markup_segments',
+        '_retry_skipped_repricing',
+        '_update_jewellery_prices_job',
+    }),
+}
+
+
+class JewelleryJob(models.Model):
+    _name = 'jewellery.job'
+    _description = 'Jewellery Background Job'
+    _order = 'id desc'
+
+    # A runner stops claiming jobs after this many seconds and re-triggers itself
+    RUN_TIME_BUDGET_SECONDS = 240
+    # First retry delay, doubled on every further attempt
+    RETRY_DELAY_SECONDS = 60
+    # Running jobs not finished after this long were lost with their worker
+    STALE_RUNNING_MINUTES = 60
+
+    name = fields.Char(string='Job', required=True)
+    model_name = fields.Char(string='Model', required=True)
+    method_name = fields.Char(string='Method', required=True)
+    args = fields.Json(string='Arguments', default=list)
+    priority = fields.Integer(
+        string='Priority',
+        default=10,
+        help='Jobs with a lower priority run first.',
+    )
+    state = fields.Selection(
+        selection=[
+            ('pending', 'Pending'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+            ('cancelled', 'Cancelled'),
+        ],
+        string='State',
+        required=True,
+        default='pending',
+        index=True,
+    )
+    eta = fields.Datetime(
+        string='Not Before',
+        readonly=True,
+        help='A pending job waiting for a retry does not run before this time.',
+    )
+    attempts = fields.Integer(string='Attempts', readonly=True)
+    max_retries = fields.Integer(
+        string='Max Retries',
+        default=3,
+        help='Times a failing job is run again before it is marked as failed.',
+    )
+    progress_done = fields.Integer(string='Done', readonly=True)
+    progress_total = fields.Integer(string='Total', readonly=True)
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    result = fields.Text(string='Result', readonly=True)
+    error = fields.Text(string='Error', readonly=True)
+    date_started = fields.Datetime(string='Started', readonly=True)
+    date_done = fields.Datetime(string='Finished', readonly=True)
+
+    @api.constrains('model_name', 'method_name')
+    def _check_entry_point(self):
+        for job in self:
+            if job.method_name not in JOB_ENTRY_POINTS.get(job.model_name, ()):
+                raise ValidationError(
+                    f'{job.model_name}.{job.method_name} is not a jewellery job entry point.'
+                )
+
+    @api.depends('progress_done', 'progress_total')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = (
+                100.0 * job.progress_done / job.progress_total if job.progress_total else 0.0)
+
+    @api.model
+    def enqueue(self, name, model_name, method_name, *args, priority=10, max_retries=3, eta=None):
+        """
+        Queue model_name.method_name(*args) to run in the background, as the
+        current user, and wake the job runners. Returns at once.
+
+        :param name: Label shown in the job list
+        :param args: JSON-serializable positional arguments
+        :param priority: Lower runs first
+        :param max_retries: Runs after a failure before the job is marked as failed
+        :param eta: Datetime the job must not run before (default: as soon as possible)
+        :return: jewellery.job record
+        """
+        job = self.sudo().create({
+            'name': name,
+            'model_name': model_name,
+            'method_name': method_name,
+            'args': list(args),
+            'priority': priority,
+            'max_retries': max_retries,
+            'eta': eta or False,
+        })
+        self._trigger_runners(at=eta)
+        return job
+
+    @api.model
+    def _trigger_runners(self, at=None):
+        cron = self.env.ref(JOB_RUNNER_CRON_XMLID, raise_if_not_found=False)
+        if cron and cron.active:
+            cron._trigger(at=at)
+
+    def action_retry(self):
+        if any(job.state not in ('failed', 'cancelled') for job in self):
+            raise UserError(_('Only failed or cancelled jobs can be retried.'))
+        self.write({'state': 'pending', 'attempts': 0, 'eta': False, 'error': False})
+        self._trigger_runners()
+
+    def action_cancel(self):
+        if any(job.state != 'pending' for job in self):
+            raise UserError(_('Only pending jobs can be cancelled.'))
+        self.write({'state': 'cancelled'})
+
+    @api.model
+    def _run_pending_jobs(self):
+        """
+        Claim and run due pending jobs, by priority then age, until the queue is
+        empty or the time budget is spent; then re-trigger the runners if work
+        is left. Called by the job runner crons.
+
+        :return: int - Number of jobs run
+        """
+        self._requeue_stale_jobs()
+        started = time.monotonic()
+        count = 0
+        while time.monotonic() - started < self.RUN_TIME_BUDGET_SECONDS:
+            job = self._claim_next_job()
+            if not job:
+                return count
+            self._run_job(job)
+            count += 1
+        self._trigger_runners()
+        return count
+
+    @api.model
+    def _requeue_stale_jobs(self):
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                UPDATE jewellery_job SET state = 'pending'
+                 WHERE state = 'running'
+                   AND date_started < (now() at time zone 'UTC') - make_interval(mins => %s)
+            """, (self.STALE_RUNNING_MINUTES,))
+            if cr.rowcount:
+                _logger.warning('Requeued %s jewellery jobs lost by their worker', cr.rowcount)
+
+    @api.model
+    def _claim_next_job(self):
+        """
+        Mark the next due pending job as running, in its own committed
+        transaction; SKIP LOCKED lets several runners claim different jobs.
+        The claimed row is returned from that transaction: the runner's own
+        snapshot may predate the job, or hold the attempts before the claim.
+
+        :return: dict|None - Claimed job: id, create_uid, name, model_name,
+            method_name, args, attempts (including this run) and max_retries
+        """
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                UPDATE jewellery_job
+                   SET state = 'running', attempts = COALESCE(attempts, 0) + 1,
+                       date_started = (now() at time zone 'UTC'), date_done = NULL,
+                       progress_done = 0, progress_total = 0
+                 WHERE id = (
+                       SELECT id FROM jewellery_job
+                        WHERE state = 'pending'
+                          AND (eta IS NULL OR eta <= (now() at time zone 'UTC'))
+                        ORDER BY priority, id
+                        LIMIT 1
+                          FOR UPDATE SKIP LOCKED)
+             RETURNING id, create_uid, name, model_name, method_name, args,
+                       attempts, max_retries
+            """)
+            return cr.dictfetchone()
+
+    def _write_in_own_transaction(self, job_id, vals):
+        with self.env.registry.cursor() as cr:
+            api.Environment(cr, self.env.uid, {})['jewellery.job'].browse(job_id).write(vals)
+
+    @api.model
+    def _run_job(self, job):
+        """
+        Run one claimed job. Progress and final state are written in their own
+        transactions, so the work's transaction never updates the job row and
+        the UI sees progress while the job runs; the work is committed before
+        the job is marked done. A failure is retried with exponential backoff
+        until max_retries is reached; a job whose method is not listed in
+        JOB_ENTRY_POINTS fails without running.
+
+        :param job: Claimed job row, as returned by _claim_next_job
+        """
+        job_id = job['id']
+        if job['method_name'] not in JOB_ENTRY_POINTS.get(job['model_name'], ()):
+            _logger.error('Jewellery job %s (%s) refused: %s.%s is not an entry point',
+                          job_id, job['name'], job['model_name'], job['method_name'])
+            self._write_in_own_transaction(job_id, {
+                'state': 'failed', 'error': 'Not a jewellery job entry point',
+                'date_done': fields.Datetime.now(),
+            })
+            self.browse(job_id).invalidate_recordset()
+            return
+        attempts, max_retries = job['attempts'], job['max_retries'] or 0
+        try:
+            with self.env.registry.cursor() as cr:
+                env = api.Environment(cr, job['create_uid'] or self.env.uid,
+                                      {'jewellery_job_id': job_id})
+                result = getattr(env[job['model_name']], job['method_name'])(*(job['args'] or []))
+        except Exception as e:
+            if attempts <= max_retries:
+                delay = self.RETRY_DELAY_SECONDS * 2 ** (attempts - 1)
+                eta = fields.Datetime.now() + timedelta(seconds=delay)
+                _logger.warning('Jewellery job %s (%s) failed, retry %s/%s at %s: %s',
+                                job_id, job['name'], attempts, max_retries, eta, e)
+                self._write_in_own_transaction(job_id, {
+                    'state': 'pending', 'eta': eta, 'error': str(e),
+                })
+                self._trigger_runners(at=eta)
+            else:
+                _logger.exception('Jewellery job %s (%s) failed', job_id, job['name'])
+                self._write_in_own_transaction(job_id, {
+                    'state': 'failed', 'error': str(e), 'date_done': fields.Datetime.now(),
+                })
+        else:
+            self._write_in_own_transaction(job_id, {
+                'state': 'done', 'result': str(result) if result is not None else False,
+                'error': False, 'date_done': fields.Datetime.now(),
+            })
+        self.browse(job_id).invalidate_recordset()
+
+    @api.model
+    def _report_progress(self, done, total):
+        """
+        Report progress of the job running in this environment (no-op outside jobs).
+
+        :param done: Units of work done
+        :param total: Units of work in the job
+        """
+        job_id = self.env.context.get('jewellery_job_id')
+        if job_id:
+            self._write_in_own_transaction(job_id, {'progress_done': done, 'progress_total': total})
@@ -6,6 +6,7 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
 
+from .. import metrics
 from ..utils import get_markup_per_gram
 
 # Same selections as product.template for gold fields on order line
@@ -88,8 +89,15 @@ class PosOrder(models.Model):
         """
         Override to validate gold product prices before order creation and to
         populate gold-specific fields on each order line from product and price
-        service.
+        service. The time spent is observed by the POS validation latency metric,
+        and sampled calls are profiled when jewellery profiling is on.
         """
+        with metrics.POS_ORDER_VALIDATION_SECONDS.time():
+            return self.env['jewellery.profiler']._run_profiled(
+                'pos_order_fields', self._jewellery_order_fields, ui_order)
+
+    @api.model
+    def _jewellery_order_fields(self, ui_order):
         order_fields = super()._order_fields(ui_order)
 
         # Validate each line for gold products
@@ -180,7 +188,17 @@ class PosOrder(models.Model):
         """
         Raise ValidationError if any storable product line requests more than
         available stock at the POS location. Consumables and services are ignored.
+        The number of SQL queries of the check is observed by a metric.
         """
+        queries_before = getattr(self.env.cr, 'sql_log_count', 0)
+        try:
+            self._check_storable_product_stock_levels(ui_order, lines_data)
+        finally:
+            metrics.POS_STOCK_CHECK_QUERIES.observe(
+                getattr(self.env.cr, 'sql_log_count', 0) - queries_before)
+
+    @api.model
+    def _check_storable_product_stock_levels(self, ui_order, lines_data):
         if not lines_data:
             return
         session_id = ui_order.get('pos_session_id')
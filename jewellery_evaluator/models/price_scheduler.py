@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import functools
+import logging
+import zlib
+
+from odoo import api, fields, models
+
+from .. import metrics
+from ..price_feeds import fetch_concurrently  # noqa: E402
+from ..utils import GOLD_MARKUP_PARAM_KEYS, compute_pricing_signature
+from .gold_price_service import GOLD_API_TIMEOUT
+from .silver_price_service import _fetch_silver_price_selenium
+
+_logger = logging.getLogger(__name__)
+
+# Per-source fetch timeouts (seconds): (system parameter, default)
+FETCH_TIMEOUT_PARAMS = {
+    'gold': ('jewellery_evaluator.fetch_timeout_gold', float(GOLD_API_TIMEOUT)),
+    'silver': ('jewellery_evaluator.fetch_timeout_silver', 45.0),
+    'usd_egp': ('jewellery_evaluator.fetch_timeout_usd_egp', 10.0),
+}
+# Per-source repricing run locks: transaction-level advisory locks (namespace, source index)
+RUN_LOCK_NAMESPACE = zlib.crc32(b'jewellery_evaluator.run_lock') & 0x7fffffff
+RUN_LOCK_SOURCES = ('gold', 'silver', 'usd_egp')
+# Extra passes a running job makes for values recorded by runs it blocked
+MAX_COALESCED_PASSES = 3
+
+
+class JewelleryPriceScheduler(models.Model):
+    _name = 'jewellery.price.scheduler'
+    _description = 'Jewellery Price Scheduler'
+
+    @api.model
+    def _get_fetch_timeout(self, source):
+        param_key, default = FETCH_TIMEOUT_PARAMS[source]
+        raw = self.env['ir.config_parameter'].sudo().get_param(param_key, str(default))
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+
+    @api.model
+    def _is_on_change_mode(self):
+        """True when fetch crons only queue repricing on input changes (event-driven mode)."""
+        return self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.repricing_mode', 'interval') == 'on_change'
+
+    @api.model
+    def _get_pricing_signature(self, source, value):
+        """
+        Fingerprint of everything that determines the catalog prices fed by a source.
+
+        :param source: 'gold', 'silver' or 'usd_egp'
+        :param value: Base price per gram, or the USD to EGP rate
+        :return: str - Signature comparable with the last applied one
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        if source == 'gold':
+            inputs = [ICP.get_param(key, '0.0') for key in GOLD_MARKUP_PARAM_KEYS]
+        elif source == 'silver':
+            inputs = [ICP.get_param('jewellery_evaluator.silver_markup_per_gram', '0.0')]
+        else:
+            diamond_service = self.env['diamond.price.service']
+            inputs = [diamond_service.get_global_diamond_discount(),
+                      diamond_service.get_current_diamond_price_usd()]
+        return compute_pricing_signature([value] + inputs)
+
+    @api.model
+    def _set_applied_signature(self, source, value):
+        """Remember the inputs the catalog was last repriced with (called after repricing)."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            f'jewellery_evaluator.applied_signature_{source}',
+            self._get_pricing_signature(source, value),
+        )
+
+    @api.model
+    def _inputs_changed(self, source, value):
+        """True if value or the related markup settings changed since the last applied run."""
+        applied = self.env['ir.config_parameter'].sudo().get_param(
+            f'jewellery_evaluator.applied_signature_{source}', '')
+        return applied != self._get_pricing_signature(source, value)
+
+    @api.model
+    def _queue_repricing_if_changed(self, source, value):
+        """
+        Fetch-stage exit for event-driven mode: record a tick and trigger the
+        repricing cron only if the pricing inputs changed.
+
+        :return: dict - Update summary in the same shape as update_all_* results
+        """
+        if not self._inputs_changed(source, value):
+            return {'success': True, 'products_updated': 0, 'base_price': value,
+                    'queued': False, 'unchanged': True, 'message': 'Pricing inputs unchanged'}
+        self.env['jewellery.price.tick'].record_ticks({source: value}, source='poll')
+        _logger.info('Pricing inputs changed for %s (%s); repricing queued', source, value)
+        return {'success': True, 'products_updated': 0, 'base_price': value,
+                'queued': True, 'message': 'Pricing inputs changed; repricing queued'}
+
+    @api.model
+    def _reprice_source(self, source, value):
+        """Run the repricing stage of the metal fed by source with an already known value."""
+        if source == 'gold':
+            return self.env['gold.price.service'].update_all_gold_product_prices(
+                base_gold_price=value)
+        if source == 'silver':
+            return self.env['silver.price.service'].update_all_silver_product_prices(
+                base_silver=value)
+        return self.env['diamond.price.service'].update_all_diamond_product_prices(
+            exchange_rate=value)
+
+    @api.model
+    def _try_run_lock(self, source):
+        """Take the repricing run lock of source until the end of the transaction; False if held."""
+        self.env.cr.execute('SELECT pg_try_advisory_xact_lock(%s, %s)',
+                            (RUN_LOCK_NAMESPACE, RUN_LOCK_SOURCES.index(source)))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _record_coalesced_tick(self, source, value):
+        # Own transaction: the running job must see it before the caller commits
+        with self.env.registry.cursor() as cr:
+            api.Environment(cr, self.env.uid, self.env.context)['jewellery.price.tick'].create({
+                'metal': source, 'price': value, 'source': 'coalesced',
+            })
+
+    @api.model
+    def _get_coalesced_ticks(self, source, since, exclude_ids=()):
+        """
+        Values recorded by runs blocked on the run lock of source, read in a new
+        transaction (the current snapshot cannot see them).
+
+        :param since: Start of the running job; older ticks are leftovers of a
+            failed run and are only discarded
+        :param exclude_ids: Ticks already handled by the running job
+        :return: tuple - (ids of all pending coalesced ticks, latest price since
+            the start or None)
+        """
+        with self.env.registry.cursor() as cr:
+            ticks = api.Environment(cr, self.env.uid, self.env.context)[
+                'jewellery.price.tick'].search([
+                    ('metal', '=', source),
+                    ('applied', '=', False),
+                    ('source', '=', 'coalesced'),
+                    ('id', 'not in', list(exclude_ids)),
+                ])
+            recent = ticks.filtered(lambda t: t.received_at >= since)
+            return ticks.ids, recent[:1].price if recent else None
+
+    @api.model
+    def _mark_ticks_applied(self, tick_ids):
+        """
+        Mark coalesced ticks applied once the run's transaction commits; a run
+        rolled back leaves them pending for the next run. The ticks were
+        committed after this transaction's snapshot, so it cannot update them.
+        """
+        registry, uid, context = self.env.registry, self.env.uid, self.env.context
+
+        @self.env.cr.postcommit.add
+        def mark_applied():
+            with registry.cursor() as cr:
+                api.Environment(cr, uid, context)['jewellery.price.tick'].browse(
+                    tick_ids).write({'applied': True})
+
+    @api.model
+    def _run_coalesced(self, source, value, reprice):
+        """
+        Run a repricing stage under the run lock of its source, so runs never overlap.
+
+        A run that finds the lock taken records its value as a pending tick
+        ("dirty") and returns at once. The running job checks for such ticks when
+        it is done and makes one more pass with the latest value if the pricing
+        inputs changed, up to MAX_COALESCED_PASSES times. The ticks are marked
+        applied when the job's transaction commits.
+
+        :param source: 'gold', 'silver' or 'usd_egp'
+        :param value: Base price per gram, or the USD to EGP rate
+        :param reprice: Callable repricing the catalog with a value, returning a summary
+        :return: dict - Update summary of the last pass
+        """
+        if not self._try_run_lock(source):
+            self._record_coalesced_tick(source, value)
+            _logger.info('Repricing %s already running; %s handed over to it', source, value)
+            return {'success': True, 'products_updated': 0, 'base_price': value,
+                    'coalesced': True,
+                    'message': 'Repricing already running; latest price handed over to it'}
+        started = fields.Datetime.now()
+        result = reprice(value)
+        handled: list = []
+        for _pass in range(MAX_COALESCED_PASSES):
+            tick_ids, latest = self._get_coalesced_ticks(source, started, handled)
+            if not tick_ids:
+                break
+            if latest and self._inputs_changed(source, latest):
+                _logger.info('Repricing %s again with %s, recorded during the run', source, latest)
+                result = reprice(latest)
+            handled.extend(tick_ids)
+        if handled:
+            self._mark_ticks_applied(handled)
+        return result
+
+    @api.model
+    def _apply_source_value(self, source, value):
+        """
+        Reprice the metal fed by source if its pricing inputs changed; in
+        event-driven mode only queue the repricing stage instead.
+
+        :return: dict - Update summary
+        """
+        if self._is_on_change_mode():
+            return self._queue_repricing_if_changed(source, value)
+        if not self._inputs_changed(source, value):
+            return {'success': True, 'products_updated': 0, 'base_price': value,
+                    'message': 'Pricing inputs unchanged'}
+        return self._reprice_source(source, value)
+
+    @api.model
+    def _prepare_fetch_jobs(self):
+        """
+        Build the thread-safe fetch callables for every source.
+
+        Configuration is read here, in the cron thread; the returned callables
+        only receive plain values so they can run in worker threads.
+
+        :return: dict - source name to (callable, timeout)
+        """
+        jobs: dict = {}
+        timeout = self._get_fetch_timeout('gold')
+        try:
+            jobs['gold'] = (
+                self.env['gold.price.service']._prepare_gold_fetch(timeout),
+                timeout,
+            )
+        except ValueError as e:
+            _logger.warning('Gold source skipped by price scheduler: %s', e)
+        silver_page_url = self.env['silver.price.service']._get_silver_page_url()
+        jobs['silver'] = (functools.partial(_fetch_silver_price_selenium, silver_page_url),
+                          self._get_fetch_timeout('silver'))
+        # Resolved in the cron thread: the rate provider may need the ORM.
+        usd_egp_rate = self.env['diamond.price.service'].get_usd_to_egp_rate()
+        jobs['usd_egp'] = (lambda: usd_egp_rate, self._get_fetch_timeout('usd_egp'))
+        return jobs
+
+    @api.model
+    def run_price_updates(self):
+        """
+        Fetch gold, silver and USD/EGP concurrently, then reprice each metal whose
+        pricing inputs (source value or markup settings) changed since its last
+        applied run. Called by cron.
+
+        A slow or failing source only affects its own metal: the others are
+        repriced as soon as all fetches have returned or timed out.
+
+        :return: dict - Per-source fetch outcome and per-metal update summary
+        """
+        _logger.info('Starting concurrent price fetch for gold, silver and USD/EGP')
+        outcomes = fetch_concurrently(self._prepare_fetch_jobs())
+        for outcome in outcomes.values():
+            if outcome.value is None:
+                _logger.warning('Price source %s failed after %.2fs: %s',
+                                outcome.source, outcome.elapsed, outcome.error)
+            else:
+                _logger.info('Price source %s returned %s in %.2fs',
+                             outcome.source, outcome.value, outcome.elapsed)
+
+        results: dict = {
+            'fetch': {
+                name: {
+                    'value': outcome.value,
+                    'elapsed': outcome.elapsed,
+                    'error': outcome.error,
+                }
+                for name, outcome in outcomes.items()
+            },
+        }
+
+        gold = outcomes.get('gold')
+        if gold and gold.value and gold.value > 0:
+            self.env['gold.price.service']._set_fetched_gold_price(gold.value)
+            results['gold'] = self._apply_source_value('gold', gold.value)
+        else:
+            results['gold'] = {'success': False, 'products_updated': 0, 'base_price': None,
+                               'message': 'Gold price not available',
+                               'error': gold.error if gold else 'Gold source not configured'}
+
+        silver = outcomes.get('silver')
+        if silver and silver.value and silver.value > 0:
+            base_silver = silver.value
+        else:
+            base_silver = self.env['silver.price.service']._get_fallback_silver_price()
+            metrics.PRICE_FALLBACKS.inc(source='silver')
+        if base_silver > 0:
+            results['silver'] = self._apply_source_value('silver', base_silver)
+        else:
+            results['silver'] = {'success': True, 'products_updated': 0,
+                                 'base_price': base_silver,
+                                 'message': 'Silver price not configured'}
+
+        usd_egp = outcomes.get('usd_egp')
+        if usd_egp and usd_egp.value and usd_egp.value > 0:
+            results['diamond'] = self._apply_source_value('usd_egp', usd_egp.value)
+        else:
+            results['diamond'] = {'success': True, 'products_updated': 0,
+                                  'message': 'Exchange rate not available'}
+
+        _logger.info(
+            'Price scheduler completed: gold=%s silver=%s diamond=%s',
+            results['gold'].get('products_updated'),
+            results['silver'].get('products_updated'),
+            results['diamond'].get('products_updated'),
+        )
+        return results
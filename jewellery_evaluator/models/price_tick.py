@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class JewelleryPriceTick(models.Model):
+    _name = 'jewellery.price.tick'
+    _description = 'Jewellery Price Tick'
+    _order = 'received_at desc, id desc'
+
+    METAL_SELECTION = [
+        ('gold', 'Gold (21K per gram)'),
+        ('silver', 'Silver (999 per gram)'),
+        ('usd_egp', 'USD to EGP rate (diamonds)'),
+    ]
+    TICK_RETENTION_DAYS = 30
+
+    metal = fields.Selection(
+        selection=METAL_SELECTION,
+        string='Metal',
+        required=True,
+        index=True,
+    )
+    price = fields.Float(
+        string='Price',
+        digits=(16, 4),
+        required=True,
+    )
+    source = fields.Char(
+        string='Source',
+        help='How the price arrived: push (price endpoint), poll (fetch crons) '
+             'or coalesced (handed over to a running repricing).',
+    )
+    label = fields.Char(
+        string='Pushed By',
+        help='Feed name given by the pusher (e.g. upstream feed name or selenium_automation).',
+    )
+    received_at = fields.Datetime(
+        string='Received At',
+        required=True,
+        default=fields.Datetime.now,
+    )
+    applied = fields.Boolean(
+        string='Applied',
+        default=False,
+        index=True,
+        help='Set once the repricing stage has processed this tick.',
+    )
+
+    @api.model
+    def record_ticks(self, prices, source=None, label=None):
+        """
+        Record pushed prices and queue repricing right away.
+
+        The price is also stored as the metal's fallback price so live-price
+        readers (POS enrichment, onchange) see it before repricing completes.
+
+        :param prices: dict - metal ('gold'/'silver'/'usd_egp') to positive price or rate
+        :param source: str - How the price arrived ('push' or 'poll')
+        :param label: str - Name of the pushing feed, as given by the client
+        :return: jewellery.price.tick recordset of created ticks
+        """
+        vals_list = [
+            {'metal': metal, 'price': price, 'source': source, 'label': label}
+            for metal, price in prices.items()
+        ]
+        ticks = self.create(vals_list)
+        for tick in ticks:
+            if tick.metal == 'gold':
+                self.env['gold.price.service']._set_fetched_gold_price(tick.price)
+            elif tick.metal == 'silver':
+                self.env['silver.price.service'].set_silver_price_999(tick.price)
+        if ticks:
+            self.env.ref('jewellery_evaluator.ir_cron_apply_price_ticks')._trigger()
+        return ticks
+
+    @api.model
+    def apply_pending_ticks(self):
+        """
+        Reprice every metal that received ticks since the last run, using only the
+        latest tick per metal. Called by cron, triggered on push ingestion and by
+        the fetch crons in event-driven mode.
+
+        :return: dict - metal to update summary
+        """
+        results = {}
+        # Coalesced ticks belong to the run that blocked them (see _run_coalesced)
+        pending = self.search([('applied', '=', False), ('source', '!=', 'coalesced')])
+        scheduler = self.env['jewellery.price.scheduler']
+        for metal in {tick.metal for tick in pending}:
+            metal_ticks = pending.filtered(lambda t, m=metal: t.metal == m)
+            latest = metal_ticks[0]
+            if not scheduler._inputs_changed(metal, latest.price):
+                results[metal] = {'success': True, 'products_updated': 0,
+                                  'base_price': latest.price,
+                                  'message': 'Pricing inputs unchanged'}
+            else:
+                results[metal] = scheduler._reprice_source(metal, latest.price)
+            if results[metal].get('success'):
+                metal_ticks.write({'applied': True})
+                _logger.info('Applied %d pushed %s tick(s), latest price %s',
+                             len(metal_ticks), metal, latest.price)
+        return results
+
+    @api.autovacuum
+    def _gc_applied_ticks(self):
+        """Delete applied (or never consumed coalesced) ticks older than TICK_RETENTION_DAYS."""
+        limit = fields.Datetime.now() - timedelta(days=self.TICK_RETENTION_DAYS)
+        self.search([
+            '|', ('applied', '=', True), ('source', '=', 'coalesced'),
+            ('received_at', '<', limit),
+        ]).unlink()
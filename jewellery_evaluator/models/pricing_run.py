@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+from .. import metrics, run_stats
+from ..run_stats import STAGES
+
+_logger = logging.getLogger(__name__)
+
+
+class JewelleryPricingRun(models.Model):
+    _name = 'jewellery.pricing.run'
+    _description = 'Jewellery Pricing Run'
+    _order = 'date_start desc, id desc'
+    _rec_name = 'metal'
+
+    RUN_RETENTION_DAYS = 30
+
+    metal = fields.Selection(
+        selection=[
+            ('gold', 'Gold'),
+            ('silver', 'Silver'),
+            ('diamond', 'Diamond'),
+        ],
+        string='Metal',
+        required=True,
+        index=True,
+    )
+    date_start = fields.Datetime(string='Started', required=True, index=True)
+    duration = fields.Float(string='Duration (s)', digits=(16, 3), group_operator='avg')
+    success = fields.Boolean(string='Success')
+    products_updated = fields.Integer(string='Products Updated')
+    base_price = fields.Float(
+        string='Base Price',
+        digits=(16, 4),
+        group_operator='avg',
+        help='Gold 21K or silver 999 price per gram, or the USD to EGP rate for diamonds.',
+    )
+    fetch_time = fields.Float(string='Fetch (s)', digits=(16, 3), group_operator='avg')
+    parse_time = fields.Float(string='Parse (s)', digits=(16, 3), group_operator='avg')
+    search_time = fields.Float(string='Search (s)', digits=(16, 3), group_operator='avg')
+    compute_time = fields.Float(string='Compute (s)', digits=(16, 3), group_operator='avg')
+    write_time = fields.Float(string='Write (s)', digits=(16, 3), group_operator='avg')
+    flush_time = fields.Float(
+        string='Recompute/Flush (s)', digits=(16, 3), group_operator='avg')
+    query_count = fields.Integer(string='SQL Queries', group_operator='avg')
+    bytes_fetched = fields.Integer(string='Bytes Fetched')
+    fallback_used = fields.Boolean(
+        string='Fallback Used',
+        help='The run priced with a stored fallback instead of a freshly fetched value.',
+    )
+    price_age = fields.Float(
+        string='Price Age (s)',
+        digits=(16, 0),
+        group_operator='max',
+        help='Seconds since the price source was last fetched successfully.',
+    )
+    message = fields.Char(string='Message')
+    stats = fields.Json(string='Details', readonly=True)
+
+    @api.model
+    def _instrument(self, metal, run, *args):
+        """
+        Run a pricing run recording its stage timings, SQL query counts, fetched
+        bytes, fallback usage and price age. The measurements are added to the
+        returned summary under 'stats' and, unless the run repriced nothing
+        because the inputs were unchanged, the repricing was queued or handed
+        over to a running job, stored as a jewellery.pricing.run.
+
+        :param metal: 'gold', 'silver' or 'diamond'
+        :param run: Callable returning the run's summary dict
+        :return: dict - Summary of the run, with 'stats'
+        """
+        cr = self.env.cr
+        stats = run_stats.RunStats(query_count=lambda: getattr(cr, 'sql_log_count', 0))
+        started = fields.Datetime.now()
+        with run_stats.recording(stats):
+            result = self.env['jewellery.profiler']._run_profiled(
+                f'update_all_{metal}_product_prices', run, *args)
+            if result.get('success'):
+                # Pending writes and recomputes are part of the run's cost
+                with run_stats.stage('flush'):
+                    self.env.flush_all()
+        stats.price_age = self._get_price_age(metal)
+        result = dict(result, stats=stats.as_dict())
+        if not self._is_repricing(result):
+            return result
+        success = 'true' if result.get('success') else 'false'
+        metrics.REPRICING_SECONDS.observe(result['stats']['duration'], metal=metal, success=success)
+        metrics.REPRICING_ROWS.inc(result.get('products_updated') or 0, metal=metal)
+        self._record_run(metal, started, result)
+        return result
+
+    @api.model
+    def _is_repricing(self, result):
+        """
+        False for polls that did not reprice: pricing inputs unchanged, repricing
+        queued in event-driven mode, or value handed over to a running repricing.
+        """
+        return not (result.get('unchanged') or 'queued' in result or result.get('coalesced'))
+
+    @api.model
+    def _get_price_age(self, metal):
+        """
+        :return: float|None - Seconds since the metal's price source was last
+            fetched successfully, or None if unknown
+        """
+        if metal == 'diamond':
+            return self.env['diamond.price.service']._get_usd_egp_rate_age()
+        raw = self.env['ir.config_parameter'].sudo().get_param(
+            f'jewellery_evaluator.{metal}_price_fetched_at')
+        if not raw:
+            return None
+        try:
+            fetched_at = fields.Datetime.to_datetime(raw)
+        except ValueError:
+            return None
+        return max((fields.Datetime.now() - fetched_at).total_seconds(), 0.0)
+
+    @api.model
+    def _set_fetched_at(self, metal):
+        """Remember that the metal's price source was just fetched successfully."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            f'jewellery_evaluator.{metal}_price_fetched_at',
+            fields.Datetime.to_string(fields.Datetime.now()),
+        )
+
+    @api.model
+    def _record_run(self, metal, started, result):
+        """
+        Store a run in its own transaction, so failed runs are kept even when
+        the run's transaction is rolled back.
+        """
+        stats = result['stats']
+        vals = {
+            'metal': metal,
+            'date_start': started,
+            'duration': stats['duration'],
+            'success': bool(result.get('success')),
+            'products_updated': result.get('products_updated') or 0,
+            'base_price': result.get('base_price') or result.get('exchange_rate') or 0.0,
+            'query_count': stats['query_count'],
+            'bytes_fetched': stats['bytes_fetched'],
+            'fallback_used': stats['fallback_used'],
+            'price_age': stats['price_age'] or 0.0,
+            'message': result.get('message'),
+            'stats': stats,
+        }
+        vals.update({f'{name}_time': stats['timings'][name] for name in STAGES})
+        try:
+            with self.env.registry.cursor() as cr:
+                api.Environment(cr, self.env.uid, {})['jewellery.pricing.run'].sudo().create(vals)
+        except Exception:
+            _logger.exception('Could not record %s pricing run', metal)
+
+    @api.autovacuum
+    def _gc_pricing_runs(self):
+        """Delete pricing runs older than RUN_RETENTION_DAYS."""
+        limit = fields.Datetime.now() - timedelta(days=self.RUN_RETENTION_DAYS)
+        self.search([('date_start', '<', limit)]).unlink()
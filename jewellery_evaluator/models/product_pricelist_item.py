@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+from odoo import _, fields, models
+
+from ..utils import (
+    compute_gold_product_price,
+    compute_silver_product_price,
+    get_markup_per_gram,
+    get_silver_markup_per_gram,
+)  # noqa: E402
+
+
+class ProductPricelistItem(models.Model):
+    _inherit = 'product.pricelist.item'
+
+    compute_price = fields.Selection(
+        selection_add=[('metal_indexed', 'Metal-indexed')],
+        ondelete={'metal_indexed': 'set default'},
+    )
+    metal_override_markup = fields.Boolean(
+        string='Own Markup',
+        help='Use the markup per gram below instead of the markups from Settings '
+             '(e.g. a branch with different margins).',
+    )
+    metal_markup_per_gram = fields.Float(
+        string='Markup per Gram',
+        digits=(16, 4),
+        help='Markup per gram applied to gold and silver products by this rule.',
+    )
+
+    def _compute_name_and_price(self):
+        super()._compute_name_and_price()
+        for item in self.filtered(lambda i: i.compute_price == 'metal_indexed'):
+            item.price = _('Gold/silver price × weight + markup')
+
+    def _get_metal_indexed_price(self, product):
+        """
+        Sale price of a gold or silver product from the applied metal price, its
+        weight, purity and type, and the markup of this rule or of Settings.
+
+        :param product: product.product or product.template record
+        :return: float or None - Price in company currency, None for other products
+        """
+        self.ensure_one()
+        template = product.product_tmpl_id if product._name == 'product.product' else product
+        weight = template.jewellery_weight_g or 0.0
+        if weight <= 0:
+            return None
+        try:
+            if template.is_gold_product and template.gold_purity:
+                internal_gold_type = template._map_jewellery_type_to_gold_type(
+                    template.jewellery_type)
+                if not internal_gold_type:
+                    return None
+                if self.metal_override_markup:
+                    markup_per_gram = self.metal_markup_per_gram
+                else:
+                    markup_per_gram = get_markup_per_gram(
+                        self.env, internal_gold_type,
+                        weight_g=weight if internal_gold_type == 'bars' else None)
+                _cost, sale_price, _min = compute_gold_product_price(
+                    base_gold_price_21k=self.env['gold.price.service'].get_applied_gold_price(),
+                    purity=template.gold_purity,
+                    weight_g=weight,
+                    markup_per_gram=markup_per_gram,
+                )
+                return sale_price
+            if template.is_silver_product and template.silver_purity:
+                markup_per_gram = (self.metal_markup_per_gram if self.metal_override_markup
+                                   else get_silver_markup_per_gram(self.env))
+                _cost, sale_price, _min = compute_silver_product_price(
+                    base_silver_999_per_gram=self.env['silver.price.service'].get_applied_silver_price_999(),
+                    weight_g=weight,
+                    markup_per_gram=markup_per_gram,
+                )
+                return sale_price
+        except ValueError:
+            return None
+        return None
+
+    def _compute_price(self, product, quantity, uom, date, currency=None):
+        if self.compute_price != 'metal_indexed':
+            return super()._compute_price(product, quantity, uom, date, currency=currency)
+        self.ensure_one()
+        currency = currency or self.currency_id
+        price = self._get_metal_indexed_price(product)
+        if price is None:
+            # Not a priced gold/silver product: behave like "based on sales price"
+            return product._price_compute('list_price', uom=uom, date=date, currency=currency)[product.id]
+        company = self.env.company
+        price = company.currency_id._convert(price, currency, company, date or fields.Date.today())
+        if uom and product.uom_id != uom:
+            price = product.uom_id._compute_price(price, uom)
+        return price
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+from odoo import models
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    def read(self, fields=None, load='_classic_read'):
+        # POS loads variants with search_read: price stale templates first (lazy mode)
+        templates = self.env['product.template']
+        if templates._is_lazy_repricing() and (
+            not fields or templates.PRICE_READ_FIELDS.intersection(fields)
+        ):
+            self._price_stale_templates_in_cache()
+        return super().read(fields=fields, load=load)
+
+    def _price_compute(self, price_type, *args, **kwargs):
+        if self.env['product.template']._is_lazy_repricing():
+            self._price_stale_templates_in_cache()
+        return super()._price_compute(price_type, *args, **kwargs)
+
+    def _price_stale_templates_in_cache(self):
+        stale = self.product_tmpl_id._price_stale_jewellery_in_cache()
+        if stale:
+            # Sales prices computed from the templates' previous list prices
+            self.filtered(lambda p: p.product_tmpl_id in stale).invalidate_recordset(['lst_price'])
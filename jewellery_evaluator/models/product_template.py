@@ -4,19 +4,60 @@
 # Website: https://www.revenax.com
 
 import logging
+from datetime import timedelta
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import ValidationError
-
+from odoo.osv import expression
+from odoo.tools import split_every
+
+from .. import run_stats
+from ..diamond_grid import (
+    DIAMOND_CLARITY_SELECTION,
+    DIAMOND_COLOR_SELECTION,
+    DIAMOND_SHAPE_SELECTION,
+)
+from ..repricing_pipeline import (
+    CopyPriceWriter,
+    ValuesPriceWriter,
+    compute_gold_prices,
+    compute_silver_prices,
+    gold_markup_resolver,
+    iter_row_chunks,
+)
 from ..utils import (
+    BAR_TIER_PARAM_SUFFIXES,
+    GOLD_PURITY_FACTORS,
+    bar_tier_upper_bounds,
+    bar_tier_weight_conditions,
     compute_gold_product_price,
     compute_silver_product_price,
+    get_bar_tier_markups,
     get_markup_per_gram,
     get_silver_markup_per_gram,
 )  # noqa: E402
 
 _logger = logging.getLogger(__name__)
 
+# SQL equivalent of utils.compute_gold_product_price / compute_silver_product_price:
+# round() on numeric rounds half away from zero, i.e. ROUND_HALF_UP for prices.
+JEWELLERY_PRICE_SQL_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION jewellery_round_to_50(amount numeric) RETURNS numeric AS $$
+    SELECT round(amount / 50, 0) * 50
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION jewellery_compute_prices(
+    base_price numeric, purity_factor numeric, weight numeric, markup numeric,
+    OUT cost_price numeric, OUT sale_price numeric, OUT min_sale_price numeric
+) AS $$
+    SELECT t.cost,
+           jewellery_round_to_50(round(t.cost + t.markup_total, 2)),
+           jewellery_round_to_50(round(t.cost + t.markup_total * 0.7, 2))
+    FROM (SELECT round(base_price * purity_factor * weight, 2) AS cost,
+                 round(markup * weight, 2) AS markup_total) AS t
+$$ LANGUAGE sql IMMUTABLE;
+"""
+
 
 class ProductTemplate(models.Model):
     _inherit = 'product.template'
@@ -67,10 +108,48 @@ class ProductTemplate(models.Model):
         'gold_purity',
         'gold_type',
     }
-    DIAMOND_PRICE_UPDATE_FIELDS = {'jewellery_type', 'diamond_usd_price'}
+    DIAMOND_PRICE_UPDATE_FIELDS = {
+        'jewellery_type', 'diamond_usd_price',
+        'diamond_carat', 'diamond_shape', 'diamond_color', 'diamond_clarity',
+    }
     SILVER_PRICE_UPDATE_FIELDS = {
         'jewellery_type', 'jewellery_weight_g', 'silver_purity',
     }
+    # Lazy repricing: types repriced on read, and the fields whose read triggers it
+    LAZY_REPRICING_TYPES = ('gold_local', 'gold_foreign', 'gold_bars', 'silver')
+    PRICE_READ_FIELDS = {
+        'list_price', 'lst_price', 'standard_price',
+        'gold_cost_price', 'gold_min_sale_price',
+        'silver_cost_price', 'silver_min_sale_price',
+    }
+    # Columns of the price rows computed for gold and silver products, after the id
+    GOLD_PRICE_COLUMNS = ('list_price', 'gold_cost_price', 'gold_min_sale_price')
+    SILVER_PRICE_COLUMNS = ('list_price', 'silver_cost_price', 'silver_min_sale_price')
+    LAZY_SWEEP_BATCH_SIZE = 1000
+    LAZY_SWEEP_DELAY_MINUTES = 5
+    REPRICING_ENGINES = ('orm', 'sql', 'stream')
+    # Lock-friendly repricing: rows locked per statement (and per follow-up job),
+    # delay of the follow-up job
+    SKIP_LOCKED_BATCH_SIZE = 100
+    SKIP_LOCKED_RETRY_SECONDS = 30
+    # Products repriced per batch (and per progress report) by segment repricing jobs
+    SEGMENT_REPRICING_BATCH_SIZE = 500
+    # Fields internal repricing may write through _write_jewellery_prices()
+    PRICE_WRITE_FIELDS = frozenset({
+        'list_price', 'gold_cost_price', 'gold_min_sale_price',
+        'silver_cost_price', 'silver_min_sale_price', 'diamond_usd_price',
+    })
+    # create()/write() on more products than this reprice in background jobs of
+    # ASYNC_PRICE_UPDATE_CHUNK_SIZE products (system parameter overrides, 0 = never)
+    ASYNC_PRICE_UPDATE_THRESHOLD = 500
+    ASYNC_PRICE_UPDATE_CHUNK_SIZE = 500
+    # Whole-catalog repricing scope per metal
+    REPRICING_DOMAINS = {
+        'gold': [('jewellery_type', 'in', ['gold_local', 'gold_foreign', 'gold_bars']),
+                 ('gold_purity', '!=', False), ('jewellery_weight_g', '>', 0)],
+        'silver': [('jewellery_type', '=', 'silver'),
+                   ('silver_purity', '!=', False), ('jewellery_weight_g', '>', 0)],
+    }
 
     jewellery_type = fields.Selection(
         selection=JEWELLERY_TYPE_SELECTION,
@@ -108,6 +187,28 @@ class ProductTemplate(models.Model):
         help='Open field for diamond karat/grade information.',
     )
 
+    diamond_carat = fields.Float(
+        string='Diamond Carat',
+        digits=(16, 3),
+        help='Stone weight in carats; with shape, color and clarity it prices the '
+             'product from the diamond price grid.',
+    )
+
+    diamond_shape = fields.Selection(
+        selection=DIAMOND_SHAPE_SELECTION,
+        string='Diamond Shape',
+    )
+
+    diamond_color = fields.Selection(
+        selection=DIAMOND_COLOR_SELECTION,
+        string='Diamond Color',
+    )
+
+    diamond_clarity = fields.Selection(
+        selection=DIAMOND_CLARITY_SELECTION,
+        string='Diamond Clarity',
+    )
+
     silver_purity = fields.Selection(
         selection=SILVER_PURITY_SELECTION,
         string='Jewellery Karat (Silver)',
@@ -226,6 +327,15 @@ class ProductTemplate(models.Model):
         help='Automatically set to True for silver jewellery type.',
     )
 
+    jewellery_price_version = fields.Integer(
+        string='Price Version',
+        default=0,
+        index=True,
+        copy=False,
+        readonly=True,
+        help='Price snapshot version this product was last repriced at (lazy repricing mode).',
+    )
+
     @api.depends('jewellery_type')
     def _compute_is_gold_product(self):
         """Mark product as gold product based on jewellery type."""
@@ -250,17 +360,11 @@ class ProductTemplate(models.Model):
 
     @api.depends('jewellery_type', 'jewellery_weight_g', 'silver_purity')
     def _compute_silver_prices(self):
-        """Compute silver cost price and minimum sale price (like gold)."""
-        silver_price_service = self.env['silver.price.service']
-        try:
-            base_silver_999 = silver_price_service.get_current_silver_price_999()
-        except Exception as e:
-            _logger.warning(
-                'Silver price service failed in _compute_silver_prices: %s',
-                str(e),
-                exc_info=True,
-            )
-            base_silver_999 = 0.0
+        """
+        Compute silver cost price and minimum sale price (like gold).
+        Uses the last applied silver price: recomputes never launch the scraper.
+        """
+        base_silver_999 = self.env['silver.price.service'].get_applied_silver_price_999()
 
         for record in self:
             if not record.is_silver_product:
@@ -325,17 +429,11 @@ class ProductTemplate(models.Model):
 
     @api.depends('jewellery_type', 'jewellery_weight_g', 'gold_purity', 'gold_type')
     def _compute_gold_prices(self):
-        """Compute gold cost price and minimum sale price"""
-        gold_price_service = self.env['gold.price.service']
-        try:
-            base_gold_price = gold_price_service.get_current_gold_price()
-        except Exception as e:
-            _logger.warning(
-                'Gold price service failed in _compute_gold_prices: %s',
-                str(e),
-                exc_info=True,
-            )
-            base_gold_price = 0.0
+        """
+        Compute gold cost price and minimum sale price.
+        Uses the last applied gold price: recomputes never call the gold API.
+        """
+        base_gold_price = self.env['gold.price.service'].get_applied_gold_price()
 
         for record in self:
             if not record.is_gold_product:
@@ -461,27 +559,43 @@ class ProductTemplate(models.Model):
         except ValueError:
             return {}
 
-    def _get_diamond_price_update_vals(self):
+    def _get_diamond_price_update_vals(self, exchange_rate=None, discount_pct=None, grid=None):
         """
         Prepare standard and list price updates for diamond products.
 
+        Args:
+            exchange_rate: USD to EGP rate, read once by callers looping over products
+            discount_pct: Global diamond discount, read once likewise
+            grid: Diamond price grid (DiamondPriceGrid), read once likewise
+
         Returns:
             dict: Fields to update, or empty dict if not applicable
         """
         self.ensure_one()
 
-        if not self.diamond_usd_price or self.diamond_usd_price <= 0:
+        diamond_price_service = self.env['diamond.price.service']
+        # Graded stones take their USD price from the price grid when their cell exists
+        if grid is None:
+            grid = diamond_price_service._get_diamond_price_grid()
+        grid_price_usd = grid.price_usd(
+            self.diamond_carat, self.diamond_shape, self.diamond_color, self.diamond_clarity)
+        price_usd = grid_price_usd or self.diamond_usd_price
+        if not price_usd or price_usd <= 0:
             return {}
 
-        diamond_price_service = self.env['diamond.price.service']
-        exchange_rate = diamond_price_service.get_usd_to_egp_rate()
-        discount_pct = diamond_price_service.get_global_diamond_discount()
-        price_egp = (self.diamond_usd_price * exchange_rate) * \
+        if exchange_rate is None:
+            exchange_rate = diamond_price_service.get_usd_to_egp_rate()
+        if discount_pct is None:
+            discount_pct = diamond_price_service.get_global_diamond_discount()
+        price_egp = (price_usd * exchange_rate) * \
             (100 - discount_pct) / 100.0
 
-        return {
+        vals = {
             'list_price': price_egp,
         }
+        if grid_price_usd and grid_price_usd != self.diamond_usd_price:
+            vals['diamond_usd_price'] = grid_price_usd
+        return vals
 
     @api.onchange('jewellery_type', 'jewellery_weight_g')
     def _onchange_sync_gold_legacy_fields(self):
@@ -513,14 +627,20 @@ class ProductTemplate(models.Model):
                   'gold price settings. Details: %s') % str(e)
             ) from e
 
-    @api.onchange('jewellery_type', 'diamond_usd_price')
+    @api.onchange('jewellery_type', 'diamond_usd_price', 'diamond_carat',
+                  'diamond_shape', 'diamond_color', 'diamond_clarity')
     def _onchange_diamond_pricing_fields(self):
         """Update prices immediately in the UI when diamond price changes."""
         try:
+            diamond_price_service = self.env['diamond.price.service']
+            exchange_rate = diamond_price_service.get_usd_to_egp_rate()
+            discount_pct = diamond_price_service.get_global_diamond_discount()
+            grid = diamond_price_service._get_diamond_price_grid()
             for record in self:
                 if not record.is_diamond_product:
                     continue
-                update_vals = record._get_diamond_price_update_vals()
+                update_vals = record._get_diamond_price_update_vals(
+                    exchange_rate, discount_pct, grid)
                 if update_vals:
                     record.update(update_vals)
         except Exception as e:
@@ -551,56 +671,28 @@ class ProductTemplate(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
+        return self.env['jewellery.profiler']._run_profiled(
+            'product_template_create', self._jewellery_create, vals_list)
+
+    @api.model
+    def _jewellery_create(self, vals_list):
         normalized_vals_list = [
             self._normalize_jewellery_vals(vals) for vals in vals_list]
         records = super().create(normalized_vals_list)
+        context = self.env.context
+        metals = []
+        if not context.get('skip_gold_price_update') and any(
+            self.GOLD_PRICE_UPDATE_FIELDS & vals.keys() for vals in normalized_vals_list
+        ):
+            metals.append('gold')
+        if not context.get('skip_diamond_price_update') and any(
+            self.DIAMOND_PRICE_UPDATE_FIELDS & vals.keys() for vals in normalized_vals_list
+        ):
+            metals.append('diamond')
+        if not context.get('skip_silver_price_update'):
+            metals.append('silver')
         try:
-            if not self.env.context.get('skip_gold_price_update'):
-                if any(
-                    self.GOLD_PRICE_UPDATE_FIELDS & vals.keys()
-                    for vals in normalized_vals_list
-                ):
-                    gold_price_service = self.env['gold.price.service']
-                    base_gold_price = gold_price_service.get_current_gold_price()
-                    for record in records:
-                        if not record.is_gold_product:
-                            continue
-                        update_vals = record._get_gold_price_update_vals(
-                            base_gold_price
-                        )
-                        if update_vals:
-                            record.with_context(
-                                skip_gold_price_update=True
-                            ).write(update_vals)
-
-            if not self.env.context.get('skip_diamond_price_update'):
-                if any(
-                    self.DIAMOND_PRICE_UPDATE_FIELDS & vals.keys()
-                    for vals in normalized_vals_list
-                ):
-                    for record in records:
-                        if not record.is_diamond_product:
-                            continue
-                        update_vals = record._get_diamond_price_update_vals()
-                        if update_vals:
-                            record.with_context(
-                                skip_diamond_price_update=True
-                            ).write(update_vals)
-
-            if not self.env.context.get('skip_silver_price_update'):
-                silver_records = records.filtered(
-                    lambda r: r.jewellery_type == 'silver')
-                if silver_records:
-                    silver_service = self.env['silver.price.service']
-                    base_silver = silver_service.get_current_silver_price_999()
-                    for record in silver_records:
-                        update_vals = record._get_silver_price_update_vals(
-                            base_silver
-                        )
-                        if update_vals:
-                            record.with_context(
-                                skip_silver_price_update=True
-                            ).write(update_vals)
+            records._schedule_jewellery_price_update(metals)
         except Exception as e:
             raise ValidationError(
                 _('Product price update failed. Please check gold/diamond/silver '
@@ -609,54 +701,24 @@ class ProductTemplate(models.Model):
         return records
 
     def write(self, vals):
+        return self.env['jewellery.profiler']._run_profiled(
+            'product_template_write', self._jewellery_write, vals)
+
+    def _jewellery_write(self, vals):
         normalized_vals = self._normalize_jewellery_vals(vals)
         res = super().write(normalized_vals)
+        context = self.env.context
+        fields_written = set(normalized_vals)
+        metals = [
+            metal for metal, update_fields in (
+                ('gold', self.GOLD_PRICE_UPDATE_FIELDS),
+                ('diamond', self.DIAMOND_PRICE_UPDATE_FIELDS),
+                ('silver', self.SILVER_PRICE_UPDATE_FIELDS),
+            )
+            if not context.get(f'skip_{metal}_price_update') and update_fields & fields_written
+        ]
         try:
-            if not self.env.context.get('skip_gold_price_update'):
-                if self.GOLD_PRICE_UPDATE_FIELDS & set(normalized_vals.keys()):
-                    gold_price_service = self.env['gold.price.service']
-                    base_gold_price = (
-                        gold_price_service.get_current_gold_price()
-                    )
-                    for record in self:
-                        if not record.is_gold_product:
-                            continue
-                        update_vals = record._get_gold_price_update_vals(
-                            base_gold_price
-                        )
-                        if update_vals:
-                            record.with_context(
-                                skip_gold_price_update=True
-                            ).write(update_vals)
-
-            if not self.env.context.get('skip_diamond_price_update'):
-                if self.DIAMOND_PRICE_UPDATE_FIELDS & set(normalized_vals.keys()):
-                    for record in self:
-                        if not record.is_diamond_product:
-                            continue
-                        update_vals = record._get_diamond_price_update_vals()
-                        if update_vals:
-                            record.with_context(
-                                skip_diamond_price_update=True
-                            ).write(update_vals)
-
-            if not self.env.context.get('skip_silver_price_update'):
-                silver_records = self.filtered(
-                    lambda r: r.jewellery_type == 'silver')
-                if silver_records and (
-                    self.SILVER_PRICE_UPDATE_FIELDS & set(
-                        normalized_vals.keys())
-                ):
-                    silver_service = self.env['silver.price.service']
-                    base_silver = silver_service.get_current_silver_price_999()
-                    for record in silver_records:
-                        update_vals = record._get_silver_price_update_vals(
-                            base_silver
-                        )
-                        if update_vals:
-                            record.with_context(
-                                skip_silver_price_update=True
-                            ).write(update_vals)
+            self._schedule_jewellery_price_update(metals)
         except Exception as e:
             raise ValidationError(
                 _('Product price update failed. Please check gold/diamond/silver '
@@ -664,6 +726,94 @@ class ProductTemplate(models.Model):
             ) from e
         return res
 
+    def _get_async_price_update_threshold(self):
+        """Record count above which create()/write() reprice in background jobs (0 = never)."""
+        raw = self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.async_price_update_threshold',
+            str(self.ASYNC_PRICE_UPDATE_THRESHOLD))
+        try:
+            return max(0, int(raw))
+        except (TypeError, ValueError):
+            return self.ASYNC_PRICE_UPDATE_THRESHOLD
+
+    def _schedule_jewellery_price_update(self, metals):
+        """
+        Reprice these products for the given metals after create()/write(): inline,
+        or for bulk edits and imports above the async threshold, in background
+        jobs of ASYNC_PRICE_UPDATE_CHUNK_SIZE products each.
+
+        :param metals: list - Metals whose prices may have changed ('gold', 'diamond', 'silver')
+        """
+        if not metals or not self:
+            return
+        threshold = self._get_async_price_update_threshold()
+        if threshold and len(self) > threshold and not self.env.context.get('jewellery_job_id'):
+            jobs = self.env['jewellery.job']
+            for ids in split_every(self.ASYNC_PRICE_UPDATE_CHUNK_SIZE, self.ids):
+                jobs.enqueue(
+                    f"Reprice {len(ids)} products ({', '.join(metals)})",
+                    'product.template', '_update_jewellery_prices_job', list(ids), metals)
+            return
+        self._update_jewellery_prices(metals)
+
+    @api.model
+    def _update_jewellery_prices_job(self, ids, metals):
+        """Job entry point of _schedule_jewellery_price_update."""
+        products = self.browse(ids).exists()
+        products._update_jewellery_prices(metals)
+        return len(products)
+
+    def _update_jewellery_prices(self, metals):
+        """
+        Recompute and write the prices of these products for the given metals,
+        reading each base price and markup once.
+
+        :param metals: list - 'gold', 'diamond' and/or 'silver'
+        """
+        if 'gold' in metals:
+            gold_price_service = self.env['gold.price.service']
+            base_gold_price = gold_price_service.get_current_gold_price()
+            for record in self:
+                if not record.is_gold_product:
+                    continue
+                update_vals = record._get_gold_price_update_vals(
+                    base_gold_price
+                )
+                if update_vals:
+                    record.with_context(
+                        skip_gold_price_update=True
+                    ).write(update_vals)
+
+        if 'diamond' in metals:
+            diamond_price_service = self.env['diamond.price.service']
+            exchange_rate = diamond_price_service.get_usd_to_egp_rate()
+            discount_pct = diamond_price_service.get_global_diamond_discount()
+            grid = diamond_price_service._get_diamond_price_grid()
+            for record in self:
+                if not record.is_diamond_product:
+                    continue
+                update_vals = record._get_diamond_price_update_vals(
+                    exchange_rate, discount_pct, grid)
+                if update_vals:
+                    record.with_context(
+                        skip_diamond_price_update=True
+                    ).write(update_vals)
+
+        if 'silver' in metals:
+            silver_records = self.filtered(
+                lambda r: r.jewellery_type == 'silver')
+            if silver_records:
+                silver_service = self.env['silver.price.service']
+                base_silver = silver_service.get_current_silver_price_999()
+                for record in silver_records:
+                    update_vals = record._get_silver_price_update_vals(
+                        base_silver
+                    )
+                    if update_vals:
+                        record.with_context(
+                            skip_silver_price_update=True
+                        ).write(update_vals)
+
     @api.constrains('jewellery_type', 'jewellery_weight_g', 'gold_purity', 'silver_purity', 'gold_type')
     def _check_gold_required_fields(self):
         """Ensure required fields are set for each jewellery type."""
@@ -714,33 +864,563 @@ class ProductTemplate(models.Model):
                     f'Must be one of: {", ".join(sorted(self.VALID_SILVER_PURITY))}'
                 )
 
-    def update_gold_prices(self, base_gold_price):
+    @api.model
+    @tools.ormcache()
+    def _is_lazy_repricing(self):
         """
-        Update product prices based on new gold price.
-        Called by cron job for batch updates.
-        Skips products missing required data (weight, purity, type).
+        True when price runs only publish a snapshot and products reprice on read.
+        Cached per worker: reads check it on every call, and saving a system
+        parameter clears the cache.
+        """
+        return bool(self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.lazy_repricing'))
 
-        :param base_gold_price: Current base gold price per gram
+    @api.model
+    def _get_price_version(self):
+        raw = self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.price_version', '0')
+        try:
+            return int(raw)
+        except (TypeError, ValueError):
+            return 0
+
+    @api.model
+    def _bump_price_version(self):
         """
-        if not self:
+        Publish a new price snapshot: every gold/silver product becomes stale and is
+        repriced on its next read, or by the background sweep.
+
+        :return: int - New price version
+        """
+        version = self._get_price_version() + 1
+        self.env['ir.config_parameter'].sudo().set_param(
+            'jewellery_evaluator.price_version', str(version))
+        cron = self.env.ref(
+            'jewellery_evaluator.ir_cron_sweep_stale_prices', raise_if_not_found=False)
+        if cron:
+            cron._trigger(at=fields.Datetime.now() + timedelta(
+                minutes=self.LAZY_SWEEP_DELAY_MINUTES))
+        return version
+
+    def _reprice_stale_jewellery(self):
+        """
+        Reprice and store the records priced at an older snapshot version from the
+        applied gold/silver prices (lazy repricing sweep). Rows being repriced by
+        a concurrent transaction are skipped instead of waited for.
+        """
+        if self.env.context.get('jewellery_lazy_reprice'):
+            return
+        ids = [record_id for record_id in self.ids if isinstance(record_id, int)]
+        if not ids:
+            return
+        version = self._get_price_version()
+        self.flush_model(['jewellery_type', 'jewellery_price_version'])
+        self.env.cr.execute(
+            """
+            SELECT id FROM product_template
+            WHERE id IN %s AND jewellery_type IN %s
+              AND COALESCE(jewellery_price_version, 0) < %s
+            FOR NO KEY UPDATE SKIP LOCKED
+            """,
+            (tuple(ids), self.LAZY_REPRICING_TYPES, version),
+        )
+        stale = self.env['product.template'].browse(
+            [row[0] for row in self.env.cr.fetchall()]
+        ).with_context(
+            jewellery_lazy_reprice=True,
+            skip_gold_price_update=True,
+            skip_silver_price_update=True,
+            skip_diamond_price_update=True,
+        )
+        if not stale:
             return
+        gold_products = stale.filtered('is_gold_product')
+        if gold_products:
+            gold_products.update_gold_prices(
+                self.env['gold.price.service'].get_applied_gold_price())
+        silver_products = stale.filtered('is_silver_product')
+        if silver_products:
+            silver_products.update_silver_prices(
+                self.env['silver.price.service'].get_applied_silver_price_999())
+        stale.write({'jewellery_price_version': version})
+
+    @api.model
+    def _sweep_stale_jewellery_prices(self):
+        """
+        Background catch-up for lazy repricing: reprice one batch of stale products
+        and re-trigger itself while stale products remain. Called by cron.
 
-        # Filter only gold products with all required data
-        gold_products = self.filtered(
-            lambda p: p.is_gold_product
-            and p.gold_purity
-            and p.jewellery_weight_g
-            and p.jewellery_weight_g > 0
+        :return: int - Number of products repriced
+        """
+        if not self._is_lazy_repricing():
+            return 0
+        stale = self.search([
+            ('jewellery_type', 'in', self.LAZY_REPRICING_TYPES),
+            ('jewellery_price_version', '<', self._get_price_version()),
+        ], limit=self.LAZY_SWEEP_BATCH_SIZE)
+        stale._reprice_stale_jewellery()
+        if len(stale) == self.LAZY_SWEEP_BATCH_SIZE:
+            self.env.ref('jewellery_evaluator.ir_cron_sweep_stale_prices')._trigger()
+        _logger.info('Lazy repricing sweep repriced %d stale products', len(stale))
+        return len(stale)
+
+    def _price_stale_jewellery_in_cache(self):
+        """
+        Lazy mode read path: compute the prices of the records priced at an older
+        snapshot version from the applied gold/silver prices and put them in the
+        cache only, so the current read returns them. Nothing is written; the
+        sweep stores them.
+
+        :return: product.template - Records whose cached prices were replaced
+        """
+        version = self._get_price_version()
+        stale = self.filtered(lambda p: isinstance(p.id, int)
+                              and p.jewellery_type in self.LAZY_REPRICING_TYPES
+                              and p.jewellery_price_version < version)
+        if not stale:
+            return stale
+        for columns, rows in (
+            (self.GOLD_PRICE_COLUMNS, stale._compute_gold_price_rows(
+                self.env['gold.price.service'].get_applied_gold_price())),
+            (self.SILVER_PRICE_COLUMNS, stale._compute_silver_price_rows(
+                self.env['silver.price.service'].get_applied_silver_price_999())),
+        ):
+            if not rows:
+                continue
+            records = self.browse([row[0] for row in rows])
+            for index, name in enumerate(columns, 1):
+                self.env.cache.update(records, self._fields[name], [row[index] for row in rows])
+        return stale
+
+    def read(self, fields=None, load='_classic_read'):
+        if self._is_lazy_repricing() and (
+            not fields or self.PRICE_READ_FIELDS.intersection(fields)
+        ):
+            self._price_stale_jewellery_in_cache()
+        return super().read(fields=fields, load=load)
+
+    def _price_compute(self, price_type, *args, **kwargs):
+        # Pricelists and the website price products through here
+        if self._is_lazy_repricing():
+            self._price_stale_jewellery_in_cache()
+        return super()._price_compute(price_type, *args, **kwargs)
+
+    def init(self):
+        super().init()
+        self.env.cr.execute(JEWELLERY_PRICE_SQL_FUNCTIONS)
+
+    @api.model
+    def _get_repricing_engine(self):
+        """
+        How whole-catalog gold/silver runs write prices: 'orm' (product by product),
+        'sql' (one UPDATE per metal) or 'stream' (chunked read, bulk writes).
+        """
+        engine = self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.repricing_engine', 'orm')
+        return engine if engine in self.REPRICING_ENGINES else 'orm'
+
+    def _sql_gold_markup_expression(self):
+        """CASE expression giving the markup per gram of a product_template row, with params."""
+        bounds = bar_tier_upper_bounds()
+        tier_markups = get_bar_tier_markups(self.env)
+        bar_cases = ' '.join(
+            f'WHEN jewellery_weight_g <= {bound!r} THEN %s::numeric' for bound in bounds)
+        expression = (
+            "CASE jewellery_type "
+            "WHEN 'gold_local' THEN %s::numeric "
+            "WHEN 'gold_foreign' THEN %s::numeric "
+            "ELSE CASE WHEN jewellery_weight_g >= 1000 THEN %s::numeric "
+            f"{bar_cases} ELSE %s::numeric END END"
         )
+        params = [
+            str(get_markup_per_gram(self.env, 'jewellery_local')),
+            str(get_markup_per_gram(self.env, 'jewellery_foreign')),
+            str(tier_markups[-1]),
+            *[str(markup) for markup in tier_markups[:len(bounds)]],
+            str(tier_markups[-2]),
+        ]
+        return expression, params
+
+    @api.model
+    def _sql_update_gold_prices(self, base_gold_price):
+        """
+        Reprice every gold product in one UPDATE using jewellery_compute_prices().
+        Same filters and results as update_gold_prices(); no rows go through Python.
 
-        if not gold_products:
-            return
+        :param base_gold_price: 21K price per gram
+        :return: int - Number of products updated
+        """
+        self.flush_model()
+        markup_expression, markup_params = self._sql_gold_markup_expression()
+        factor_expression = 'CASE gold_purity ' + ' '.join(
+            f"WHEN '{purity}' THEN {factor}" for purity, factor in GOLD_PURITY_FACTORS.items()
+        ) + ' END'
+        self.env.cr.execute(
+            f"""
+            UPDATE product_template pt
+            SET list_price = p.sale_price,
+                gold_cost_price = p.cost_price,
+                gold_min_sale_price = p.min_sale_price,
+                write_uid = %s,
+                write_date = (now() at time zone 'UTC')
+            FROM (
+                SELECT src.id, (jewellery_compute_prices(
+                    %s::numeric, src.factor, src.weight, src.markup)).*
+                FROM (
+                    SELECT id,
+                           jewellery_weight_g::numeric AS weight,
+                           {factor_expression} AS factor,
+                           {markup_expression} AS markup
+                    FROM product_template
+                    WHERE jewellery_type IN ('gold_local', 'gold_foreign', 'gold_bars')
+                      AND gold_purity IN %s
+                      AND jewellery_weight_g > 0
+                ) AS src
+                WHERE src.markup > 0
+            ) AS p
+            WHERE pt.id = p.id
+            """,
+            [self.env.uid, str(base_gold_price), *markup_params,
+             tuple(GOLD_PURITY_FACTORS)],
+        )
+        updated = self.env.cr.rowcount
+        self.invalidate_model(['list_price', 'gold_cost_price', 'gold_min_sale_price',
+                               'write_uid', 'write_date'])
+        return updated
+
+    @api.model
+    def _sql_update_silver_prices(self, base_silver_999):
+        """
+        Reprice every silver product in one UPDATE using jewellery_compute_prices().
+        Same filters and results as update_silver_prices().
+
+        :param base_silver_999: Silver 999 price per gram
+        :return: int - Number of products updated
+        """
+        markup_per_gram = get_silver_markup_per_gram(self.env)
+        if markup_per_gram < 0 or base_silver_999 <= 0:
+            return 0
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            UPDATE product_template pt
+            SET list_price = p.sale_price,
+                silver_cost_price = p.cost_price,
+                silver_min_sale_price = p.min_sale_price,
+                write_uid = %s,
+                write_date = (now() at time zone 'UTC')
+            FROM (
+                SELECT id, (jewellery_compute_prices(
+                    %s::numeric, 1, jewellery_weight_g::numeric, %s::numeric)).*
+                FROM product_template
+                WHERE jewellery_type = 'silver'
+                  AND silver_purity IS NOT NULL
+                  AND jewellery_weight_g > 0
+            ) AS p
+            WHERE pt.id = p.id
+            """,
+            [self.env.uid, str(base_silver_999), str(markup_per_gram)],
+        )
+        updated = self.env.cr.rowcount
+        self.invalidate_model(['list_price', 'silver_cost_price', 'silver_min_sale_price',
+                               'write_uid', 'write_date'])
+        return updated
+
+    @api.model
+    def _is_copy_price_apply(self):
+        """True when bulk price writes go through COPY into a temporary table."""
+        return self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.price_apply_backend', 'standard') == 'copy'
+
+    @api.model
+    def _get_price_writer(self, columns):
+        """
+        Bulk writer for product_template price columns, following the price apply
+        backend setting. Writes bypass the ORM: callers flush before and
+        invalidate the written fields after.
+
+        :param columns: Price columns, in the order of each (id, ...) row
+        :return: CopyPriceWriter or ValuesPriceWriter
+        """
+        writer_class = CopyPriceWriter if self._is_copy_price_apply() else ValuesPriceWriter
+        return writer_class(self.env.cr, columns, self.env.uid)
+
+    @api.model
+    def _write_jewellery_prices(self, columns, rows):
+        """
+        Internal bulk price write for repricing runs. Only price fields may be
+        written; values go through the bulk price writer, so the write()
+        override (normalization, price hooks), constraints and mail tracking
+        are skipped, and dependents are marked modified once for the batch.
+
+        :param columns: Price fields (PRICE_WRITE_FIELDS), in the order of each row after its id
+        :param rows: Iterable of (id, value, ...) tuples
+        :return: int - Number of products updated
+        """
+        unknown = set(columns) - self.PRICE_WRITE_FIELDS
+        if unknown:
+            raise ValueError(f'Not price fields: {", ".join(sorted(unknown))}')
+        ids = []
+
+        def collect(rows):
+            for row in rows:
+                ids.append(row[0])
+                yield row
+
+        with run_stats.stage('write'):
+            updated = self._bulk_apply_prices(columns, collect(rows))
+        if ids:
+            with run_stats.stage('flush'):
+                self.browse(ids).modified(columns)
+        return updated
+
+    @api.model
+    def _bulk_apply_prices(self, columns, rows):
+        """
+        Write computed prices with one bulk writer instead of a write() per product.
+
+        :param columns: Price fields, in the order of each row after its id
+        :param rows: Iterable of (id, value, ...) tuples
+        :return: int - Number of products updated
+        """
+        self.flush_model()
+        with self._get_price_writer(columns) as writer:
+            writer.write_many(rows)
+        self.invalidate_model(list(columns) + ['write_uid', 'write_date'])
+        return writer.updated
+
+    @api.model
+    def _stream_update_gold_prices(self, base_gold_price):
+        """
+        Reprice every gold product through the streaming pipeline: only id, type,
+        purity and weight are read, chunk by chunk from a server-side cursor, and
+        prices are written by the bulk price writer. Memory stays flat
+        whatever the catalog size; same filters and results as update_gold_prices().
+
+        :param base_gold_price: 21K price per gram
+        :return: int - Number of products updated
+        """
+        markup_for = gold_markup_resolver(
+            get_markup_per_gram(self.env, 'jewellery_local'),
+            get_markup_per_gram(self.env, 'jewellery_foreign'),
+            get_bar_tier_markups(self.env),
+        )
+        chunks = iter_row_chunks(
+            self.env.cr, 'jewellery_stream_gold',
+            """
+            SELECT id, jewellery_type, gold_purity, jewellery_weight_g
+            FROM product_template
+            WHERE jewellery_type IN ('gold_local', 'gold_foreign', 'gold_bars')
+              AND gold_purity IS NOT NULL
+              AND jewellery_weight_g > 0
+            ORDER BY id
+            """,
+            [],
+        )
+        return self._bulk_apply_prices(
+            ['list_price', 'gold_cost_price', 'gold_min_sale_price'],
+            compute_gold_prices(chunks, base_gold_price, markup_for),
+        )
+
+    @api.model
+    def _stream_update_silver_prices(self, base_silver_999):
+        """
+        Reprice every silver product through the streaming pipeline.
+        Same filters and results as update_silver_prices().
+
+        :param base_silver_999: Silver 999 price per gram
+        :return: int - Number of products updated
+        """
+        markup_per_gram = get_silver_markup_per_gram(self.env)
+        if markup_per_gram < 0 or base_silver_999 <= 0:
+            return 0
+        chunks = iter_row_chunks(
+            self.env.cr, 'jewellery_stream_silver',
+            """
+            SELECT id, jewellery_weight_g
+            FROM product_template
+            WHERE jewellery_type = 'silver'
+              AND silver_purity IS NOT NULL
+              AND jewellery_weight_g > 0
+            ORDER BY id
+            """,
+            [],
+        )
+        return self._bulk_apply_prices(
+            ['list_price', 'silver_cost_price', 'silver_min_sale_price'],
+            compute_silver_prices(chunks, base_silver_999, markup_per_gram),
+        )
+
+    @api.model
+    def _is_skip_locked_repricing(self):
+        """True when price runs skip products locked by other transactions instead of waiting."""
+        return bool(self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.skip_locked_repricing'))
+
+    @api.model
+    def _reprice_skip_locked(self, metal, base_price, ids):
+        """
+        Reprice products in batches of SKIP_LOCKED_BATCH_SIZE rows, in the current
+        transaction. Each batch locks its rows with FOR NO KEY UPDATE SKIP LOCKED,
+        so rows held by an interactive edit or a closing POS session are skipped
+        rather than waited for (or deadlocked with), and queued for a follow-up
+        job. Rows this transaction already locked are never skipped.
+
+        :param metal: 'gold' or 'silver'
+        :param base_price: 21K gold or silver 999 price per gram
+        :param ids: Product template ids to reprice
+        :return: tuple - (number of products repriced, list of skipped ids)
+        """
+        updated = 0
+        skipped: list = []
+        for batch_ids in split_every(self.SKIP_LOCKED_BATCH_SIZE, ids):
+            self.env.cr.execute(
+                """
+                SELECT id FROM product_template
+                WHERE id IN %s
+                ORDER BY id
+                FOR NO KEY UPDATE SKIP LOCKED
+                """,
+                (batch_ids,),
+            )
+            locked = [row[0] for row in self.env.cr.fetchall()]
+            products = self.browse(locked)
+            if metal == 'gold':
+                products.update_gold_prices(base_price)
+            else:
+                products.update_silver_prices(base_price)
+            updated += len(locked)
+            skipped.extend(set(batch_ids).difference(locked))
+        if skipped:
+            _logger.info('%d %s products locked by other transactions; repricing queued',
+                         len(skipped), metal)
+            self._queue_skipped_repricing(metal, skipped)
+        return updated, skipped
+
+    @api.model
+    def _queue_skipped_repricing(self, metal, ids):
+        """
+        Queue background jobs of SKIP_LOCKED_BATCH_SIZE skipped products each,
+        running SKIP_LOCKED_RETRY_SECONDS from now (or when this transaction
+        commits, if later).
+        """
+        eta = fields.Datetime.now() + timedelta(seconds=self.SKIP_LOCKED_RETRY_SECONDS)
+        jobs = self.env['jewellery.job']
+        for batch_ids in split_every(self.SKIP_LOCKED_BATCH_SIZE, sorted(ids)):
+            jobs.enqueue(
+                f'Reprice {len(batch_ids)} locked {metal} products',
+                'product.template', '_retry_skipped_repricing', metal, list(batch_ids), eta=eta)
+
+    @api.model
+    def _retry_skipped_repricing(self, metal, ids):
+        """
+        Job entry point of _queue_skipped_repricing: reprice products skipped
+        because they were locked at the applied gold/silver price, queueing again
+        those still locked.
+
+        :param metal: 'gold' or 'silver'
+        :param ids: Skipped product template ids
+        :return: dict - Repriced and still skipped counts
+        """
+        if metal == 'gold':
+            base_price = self.env['gold.price.service'].get_applied_gold_price()
+        else:
+            base_price = self.env['silver.price.service'].get_applied_silver_price_999()
+        ids = self.search(self.REPRICING_DOMAINS[metal] + [('id', 'in', ids)]).ids
+        updated, skipped = self._reprice_skip_locked(metal, base_price, ids)
+        return {'products_updated': updated, 'skipped': len(skipped)}
+
+    @api.model
+    def _get_markup_snapshot(self):
+        """
+        Effective markup of every pricing segment: 'gold_local', 'gold_foreign',
+        one 'bars_<tier>' per bar weight tier (e.g. 'bars_31g') and 'silver'.
+
+        :return: dict - segment to markup per gram
+        """
+        snapshot = {}
+        for segment, gold_type in (('gold_local', 'jewellery_local'),
+                                   ('gold_foreign', 'jewellery_foreign')):
+            snapshot[segment] = get_markup_per_gram(self.env, gold_type)
+        for suffix, markup in zip(BAR_TIER_PARAM_SUFFIXES, get_bar_tier_markups(self.env),
+                                  strict=True):
+            snapshot[f'bars_{suffix}'] = markup
+        snapshot['silver'] = get_silver_markup_per_gram(self.env)
+        return snapshot
+
+    @api.model
+    def _get_markup_segment_domain(self, segment):
+        """Domain of the products priced with the markup of a segment (see _get_markup_snapshot)."""
+        if segment == 'silver':
+            return list(self.REPRICING_DOMAINS['silver'])
+        if segment.startswith('bars_'):
+            index = BAR_TIER_PARAM_SUFFIXES.index(segment[len('bars_'):])
+            return self.REPRICING_DOMAINS['gold'] + [('jewellery_type', '=', 'gold_bars')] + [
+                ('jewellery_weight_g', operator, weight)
+                for operator, weight in bar_tier_weight_conditions(index)
+            ]
+        if segment not in ('gold_local', 'gold_foreign'):
+            raise ValueError(f'Unknown markup segment: {segment}')
+        return self.REPRICING_DOMAINS['gold'] + [('jewellery_type', '=', segment)]
+
+    @api.model
+    def _reprice_markup_segments(self, segments):
+        """
+        Reprice the products of the given markup segments at the applied gold and
+        silver prices, in batches, reporting progress when run as a job. Metals
+        are then marked as applied with the new markups, so the next price run
+        does not reprice the whole catalog again.
+
+        :param segments: list - Segment names, see _get_markup_snapshot()
+        :return: dict - metal to number of repriced products
+        """
+        prices = {
+            'gold': self.env['gold.price.service'].get_applied_gold_price(),
+            'silver': self.env['silver.price.service'].get_applied_silver_price_999(),
+        }
+        gold_domains = [self._get_markup_segment_domain(segment)
+                        for segment in segments if segment != 'silver']
+        ids = {
+            'gold': self.search(expression.OR(gold_domains)).ids if gold_domains else [],
+            'silver': (self.search(self._get_markup_segment_domain('silver')).ids
+                       if 'silver' in segments else []),
+        }
+        total = len(ids['gold']) + len(ids['silver'])
+        jobs = self.env['jewellery.job']
+        jobs._report_progress(0, total)
+        done = 0
+        results = {}
+        for metal, metal_ids in ids.items():
+            if not metal_ids or prices[metal] <= 0:
+                continue
+            for batch in split_every(self.SEGMENT_REPRICING_BATCH_SIZE, metal_ids, self.browse):
+                if metal == 'gold':
+                    batch.update_gold_prices(prices[metal])
+                else:
+                    batch.update_silver_prices(prices[metal])
+                done += len(batch)
+                jobs._report_progress(done, total)
+            results[metal] = len(metal_ids)
+        scheduler = self.env['jewellery.price.scheduler']
+        for metal in ('gold', 'silver'):
+            if prices[metal] > 0:
+                scheduler._set_applied_signature(metal, prices[metal])
+        _logger.info('Markup segments %s repriced: %s', ', '.join(segments), results)
+        return results
+
+    def _compute_gold_update_values(self, base_gold_price):
+        """
+        Compute the gold prices of products with all required data.
 
+        :param base_gold_price: Current base gold price per gram
+        :return: tuple - (list of dicts with 'record' and the price fields,
+            number of skipped products)
+        """
         # Prepare batch update values
         update_values = []
         skipped_count = 0
 
-        for product in gold_products:
+        for product in self:
             internal_gold_type = product._map_jewellery_type_to_gold_type(
                 product.jewellery_type)
             if not internal_gold_type:
@@ -774,6 +1454,42 @@ class ProductTemplate(models.Model):
                 # Invalid purity or other error - skip this product
                 skipped_count += 1
                 continue
+        return update_values, skipped_count
+
+    def update_gold_prices(self, base_gold_price):
+        """
+        Update product prices based on new gold price.
+        Called by cron job for batch updates.
+        Skips products missing required data (weight, purity, type).
+
+        :param base_gold_price: Current base gold price per gram
+        """
+        rows = self._compute_gold_price_rows(base_gold_price)
+        if rows:
+            self._write_jewellery_prices(self.GOLD_PRICE_COLUMNS, rows)
+
+    def _compute_gold_price_rows(self, base_gold_price):
+        """
+        Compute the gold prices of these products, skipping those missing
+        required data (weight, purity, type) or markup.
+
+        :param base_gold_price: Current base gold price per gram
+        :return: list - (id, list_price, gold_cost_price, gold_min_sale_price) rows
+        """
+        # Filter only gold products with all required data
+        gold_products = self.filtered(
+            lambda p: p.is_gold_product
+            and p.gold_purity
+            and p.jewellery_weight_g
+            and p.jewellery_weight_g > 0
+        )
+
+        if not gold_products:
+            return []
+
+        with run_stats.stage('compute'):
+            update_values, skipped_count = gold_products._compute_gold_update_values(
+                base_gold_price)
 
         # Log skipped products
         if skipped_count > 0:
@@ -782,10 +1498,8 @@ class ProductTemplate(models.Model):
                 skipped_count
             )
 
-        # Batch update using write
-        for vals in update_values:
-            product = vals.pop('record')
-            product.write(vals)
+        return [(vals['record'].id, vals['list_price'], vals['gold_cost_price'],
+                 vals['gold_min_sale_price']) for vals in update_values]
 
     def update_silver_prices(self, base_silver_999):
         """
@@ -794,8 +1508,18 @@ class ProductTemplate(models.Model):
 
         :param base_silver_999: Silver 999 price per gram (EGP)
         """
-        if not self:
-            return
+        rows = self._compute_silver_price_rows(base_silver_999)
+        if rows:
+            self._write_jewellery_prices(self.SILVER_PRICE_COLUMNS, rows)
+
+    def _compute_silver_price_rows(self, base_silver_999):
+        """
+        Compute the silver prices of these products, skipping those missing
+        required data (weight, purity).
+
+        :param base_silver_999: Silver 999 price per gram (EGP)
+        :return: list - (id, list_price, silver_cost_price, silver_min_sale_price) rows
+        """
         silver_products = self.filtered(
             lambda p: p.is_silver_product
             and p.silver_purity
@@ -803,19 +1527,9 @@ class ProductTemplate(models.Model):
             and p.jewellery_weight_g > 0
         )
         if not silver_products:
-            return
+            return []
         markup_per_gram = get_silver_markup_per_gram(self.env)
-        for product in silver_products:
-            try:
-                cost_price, sale_price, min_sale_price = compute_silver_product_price(
-                    base_silver_999_per_gram=base_silver_999,
-                    weight_g=product.jewellery_weight_g,
-                    markup_per_gram=markup_per_gram,
-                )
-                product.write({
-                    'list_price': sale_price,
-                    'silver_cost_price': cost_price,
-                    'silver_min_sale_price': min_sale_price,
-                })
-            except ValueError:
-                continue
+        with run_stats.stage('compute'):
+            return list(compute_silver_prices(
+                [[(product.id, product.jewellery_weight_g) for product in silver_products]],
+                base_silver_999, markup_per_gram))
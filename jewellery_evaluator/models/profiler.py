@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import logging
+
+from odoo import api, fields, models
+
+from ..profiling import CallProfiler, should_sample
+
+_logger = logging.getLogger(__name__)
+
+# Names of stored profile attachments start with this prefix (see action_jewellery_profile)
+PROFILE_ATTACHMENT_PREFIX = 'jewellery_profile_'
+
+
+class JewelleryProfiler(models.Model):
+    _name = 'jewellery.profiler'
+    _description = 'Jewellery Profiler'
+
+    DEFAULT_TOP_N = 25
+
+    @api.model
+    def _get_profiling_settings(self):
+        """
+        :return: tuple - (sample rate between 0.0 and 1.0, 0.0 when profiling
+            is off; number of functions in log summaries)
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        if ICP.get_param('jewellery_evaluator.profiling_mode', 'off') != 'cprofile':
+            return 0.0, self.DEFAULT_TOP_N
+        try:
+            rate = min(max(float(ICP.get_param('jewellery_evaluator.profiling_sample_rate', '0.1')), 0.0), 1.0)
+        except (TypeError, ValueError):
+            rate = 0.0
+        try:
+            top_n = max(int(ICP.get_param('jewellery_evaluator.profiling_top_n', self.DEFAULT_TOP_N)), 1)
+        except (TypeError, ValueError):
+            top_n = self.DEFAULT_TOP_N
+        return rate, top_n
+
+    @api.model
+    def _run_profiled(self, label, func, *args, **kwargs):
+        """
+        Call func, profiling a sampled fraction of the calls with cProfile when
+        profiling is on. A profiled call logs its top functions and stores the
+        raw profile as an attachment, also when func raises.
+
+        :param label: Name of the profiled entry point, used in logs and attachment names
+        :return: Whatever func returns
+        """
+        rate, top_n = self._get_profiling_settings()
+        if not should_sample(rate):
+            return func(*args, **kwargs)
+        profiler = CallProfiler()
+        try:
+            with profiler:
+                return func(*args, **kwargs)
+        finally:
+            if profiler.active:
+                self._store_profile(label, profiler, top_n)
+
+    @api.model
+    def _store_profile(self, label, profiler, top_n):
+        """
+        Log the top_n summary of a profile and save the raw profile as an
+        attachment, in its own transaction (the profiled one may roll back).
+        """
+        summary = profiler.summary(top_n)
+        _logger.info('Profile of %s (%.3fs), top %d functions:\n%s',
+                     label, profiler.elapsed, top_n, summary)
+        timestamp = fields.Datetime.now().strftime('%Y%m%d_%H%M%S')
+        try:
+            with self.env.registry.cursor() as cr:
+                api.Environment(cr, self.env.uid, {})['ir.attachment'].sudo().create({
+                    'name': f'{PROFILE_ATTACHMENT_PREFIX}{label}_{timestamp}.prof',
+                    'raw': profiler.dump(),
+                    'mimetype': 'application/octet-stream',
+                    'description': f'{label}: {profiler.elapsed:.3f}s\n{summary}',
+                })
+        except Exception:
+            _logger.exception('Could not store the profile of %s', label)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+from odoo import api, models
+
+from .diamond_price_service import USD_EGP_CURRENCIES, USD_EGP_RATES_CHANGED
+
+
+class ResCurrencyRate(models.Model):
+    _inherit = 'res.currency.rate'
+
+    def _mark_usd_egp_rates_changed(self):
+        """
+        Make diamond.price.service read USD/EGP histories uncached for the rest of
+        the transaction, if any of these rates is a USD or EGP one. Other workers
+        see the change through the rates version once it is committed.
+        """
+        if any(rate.currency_id.name in USD_EGP_CURRENCIES for rate in self.sudo()):
+            self.env.cr.precommit.data[USD_EGP_RATES_CHANGED] = True
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._mark_usd_egp_rates_changed()
+        return records
+
+    def write(self, vals):
+        self._mark_usd_egp_rates_changed()
+        res = super().write(vals)
+        if 'currency_id' in vals:
+            self._mark_usd_egp_rates_changed()
+        return res
+
+    def unlink(self):
+        self._mark_usd_egp_rates_changed()
+        return super().unlink()
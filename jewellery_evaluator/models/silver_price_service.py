@@ -4,35 +4,24 @@
 # Website: https://www.revenax.com
 
 import logging
-import re
+import time
+from urllib.parse import urlsplit
 
 from odoo import api, models
 
-from ..utils import compute_silver_product_price  # noqa: E402
+from .. import metrics, run_stats
+from ..utils import compute_silver_product_price, parse_price_text  # noqa: E402
 
 _logger = logging.getLogger(__name__)
 
 # ---------- Selenium helpers (lazy-imported) ----------
 
+# Default page; override with jewellery_evaluator.silver_page_url (e.g. a local replay feed).
 _SILVER_PAGE = "https://dahabmasr.com/silver-price-today-en"
 _PRICE_CELL_XPATH = (
     "/html/body/div[3]/main/div[2]/div/div[2]/section"
     "/div/div[2]/div[1]/table/tbody/tr[1]/td[3]"
 )
-_PRICE_NUMERIC = re.compile(r"[\d,]+(?:\.\d+)?")
-
-
-def _parse_price(text):
-    """Extract a numeric price from a string like '53.20 EGP'."""
-    if not text or not text.strip():
-        return None
-    m = _PRICE_NUMERIC.search(text.strip().replace(",", ""))
-    if not m:
-        return None
-    try:
-        return float(m.group(0).replace(",", ""))
-    except (ValueError, TypeError):
-        return None
 
 
 def _create_driver():
@@ -67,17 +56,19 @@ def _create_driver():
     return d
 
 
-def _fetch_silver_price_selenium():
+def _fetch_silver_price_selenium(page_url=_SILVER_PAGE):
     """
-    Launch headless Chrome, navigate to dahabmasr.com, and scrape silver 999
-    price. Returns float or None.
+    Launch headless Chrome, navigate to the silver page (dahabmasr.com by
+    default), and scrape silver 999 price. Returns float or None.
     """
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
 
     driver = _create_driver()
+    started = time.monotonic()
+    outcome = 'error'
     try:
-        driver.get(_SILVER_PAGE)
+        driver.get(page_url)
 
         def _text_ready(drv):
             el = drv.find_element(By.XPATH, _PRICE_CELL_XPATH)
@@ -85,9 +76,20 @@ def _fetch_silver_price_selenium():
             return el if t and t != "--" else False
 
         el = WebDriverWait(driver, 30).until(_text_ready)
-        return _parse_price(el.text)
+        with run_stats.stage('parse'):
+            price = parse_price_text(el.text)
+        if price:
+            outcome = 'ok'
+        return price
+    except Exception as e:
+        if type(e).__name__ == 'TimeoutException':
+            outcome = 'timeout'
+        raise
     finally:
         driver.quit()
+        metrics.PRICE_FETCH_SECONDS.observe(
+            time.monotonic() - started, source='silver',
+            host=urlsplit(page_url).hostname or '', outcome=outcome)
 
 
 class SilverPriceService(models.Model):
@@ -108,8 +110,16 @@ class SilverPriceService(models.Model):
         except Exception as e:
             _logger.warning(
                 'Silver fetch failed, using fallback: %s', str(e))
+        run_stats.mark_fallback()
+        metrics.PRICE_FALLBACKS.inc(source='silver')
         return self._get_fallback_silver_price()
 
+    @api.model
+    def _get_silver_page_url(self):
+        """Page scraped for the silver 999 price (system parameter or dahabmasr.com)."""
+        return self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.silver_page_url') or _SILVER_PAGE
+
     @api.model
     def _get_fallback_silver_price(self):
         """
@@ -133,6 +143,7 @@ class SilverPriceService(models.Model):
         self.env['ir.config_parameter'].sudo().set_param(
             'jewellery_evaluator.silver_fallback_price', str(price_per_gram)
         )
+        self.env['jewellery.pricing.run']._set_fetched_at('silver')
         _logger.info('Silver 999 price updated: %s per gram', price_per_gram)
 
     @api.model
@@ -142,7 +153,7 @@ class SilverPriceService(models.Model):
         Returns the price (float) or 0.0 on failure.
         """
         try:
-            price = _fetch_silver_price_selenium()
+            price = _fetch_silver_price_selenium(self._get_silver_page_url())
         except ImportError:
             _logger.warning(
                 'Selenium is not installed — cannot auto-fetch silver price. '
@@ -160,17 +171,55 @@ class SilverPriceService(models.Model):
             return 0.0
 
         _logger.info('Silver 999 price fetched from web: %s', price)
+        self.env['jewellery.pricing.run']._set_fetched_at('silver')
         return price
 
     @api.model
-    def update_all_silver_product_prices(self):
+    def get_applied_silver_price_999(self):
+        """
+        Get the silver 999 price the catalog was last repriced with, without
+        launching the scraper (safe for stored computes). Before the first
+        repricing run the stored fallback price is used.
+        """
+        raw = self.env['ir.config_parameter'].sudo().get_param(
+            'jewellery_evaluator.applied_silver_price', '0.0'
+        )
+        try:
+            applied = float(raw)
+        except (TypeError, ValueError):
+            applied = 0.0
+        return applied if applied > 0 else self._get_fallback_silver_price()
+
+    @api.model
+    def _set_applied_silver_price(self, base_silver):
+        """Remember the silver 999 price the catalog was last repriced with."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'jewellery_evaluator.applied_silver_price', str(base_silver)
+        )
+        self.env['jewellery.price.scheduler']._set_applied_signature('silver', base_silver)
+
+    @api.model
+    def update_all_silver_product_prices(self, base_silver=None):
         """
         Get current silver price (single entry point: Selenium or fallback),
-        then update all silver products. Called by cron every 10 minutes.
+        then update all silver products. Called by cron every 10 minutes; in
+        event-driven repricing mode it only queues repricing on input changes.
+
+        :param base_silver: Already fetched silver 999 price per gram (e.g. from
+            the price scheduler); when omitted it is fetched or read from fallback
+        :return: dict - Execution summary, with per-stage measurements under 'stats'
         """
+        return self.env['jewellery.pricing.run']._instrument(
+            'silver', self._update_all_silver_product_prices, base_silver)
+
+    @api.model
+    def _update_all_silver_product_prices(self, base_silver=None):
         _logger.info('Starting silver price update for all products')
         try:
-            base_silver = self.get_current_silver_price_999()
+            fetched = base_silver is None
+            if fetched:
+                with run_stats.stage('fetch'):
+                    base_silver = self.get_current_silver_price_999()
 
             if base_silver <= 0:
                 _logger.warning(
@@ -180,33 +229,85 @@ class SilverPriceService(models.Model):
                     'success': True, 'products_updated': 0,
                     'base_price': 0.0, 'message': 'Silver price not configured',
                 }
+            scheduler = self.env['jewellery.price.scheduler']
+            if fetched and scheduler._is_on_change_mode():
+                return scheduler._queue_repricing_if_changed('silver', base_silver)
             _logger.info('Silver price: %s per gram', base_silver)
 
+            return scheduler._run_coalesced(
+                'silver', base_silver, self._reprice_all_silver_products)
+
+        except Exception as e:
+            _logger.error('Silver price update failed: %s',
+                          str(e), exc_info=True)
+            return {
+                'success': False, 'products_updated': 0,
+                'base_price': None, 'message': str(e), 'error': str(e),
+            }
+
+    @api.model
+    def _reprice_all_silver_products(self, base_silver):
+        """
+        Repricing stage of update_all_silver_product_prices, run under the silver run lock.
+
+        :param base_silver: Silver 999 price per gram
+        :return: dict - Execution summary
+        """
+        product_model = self.env['product.template']
+        if product_model._is_lazy_repricing():
+            self._set_applied_silver_price(base_silver)
+            version = product_model._bump_price_version()
+            return {
+                'success': True, 'products_updated': 0, 'base_price': base_silver,
+                'message': f'Price version {version} published; products reprice on read',
+            }
+        engine = product_model._get_repricing_engine()
+        if engine != 'orm':
+            with run_stats.stage('write'):
+                if engine == 'sql':
+                    total = product_model._sql_update_silver_prices(base_silver)
+                else:
+                    total = product_model._stream_update_silver_prices(base_silver)
+            self._set_applied_silver_price(base_silver)
+            _logger.info('Silver %s repricing: %d products, base %s',
+                         engine, total, base_silver)
+            return {
+                'success': True, 'products_updated': total,
+                'base_price': base_silver, 'message': f'Updated {total} products',
+            }
+
+        with run_stats.stage('search'):
             silver_products = self.env['product.template'].search([
                 ('jewellery_type', '=', 'silver'),
                 ('silver_purity', '!=', False),
                 ('jewellery_weight_g', '>', 0),
             ])
 
-            if not silver_products:
-                _logger.info('No silver products found to update')
-                return {
-                    'success': True, 'products_updated': 0,
-                    'base_price': base_silver, 'message': 'No silver products found',
-                }
-
-            silver_products.update_silver_prices(base_silver)
-            total = len(silver_products)
-            _logger.info(
-                'Silver price update completed: %d products, base %s', total, base_silver)
+        if not silver_products:
+            _logger.info('No silver products found to update')
+            self._set_applied_silver_price(base_silver)
             return {
-                'success': True, 'products_updated': total,
-                'base_price': base_silver, 'message': f'Updated {total} products',
+                'success': True, 'products_updated': 0,
+                'base_price': base_silver, 'message': 'No silver products found',
             }
-        except Exception as e:
-            _logger.error('Silver price update failed: %s',
-                          str(e), exc_info=True)
+
+        if product_model._is_skip_locked_repricing():
+            total, skipped = product_model._reprice_skip_locked(
+                'silver', base_silver, silver_products.ids)
+            self._set_applied_silver_price(base_silver)
             return {
-                'success': False, 'products_updated': 0,
-                'base_price': None, 'message': str(e), 'error': str(e),
+                'success': True, 'products_updated': total,
+                'skipped_locked': len(skipped), 'base_price': base_silver,
+                'message': f'Updated {total} products'
+                           + (f', {len(skipped)} locked ones queued' if skipped else ''),
             }
+
+        silver_products.update_silver_prices(base_silver)
+        self._set_applied_silver_price(base_silver)
+        total = len(silver_products)
+        _logger.info(
+            'Silver price update completed: %d products, base %s', total, base_silver)
+        return {
+            'success': True, 'products_updated': total,
+            'base_price': base_silver, 'message': f'Updated {total} products',
+        }
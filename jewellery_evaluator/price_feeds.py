@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+Network-side helpers for price feeds (no ORM access).
+
+Everything here may run in worker threads, so functions must only receive plain
+values (URLs, regexes, timeouts) and never an Odoo environment or cursor.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+import requests
+
+from . import metrics, run_stats
+from .utils import median_consensus, parse_gold_price_with_regex, percentile
+
+GOLD_REQUEST_HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
+}
+
+
+# Hedge delay used until a source has enough latency samples for a p95.
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_SAMPLES = 5
+
+
+class FetchOutcome(NamedTuple):
+    """Result of one source fetch: value is None when the fetch failed or timed out."""
+
+    source: str
+    value: float | None
+    elapsed: float
+    error: str | None = None
+
+
+class ConsensusResult(NamedTuple):
+    """Price agreed across sources, with every per-source outcome and rejected outliers."""
+
+    value: float
+    outcomes: list[FetchOutcome]
+    rejected: list[float]
+
+
+class LatencyTracker:
+    """Per-process sliding window of successful fetch latencies, keyed by source."""
+
+    def __init__(self, window: int = 50):
+        self._window = window
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self._window)).append(seconds)
+
+    def hedge_delay(self, key: str, pct: float = 95, default: float = DEFAULT_HEDGE_DELAY) -> float:
+        """Return the pct-th percentile latency of key, or default with too few samples."""
+        with self._lock:
+            samples = list(self._samples.get(key, ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return default
+        return percentile(samples, pct)
+
+
+LATENCY_TRACKER = LatencyTracker()
+
+
+def fetch_gold_price(endpoint: str, regex_formula: str, timeout: float = 10) -> float:
+    """
+    GET the gold endpoint and extract the 21K price with the configured regex.
+
+    Args:
+        endpoint: HTTP/HTTPS URL returning HTML/text.
+        regex_formula: Pattern passed to parse_gold_price_with_regex.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        float: Extracted 21K gold price per gram.
+
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors.
+        ValueError: If the price cannot be extracted from the response.
+    """
+    started = time.monotonic()
+    outcome = 'error'
+    try:
+        response = requests.get(endpoint, headers=GOLD_REQUEST_HEADERS, timeout=timeout)
+        response.raise_for_status()
+        LATENCY_TRACKER.record(endpoint, time.monotonic() - started)
+        run_stats.add_bytes(len(response.content))
+        with run_stats.stage('parse'):
+            price = parse_gold_price_with_regex(response.text, regex_formula)
+        outcome = 'ok'
+        return price
+    except requests.exceptions.Timeout:
+        outcome = 'timeout'
+        raise
+    finally:
+        metrics.PRICE_FETCH_SECONDS.observe(
+            time.monotonic() - started, source='gold',
+            host=urlsplit(endpoint).hostname or '', outcome=outcome)
+
+
+def _timed_call(fn: Callable[[], float | None]) -> tuple[float | None, float]:
+    started = time.monotonic()
+    value = fn()
+    return value, time.monotonic() - started
+
+
+def fetch_concurrently(
+    jobs: dict[str, tuple[Callable[[], float | None], float]],
+) -> dict[str, FetchOutcome]:
+    """
+    Run several source fetches in parallel threads, each with its own timeout.
+
+    Timeouts are measured from the moment all jobs are submitted, so a slow
+    source never extends the wait for the others. A timed-out fetch is left to
+    finish in the background; its result is discarded.
+
+    Args:
+        jobs: Mapping of source name to (callable, timeout_seconds). Callables
+            take no arguments and return a price or None.
+
+    Returns:
+        dict: Source name to FetchOutcome.
+    """
+    if not jobs:
+        return {}
+    executor = ThreadPoolExecutor(
+        max_workers=len(jobs), thread_name_prefix='jewellery_price_fetch')
+    started = time.monotonic()
+    futures = {name: executor.submit(_timed_call, fn)
+               for name, (fn, _timeout) in jobs.items()}
+    outcomes = {}
+    try:
+        for name, future in futures.items():
+            timeout = jobs[name][1]
+            remaining = max(0.0, started + timeout - time.monotonic())
+            try:
+                value, elapsed = future.result(timeout=remaining)
+                outcomes[name] = FetchOutcome(name, value, elapsed)
+            except FuturesTimeoutError:
+                future.cancel()
+                outcomes[name] = FetchOutcome(
+                    name, None, time.monotonic() - started,
+                    f'timed out after {timeout:g}s')
+            except Exception as e:
+                outcomes[name] = FetchOutcome(
+                    name, None, time.monotonic() - started, str(e) or type(e).__name__)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return outcomes
+
+
+def fetch_with_consensus(
+    sources: list[tuple[str, Callable[[], float | None]]],
+    timeout: float,
+    mode: str = 'first',
+    tolerance_pct: float = 2.0,
+    tracker: LatencyTracker = LATENCY_TRACKER,
+) -> ConsensusResult:
+    """
+    Fetch one price from several redundant sources.
+
+    In 'first' mode requests are hedged: the next source (in priority order) is
+    fired only when the current one has not answered within its p95 latency, or
+    immediately when it fails. The first valid answer wins.
+
+    In 'median' mode every source is fired at once and the result is the median
+    of the answers received before the timeout, after rejecting outliers more
+    than tolerance_pct away from the median.
+
+    Args:
+        sources: Ordered (key, callable) pairs; key is also the latency-tracker key.
+        timeout: Overall deadline in seconds.
+        mode: 'first' or 'median'.
+        tolerance_pct: Outlier tolerance for 'median' mode.
+        tracker: Latency history used for the hedge delays.
+
+    Returns:
+        ConsensusResult: Agreed price, per-source outcomes and rejected outliers.
+
+    Raises:
+        ValueError: If no source returned a valid price, or sources disagree.
+    """
+    if not sources:
+        raise ValueError('No gold price sources configured.')
+    executor = ThreadPoolExecutor(
+        max_workers=len(sources), thread_name_prefix='jewellery_price_hedge')
+    started = time.monotonic()
+    deadline = started + timeout
+    pending: dict = {}
+    outcomes: list[FetchOutcome] = []
+    next_index = 0
+    next_hedge_at = deadline
+
+    def launch():
+        nonlocal next_index, next_hedge_at
+        key, fn = sources[next_index]
+        next_index += 1
+        pending[executor.submit(_timed_call, fn)] = key
+        next_hedge_at = time.monotonic() + tracker.hedge_delay(key)
+
+    try:
+        launch()
+        while mode == 'median' and next_index < len(sources):
+            launch()
+        while pending or next_index < len(sources):
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if next_index < len(sources) and (not pending or now >= next_hedge_at):
+                launch()
+                continue
+            wake_at = next_hedge_at if next_index < len(sources) else deadline
+            done, _not_done = wait(
+                list(pending), timeout=max(0.0, min(wake_at, deadline) - now),
+                return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                try:
+                    value, elapsed = future.result()
+                except Exception as e:
+                    outcomes.append(FetchOutcome(
+                        key, None, time.monotonic() - started, str(e) or type(e).__name__))
+                    continue
+                if value and value > 0:
+                    outcomes.append(FetchOutcome(key, value, elapsed))
+                else:
+                    outcomes.append(FetchOutcome(key, None, elapsed, 'No price returned'))
+            if mode == 'first' and any(o.value for o in outcomes):
+                break
+        for key in pending.values():
+            error = (f'timed out after {timeout:g}s' if time.monotonic() >= deadline
+                     else 'abandoned: price already received')
+            outcomes.append(FetchOutcome(key, None, time.monotonic() - started, error))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    prices = [o.value for o in outcomes if o.value]
+    if not prices:
+        errors = '; '.join(f'{o.source}: {o.error}' for o in outcomes)
+        raise ValueError(f'No gold price source returned a price ({errors}).')
+    if mode == 'first':
+        return ConsensusResult(prices[0], outcomes, [])
+    value, rejected = median_consensus(prices, tolerance_pct)
+    return ConsensusResult(value, outcomes, rejected)
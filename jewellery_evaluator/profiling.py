@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+Sampled cProfile profiling of single calls (no ORM access).
+
+Only one call per thread is profiled at a time: a CallProfiler entered while
+another one is running in the same thread stays idle, so a profiled pricing
+run does not also profile the product writes it makes.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections.abc import Callable
+
+_ACTIVE = threading.local()
+
+
+def should_sample(rate: float, rand: Callable[[], float] = random.random) -> bool:
+    """True for about rate (0.0 to 1.0) of the calls."""
+    if rate <= 0:
+        return False
+    return rate >= 1 or rand() < rate
+
+
+class CallProfiler:
+    """Context manager profiling the calls made in its block with cProfile."""
+
+    def __init__(self):
+        self.profile: cProfile.Profile | None = None
+        self.elapsed = 0.0
+        self._started = 0.0
+
+    @property
+    def active(self) -> bool:
+        """True if the block was profiled (False when nested or another profiler ran)."""
+        return self.profile is not None
+
+    def __enter__(self):
+        if getattr(_ACTIVE, 'running', False):
+            return self
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active in this thread
+            return self
+        _ACTIVE.running = True
+        self.profile = profile
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profile is not None:
+            self.profile.disable()
+            self.elapsed = time.perf_counter() - self._started
+            _ACTIVE.running = False
+        return False
+
+    def dump(self) -> bytes:
+        """
+        Raw profile in the pstats file format, readable with
+        ``pstats.Stats(path)``, snakeviz or gprof2dot.
+        """
+        if self.profile is None:
+            return b''
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+    def summary(self, top_n: int = 25, sort: str = 'cumulative') -> str:
+        """Text table of the top_n functions by sort ('cumulative', 'tottime', ...)."""
+        if self.profile is None:
+            return ''
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).strip_dirs().sort_stats(sort).print_stats(top_n)
+        return stream.getvalue()
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+Streaming whole-catalog repricing (no ORM access).
+
+Three stages chained as generators, so memory stays flat whatever the catalog
+size:
+
+  read     iter_row_chunks: a named server-side cursor (DECLARE / FETCH) yields
+           chunks holding only the columns pricing needs
+  compute  compute_gold_prices / compute_silver_prices: the pure price helpers
+           from utils, one (id, list_price, cost, min_sale) row per product
+  apply    ValuesPriceWriter: buffers rows and writes each buffer with a single
+           multi-row UPDATE ... FROM (VALUES ...); CopyPriceWriter streams them
+           with COPY into a temporary table and applies one join UPDATE
+
+Functions receive a database cursor and plain values, never an environment.
+"""
+
+import io
+from collections.abc import Callable, Iterable, Iterator
+
+from .utils import compute_gold_product_price, compute_silver_product_price, resolve_bar_tier_markup
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_WRITE_BUFFER = 1000
+DEFAULT_COPY_BUFFER = 10000
+
+
+def iter_row_chunks(cursor, name: str, query: str, params, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Run query behind a named server-side cursor and yield its rows chunk by chunk.
+
+    Each chunk is fetched before it is yielded, so the caller may use the same
+    cursor (e.g. to write) between chunks. The server-side cursor lives until it
+    is exhausted or the transaction ends.
+
+    Args:
+        cursor: Database cursor (Odoo or psycopg2)
+        name: SQL identifier of the server-side cursor
+        query: SELECT statement
+        params: Query parameters
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        list: Up to chunk_size row tuples
+    """
+    cursor.execute(f'DECLARE {name} NO SCROLL CURSOR FOR {query}', params)
+    while True:
+        cursor.execute(f'FETCH FORWARD {int(chunk_size)} FROM {name}')
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        yield rows
+    cursor.execute(f'CLOSE {name}')
+
+
+def gold_markup_resolver(markup_local: float, markup_foreign: float,
+                         tier_markups: list[float]) -> Callable[[str, float], float]:
+    """
+    Build a (jewellery_type, weight_g) -> markup per gram lookup from markups read once.
+    Same result as get_markup_per_gram for each product.
+    """
+    flat = {'gold_local': markup_local, 'gold_foreign': markup_foreign}
+
+    def markup_for(jewellery_type, weight_g):
+        if jewellery_type == 'gold_bars':
+            return resolve_bar_tier_markup(weight_g, tier_markups)
+        return flat.get(jewellery_type, 0.0)
+
+    return markup_for
+
+
+def compute_gold_prices(chunks: Iterable[list], base_gold_price: float,
+                        markup_for: Callable[[str, float], float]) -> Iterator[tuple]:
+    """
+    Compute stage for gold: skips the rows update_gold_prices() skips
+    (unconfigured markup, invalid purity or weight).
+
+    Args:
+        chunks: Chunks of (id, jewellery_type, gold_purity, jewellery_weight_g) rows
+        base_gold_price: 21K price per gram
+        markup_for: Markup lookup, see gold_markup_resolver
+
+    Yields:
+        tuple: (id, list_price, gold_cost_price, gold_min_sale_price)
+    """
+    for rows in chunks:
+        for product_id, jewellery_type, purity, weight_g in rows:
+            markup = markup_for(jewellery_type, weight_g)
+            if markup <= 0:
+                continue
+            try:
+                cost, sale, min_sale = compute_gold_product_price(
+                    base_gold_price, purity, weight_g, markup)
+            except ValueError:
+                continue
+            yield product_id, sale, cost, min_sale
+
+
+def compute_silver_prices(chunks: Iterable[list], base_silver_999: float,
+                          markup_per_gram: float) -> Iterator[tuple]:
+    """
+    Compute stage for silver.
+
+    Args:
+        chunks: Chunks of (id, jewellery_weight_g) rows
+        base_silver_999: Silver 999 price per gram
+        markup_per_gram: Silver markup per gram
+
+    Yields:
+        tuple: (id, list_price, silver_cost_price, silver_min_sale_price)
+    """
+    for rows in chunks:
+        for product_id, weight_g in rows:
+            try:
+                cost, sale, min_sale = compute_silver_product_price(
+                    base_silver_999, weight_g, markup_per_gram)
+            except ValueError:
+                continue
+            yield product_id, sale, cost, min_sale
+
+
+class _PriceWriter:
+    """
+    Apply stage base: buffers (id, value, ...) rows and writes them to the given
+    numeric columns, also setting write_uid/write_date.
+
+    Use as a context manager, or call close() after the last write(); the
+    number of updated rows is then in updated.
+    """
+
+    default_buffer_size = DEFAULT_WRITE_BUFFER
+
+    def __init__(self, cursor, columns, uid, table='product_template', buffer_size=None):
+        """
+        Args:
+            cursor: Database cursor
+            columns: Updated numeric columns, in the order of each row after its id
+            uid: User stored as write_uid
+            table: Updated table
+            buffer_size: Rows buffered before each flush
+        """
+        self.cursor = cursor
+        self.columns = list(columns)
+        self.uid = uid
+        self.table = table
+        self.buffer_size = buffer_size or self.default_buffer_size
+        self.updated = 0
+        self._buffer: list[tuple] = []
+        self._value_names = ', '.join(f'v{i}' for i in range(len(self.columns)))
+        self._assignments = ', '.join(
+            f'{column} = v.v{i}' for i, column in enumerate(self.columns)) + (
+            ", write_uid = %s, write_date = (now() at time zone 'UTC')")
+
+    def write(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[tuple]):
+        for row in rows:
+            self.write(row)
+        return self
+
+    def flush(self):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+class ValuesPriceWriter(_PriceWriter):
+    """Writes every full buffer with one UPDATE ... FROM (VALUES ...) statement."""
+
+    def flush(self):
+        if not self._buffer:
+            return
+        params = [self.uid]
+        row_placeholder = '(%s::int, ' + ', '.join(['%s::numeric'] * len(self.columns)) + ')'
+        for row in self._buffer:
+            params.extend(row)
+        values = ', '.join([row_placeholder] * len(self._buffer))
+        self.cursor.execute(
+            f'UPDATE {self.table} AS t SET {self._assignments} '
+            f'FROM (VALUES {values}) AS v(id, {self._value_names}) WHERE t.id = v.id',
+            params,
+        )
+        self.updated += self.cursor.rowcount
+        self._buffer = []
+
+
+class CopyPriceWriter(_PriceWriter):
+    """
+    Streams every full buffer with COPY into a temporary table; close() applies
+    all rows with one join UPDATE. No statement grows with the number of rows,
+    so this scales to millions of products.
+    """
+
+    default_buffer_size = DEFAULT_COPY_BUFFER
+    temp_table = 'jewellery_price_apply'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._copied = 0
+        self._created = False
+
+    def _create_temp_table(self):
+        value_columns = ', '.join(f'v{i} numeric' for i in range(len(self.columns)))
+        self.cursor.execute(f'DROP TABLE IF EXISTS {self.temp_table}')
+        self.cursor.execute(
+            f'CREATE TEMP TABLE {self.temp_table} (id int4 NOT NULL, {value_columns}) '
+            'ON COMMIT DROP')
+        self._created = True
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if not self._created:
+            self._create_temp_table()
+        data = io.StringIO()
+        for row in self._buffer:
+            data.write('\t'.join(
+                '\\N' if value is None else repr(value) for value in row) + '\n')
+        data.seek(0)
+        self.cursor.copy_expert(
+            f'COPY {self.temp_table} (id, {self._value_names}) FROM STDIN', data)
+        self._copied += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        if not self._copied:
+            return
+        self.cursor.execute(f'ANALYZE {self.temp_table}')
+        self.cursor.execute(
+            f'UPDATE {self.table} AS t SET {self._assignments} '
+            f'FROM {self.temp_table} AS v WHERE t.id = v.id',
+            [self.uid],
+        )
+        self.updated += self.cursor.rowcount
+        self.cursor.execute(f'DROP TABLE {self.temp_table}')
+        self._created = False
+        self._copied = 0
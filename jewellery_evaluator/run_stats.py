@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""
+Per-run instrumentation of pricing runs (no ORM access).
+
+A run records into a RunStats while ``recording(stats)`` is active; code on the
+pricing path marks its stages with the module-level ``stage(name)`` and reports
+fetched bytes or fallback prices, all of which are no-ops outside a recording
+run. The active run is held in a context variable, so worker threads (which
+start with an empty context) never record into the cron thread's run.
+
+Stage timings and query counts are exclusive: while a nested stage runs, the
+enclosing stage is paused, so the stages of a run add up to at most its total.
+"""
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+STAGES = ('fetch', 'parse', 'search', 'compute', 'write', 'flush')
+
+
+class RunStats:
+    """Stage timings, query counts, fetched bytes and price freshness of one run."""
+
+    def __init__(self, query_count: Callable[[], int] | None = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            query_count: Returns the number of SQL queries run so far on the
+                run's cursor; query counts are left at 0 without it
+            clock: Monotonic clock in seconds
+        """
+        self._query_count = query_count or (lambda: 0)
+        self._clock = clock
+        self._stack: list[str] = []
+        self._mark = (0.0, 0)
+        self.started = clock()
+        self.timings: dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.queries: dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.bytes_fetched = 0
+        self.fallback_used = False
+        self.price_age: float | None = None
+
+    def _charge(self) -> None:
+        """Charge the time and queries since the last mark to the innermost stage."""
+        now, count = self._clock(), self._query_count()
+        if self._stack:
+            name = self._stack[-1]
+            self.timings[name] = self.timings.get(name, 0.0) + now - self._mark[0]
+            self.queries[name] = self.queries.get(name, 0) + count - self._mark[1]
+        self._mark = (now, count)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Charge the time and queries spent in the block to stage name."""
+        self._charge()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    def as_dict(self) -> dict:
+        """JSON-friendly summary; timings in seconds, price age in seconds or None."""
+        return {
+            'duration': round(self._clock() - self.started, 6),
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'queries': dict(self.queries),
+            'query_count': sum(self.queries.values()),
+            'bytes_fetched': self.bytes_fetched,
+            'fallback_used': self.fallback_used,
+            'price_age': self.price_age,
+        }
+
+
+_CURRENT: ContextVar[RunStats | None] = ContextVar('jewellery_run_stats', default=None)
+
+
+@contextmanager
+def recording(stats: RunStats) -> Iterator[RunStats]:
+    """Make stats the run recorded into by stage(), add_bytes() and mark_fallback()."""
+    token = _CURRENT.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT.reset(token)
+
+
+def current() -> RunStats | None:
+    """Run being recorded in this context, if any."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Charge the block to stage name of the recording run (no-op without one)."""
+    stats = _CURRENT.get()
+    if stats is None:
+        yield
+        return
+    with stats.stage(name):
+        yield
+
+
+def add_bytes(count: int) -> None:
+    """Count response bytes fetched by the recording run."""
+    stats = _CURRENT.get()
+    if stats is not None:
+        stats.bytes_fetched += count
+
+
+def mark_fallback() -> None:
+    """Note that the recording run priced with a fallback instead of a fetched value."""
+    stats = _CURRENT.get()
+    if stats is not None:
+        stats.fallback_used = True
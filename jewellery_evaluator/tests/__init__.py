@@ -3,4 +3,23 @@
 # Author: Mohamed A. Abdallah
 # Website: https://www.revenax.com
 
-from . import test_cron, test_require_customer
+from . import (
+    test_cron,
+    test_diamond_price_grid,
+    test_diamond_repricing,
+    test_internal_price_write,
+    test_jewellery_job,
+    test_lazy_repricing,
+    test_markup_segment_repricing,
+    test_metal_indexed_pricelist,
+    test_metrics_endpoint,
+    test_price_compute,
+    test_price_ingest,
+    test_price_scheduler,
+    test_pricing_run,
+    test_profiling,
+    test_require_customer,
+    test_skip_locked_repricing,
+    test_sql_repricing,
+    test_usd_egp_rates,
+)
@@ -161,3 +161,15 @@ class TestGoldPricingCron(common.TransactionCase):
         self.assertIn("base_price", result)
         self.assertTrue(result["success"])
         self.assertEqual(result["base_price"], 165.0)
+
+    def test_on_change_mode_leaves_selenium_crons_interval(self):
+        """Event-driven mode polls gold and USD/EGP every minute, not the Selenium fetches."""
+        self.env["res.config.settings"]._apply_repricing_mode_to_crons("on_change")
+        for xmlid, interval in (
+            ("ir_cron_update_gold_prices", 1),
+            ("ir_cron_update_diamond_prices", 1),
+            ("ir_cron_update_silver_prices", 10),
+            ("ir_cron_update_all_prices", 10),
+        ):
+            cron = self.env.ref(f"jewellery_evaluator.{xmlid}")
+            self.assertEqual(cron.interval_number, interval, xmlid)
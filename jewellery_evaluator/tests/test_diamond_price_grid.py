@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import io
+import unittest.mock as mock
+
+import odoo.tests.common as common
+from odoo.exceptions import UserError
+
+GRID = """shape,color,clarity,carat_from,carat_to,price_per_carat
+round,D,IF,0.30,0.39,4000
+round,D,IF,0.40,0.49,5000
+princess,H,SI1,1.00,1.49,3000
+"""
+
+
+class TestDiamondPriceGrid(common.TransactionCase):
+    """Graded diamonds are priced from the imported grid, repricing only affected cells."""
+
+    def setUp(self):
+        super().setUp()
+        self.service = self.env["diamond.price.service"]
+        self.env["jewellery.diamond.price"].search([]).unlink()
+        self.service.import_diamond_price_grid(io.StringIO(GRID))
+        self.rate = self.service.get_usd_to_egp_rate()
+        self.discount = self.service.get_global_diamond_discount()
+        self.products = self.env["product.template"].create([{
+            "name": f"Graded Stone {carat}",
+            "jewellery_type": "diamond_jewellery",
+            "diamond_carat": carat,
+            "diamond_shape": shape,
+            "diamond_color": color,
+            "diamond_clarity": clarity,
+        } for carat, shape, color, clarity in (
+            (0.35, "round", "D", "IF"),
+            (0.45, "round", "D", "IF"),
+            (1.2, "princess", "H", "SI1"),
+        )])
+
+    def _egp(self, usd):
+        return usd * self.rate * (100 - self.discount) / 100.0
+
+    def test_graded_products_are_priced_from_grid(self):
+        for product, usd in zip(self.products, (1400.0, 2250.0, 3600.0), strict=True):
+            self.assertEqual(product.diamond_usd_price, usd)
+            self.assertAlmostEqual(product.list_price, self._egp(usd), places=2)
+
+    def test_grid_update_reprices_only_affected_cells(self):
+        with mock.patch.object(
+            type(self.service), "reprice_diamonds_from_grid",
+            autospec=True, side_effect=type(self.service).reprice_diamonds_from_grid,
+        ) as reprice:
+            result = self.service.import_diamond_price_grid(io.StringIO(
+                GRID.replace("0.49,5000", "0.49,6000")))
+        self.assertEqual(result, {"cells_created": 0, "cells_updated": 1, "products_updated": 1})
+        self.assertEqual(reprice.call_args.args[1], self.products[1])
+        self.assertEqual(self.products[1].diamond_usd_price, 2700.0)
+        self.assertEqual(self.products[0].diamond_usd_price, 1400.0)
+
+    def test_unchanged_import_touches_nothing(self):
+        result = self.service.import_diamond_price_grid(io.StringIO(GRID))
+        self.assertEqual(result, {"cells_created": 0, "cells_updated": 0, "products_updated": 0})
+
+    def test_edit_in_grid_view_reprices_cell(self):
+        cell = self.env["jewellery.diamond.price"].search([
+            ("shape", "=", "princess"), ("color", "=", "H"), ("clarity", "=", "SI1"),
+        ])
+        cell.price_per_carat = 3500.0
+        self.assertEqual(self.products[2].diamond_usd_price, 4200.0)
+
+    def test_deleted_cell_reprices_its_products_from_remaining_cells(self):
+        Cell = self.env["jewellery.diamond.price"]
+        Cell.create({"shape": "round", "color": "D", "clarity": "IF",
+                     "carat_from": 0.44, "carat_to": 0.46, "price_per_carat": 8000.0})
+        cell = Cell.search([("shape", "=", "round"), ("carat_from", "=", 0.40)])
+        with mock.patch.object(
+            type(self.service), "reprice_diamonds_from_grid",
+            autospec=True, side_effect=type(self.service).reprice_diamonds_from_grid,
+        ) as reprice:
+            cell.unlink()
+        self.assertEqual(reprice.call_args.args[1], self.products[1])
+        self.assertEqual(self.products[1].diamond_usd_price, 3600.0)
+        self.assertAlmostEqual(self.products[1].list_price, self._egp(3600.0), places=2)
+
+    def test_grid_cache_is_not_cleared_globally(self):
+        with mock.patch.object(type(self.env.registry), "clear_cache") as clear_cache:
+            self.service.import_diamond_price_grid(io.StringIO(
+                GRID.replace("1.49,3000", "1.49,3200")))
+            self.env["jewellery.diamond.price"].search([("shape", "=", "princess")]).unlink()
+        clear_cache.assert_not_called()
+        self.assertEqual(self.products[2].diamond_usd_price, 3840.0)
+
+    def test_invalid_grid_is_rejected(self):
+        with self.assertRaises(UserError):
+            self.service.import_diamond_price_grid(io.StringIO(
+                GRID + "round,D,IF,0.50,0.40,100\n"))
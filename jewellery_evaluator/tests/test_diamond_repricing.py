@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+
+class TestDiamondRepricing(common.TransactionCase):
+    """Diamond runs write only changed prices, through the internal bulk price write."""
+
+    def setUp(self):
+        super().setUp()
+        self.products = self.env["product.template"].with_context(
+            skip_diamond_price_update=True,
+        ).create([{
+            "name": f"Diamond Ring {i}",
+            "jewellery_type": "diamond_jewellery",
+            "diamond_usd_price": 100.0 * (1 + i % 2),
+        } for i in range(4)])
+        self.service = self.env["diamond.price.service"]
+        self.service.update_all_diamond_product_prices(exchange_rate=50.0)
+
+    def _count_writes(self, exchange_rate):
+        product_class = type(self.env["product.template"])
+        with mock.patch.object(
+            product_class, "write", autospec=True, side_effect=product_class.write,
+        ) as write:
+            result = self.service.update_all_diamond_product_prices(exchange_rate=exchange_rate)
+        return result, write.call_count
+
+    def test_unchanged_prices_are_not_written(self):
+        result, writes = self._count_writes(50.0)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["products_updated"], 0)
+        self.assertEqual(writes, 0)
+
+    def test_changed_prices_are_written_without_write_override(self):
+        discount = self.service.get_global_diamond_discount()
+        priced = self.env["product.template"].search([
+            ("jewellery_type", "=", "diamond_jewellery"),
+            ("diamond_usd_price", ">", 0),
+        ])
+        result, writes = self._count_writes(60.0)
+        self.assertEqual(result["products_updated"], len(priced))
+        self.assertEqual(writes, 0)
+        for product in self.products:
+            self.assertAlmostEqual(
+                product.list_price,
+                product.diamond_usd_price * 60.0 * (100 - discount) / 100.0,
+                places=2,
+            )
+
+    def test_copy_backend_applies_changed_prices(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.price_apply_backend", "copy")
+        self.products[0].with_context(skip_diamond_price_update=True).write(
+            {"list_price": 1.0})
+        result = self.service.update_all_diamond_product_prices(exchange_rate=50.0)
+        self.assertEqual(result["products_updated"], 1)
+        self.products.invalidate_recordset(["list_price"])
+        self.assertEqual(self.products[0].list_price, self.products[2].list_price)
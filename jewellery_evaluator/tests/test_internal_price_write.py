@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+
+class TestInternalPriceWrite(common.TransactionCase):
+    """Internal repricing writes prices without going through write()."""
+
+    def setUp(self):
+        super().setUp()
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.markup_jewellery_local", "37.5")
+        self.product_model = self.env["product.template"]
+        self.products = self.product_model.with_context(
+            skip_gold_price_update=True,
+        ).create([{
+            "name": f"Fast Path Ring {i}",
+            "jewellery_type": "gold_local",
+            "gold_purity": "21K",
+            "jewellery_weight_g": 5.0 + i,
+        } for i in range(3)])
+
+    def _patched_write(self):
+        product_class = type(self.product_model)
+        return mock.patch.object(
+            product_class, "write", autospec=True, side_effect=product_class.write)
+
+    def test_rejects_non_price_fields(self):
+        with self.assertRaises(ValueError):
+            self.product_model._write_jewellery_prices(
+                ["list_price", "name"], [(self.products[0].id, 1.0, "Renamed")])
+
+    def test_writes_prices_without_write_override(self):
+        self.products.product_variant_ids.mapped("lst_price")  # fill the cache
+        with self._patched_write() as write:
+            updated = self.product_model._write_jewellery_prices(
+                ["list_price", "gold_cost_price"],
+                [(product.id, 1000.0 + i, 900.0 + i) for i, product in enumerate(self.products)],
+            )
+        self.assertEqual(updated, len(self.products))
+        self.assertEqual(write.call_count, 0)
+        for i, product in enumerate(self.products):
+            self.assertEqual(product.list_price, 1000.0 + i)
+            self.assertEqual(product.gold_cost_price, 900.0 + i)
+            # dependents of list_price are recomputed from the new value
+            self.assertEqual(product.product_variant_ids.lst_price, 1000.0 + i)
+
+    def test_gold_run_uses_fast_path(self):
+        with self._patched_write() as write:
+            self.products.update_gold_prices(5000.0)
+        self.assertEqual(write.call_count, 0)
+        self.assertTrue(all(product.list_price > 0 for product in self.products))
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+from odoo import fields
+from odoo.exceptions import UserError, ValidationError
+
+from ..utils import compute_gold_product_price
+
+
+class TestJewelleryJob(common.TransactionCase):
+    """Background job queue: priorities, retries and deferred bulk repricing."""
+
+    def setUp(self):
+        super().setUp()
+        self.Job = self.env["jewellery.job"]
+        self.Job.search([]).unlink()
+
+    def _run(self):
+        count = self.Job._run_pending_jobs()
+        self.env.invalidate_all()
+        return count
+
+    def test_jobs_run_by_priority_then_age(self):
+        order = []
+        Product = type(self.env["product.template"])
+        with mock.patch.object(
+            Product, "_reprice_markup_segments", autospec=True,
+            side_effect=lambda self_, segments: order.append(self_.env.context["jewellery_job_id"]),
+        ):
+            late = self.Job.enqueue("Late", "product.template", "_reprice_markup_segments", [])
+            urgent = self.Job.enqueue("Urgent", "product.template",
+                                      "_reprice_markup_segments", [], priority=1)
+            self.assertEqual(self._run(), 2)
+        self.assertEqual(order, [urgent.id, late.id])
+        self.assertEqual((late.state, urgent.state), ("done", "done"))
+
+    def test_failing_job_is_retried_with_backoff_then_failed(self):
+        job = self.Job.enqueue("Broken", "product.template", "_reprice_markup_segments",
+                               ["no_such_segment"], max_retries=1)
+        self._run()
+        self.assertEqual((job.state, job.attempts), ("pending", 1))
+        self.assertTrue(job.eta)
+        self.assertIn("no_such_segment", job.error)
+        self.assertEqual(self._run(), 0, "A job waiting for its retry is not due yet")
+
+        job.eta = False
+        self._run()
+        self.assertEqual((job.state, job.attempts), ("failed", 2))
+
+    def test_job_queued_while_runner_runs_is_retried_after_first_delay(self):
+        Product = type(self.env["product.template"])
+        original = Product._reprice_markup_segments
+
+        def enqueue_then_run(self_, segments):
+            if not segments:
+                self.Job.enqueue("Queued mid-run", "product.template",
+                                 "_reprice_markup_segments", ["no_such_segment"],
+                                 max_retries=1)
+            return original(self_, segments)
+
+        self.Job.enqueue("First", "product.template", "_reprice_markup_segments", [])
+        before = fields.Datetime.now()
+        with mock.patch.object(Product, "_reprice_markup_segments", autospec=True,
+                               side_effect=enqueue_then_run):
+            self.assertEqual(self._run(), 2, "A job queued mid-run is claimed in the same run")
+        late = self.Job.search([("name", "=", "Queued mid-run")])
+        self.assertEqual((late.state, late.attempts), ("pending", 1))
+        self.assertAlmostEqual(
+            (late.eta - before).total_seconds(), self.Job.RETRY_DELAY_SECONDS, delta=5)
+
+        late.eta = False
+        self._run()
+        self.assertEqual((late.state, late.attempts), ("failed", 2),
+                         "max_retries=1 allows a single retry")
+
+    def test_retry_and_cancel_actions(self):
+        job = self.Job.enqueue("Noop", "product.template", "_reprice_markup_segments", [])
+        with self.assertRaises(UserError):
+            job.action_retry()
+        job.action_cancel()
+        self.assertEqual(self._run(), 0)
+        job.action_retry()
+        self.assertEqual(job.state, "pending")
+        self._run()
+        self.assertEqual(job.state, "done")
+
+    def test_only_entry_points_can_be_queued_or_run(self):
+        for model_name, method_name in (
+            ("product.template", "unlink"),
+            ("product.template", "_write_jewellery_prices"),
+            ("res.users", "_reprice_markup_segments"),
+        ):
+            with self.assertRaises(ValidationError):
+                self.Job.enqueue("Forbidden", model_name, method_name)
+        job = self.Job.enqueue("Noop", "product.template", "_reprice_markup_segments", [])
+        self.env.cr.execute(
+            "UPDATE jewellery_job SET model_name = 'res.users', method_name = 'unlink' "
+            "WHERE id = %s", (job.id,))
+        self._run()
+        self.assertEqual(job.state, "failed")
+        self.assertEqual(job.attempts, 1)
+
+    def test_bulk_write_reprices_in_chunked_jobs(self):
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        ICP.set_param("jewellery_evaluator.fallback_price", "100.0")
+        ICP.set_param("jewellery_evaluator.async_price_update_threshold", "2")
+        products = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create([{
+            "name": f"Bulk Ring {i}",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+            "list_price": 1.0,
+        } for i in range(3)])
+        gold_service = type(self.env["gold.price.service"])
+        with mock.patch.object(gold_service, "get_current_gold_price", return_value=100.0), \
+                mock.patch.object(type(products), "ASYNC_PRICE_UPDATE_CHUNK_SIZE", 2):
+            products.write({"jewellery_weight_g": 12.0})
+            jobs = self.Job.search([])
+            self.assertEqual(len(jobs), 2)
+            self.assertEqual(products.mapped("list_price"), [1.0] * 3)
+            self._run()
+        self.assertEqual(set(jobs.mapped("state")), {"done"})
+        _cost, sale, _min_sale = compute_gold_product_price(100.0, "21K", 12.0, 5.0)
+        self.assertEqual(products.mapped("list_price"), [sale] * 3)
+
+    def test_small_write_reprices_inline(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.markup_jewellery_local", "5.0")
+        product = self.env["product.template"].create({
+            "name": "Inline Ring",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+        })
+        self.assertFalse(self.Job.search([]))
+        self.assertGreater(product.list_price, 0.0)
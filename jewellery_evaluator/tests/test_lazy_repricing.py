@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import odoo.tests.common as common
+
+
+class TestLazyRepricing(common.TransactionCase):
+    """Price runs publish a version; products reprice on read or by the sweep."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        ICP.set_param("jewellery_evaluator.lazy_repricing", "True")
+        self.product = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create({
+            "name": "Lazy Gold Ring",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+            "list_price": 1.0,
+        })
+
+    def _stored_list_price(self):
+        self.env.flush_all()
+        self.env.cr.execute(
+            "SELECT list_price FROM product_template WHERE id = %s", (self.product.id,))
+        return self.env.cr.fetchone()[0]
+
+    def test_price_run_does_not_write_products(self):
+        result = self.env["gold.price.service"].update_all_gold_product_prices(
+            base_gold_price=100.0)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["products_updated"], 0)
+        self.assertEqual(self._stored_list_price(), 1.0)
+
+    def test_read_prices_stale_product_without_writing(self):
+        self.env["gold.price.service"].update_all_gold_product_prices(base_gold_price=100.0)
+        self.product.invalidate_recordset()
+        values = self.product.read(["list_price"])[0]
+        self.assertEqual(values["list_price"], 1050.0)
+        self.assertEqual(self._stored_list_price(), 1.0)
+        self.assertLess(
+            self.product.jewellery_price_version,
+            self.env["product.template"]._get_price_version(),
+        )
+
+    def test_read_only_prices_records_read(self):
+        other = self.product.copy({"name": "Unread Lazy Ring"})
+        self.env["gold.price.service"].update_all_gold_product_prices(base_gold_price=100.0)
+        self.env.invalidate_all()
+        stale = self.product._price_stale_jewellery_in_cache()
+        self.assertEqual(stale, self.product)
+        self.assertEqual(self.product.list_price, 1050.0)
+        self.assertEqual(other.list_price, 1.0)
+
+    def test_variant_search_read_reprices(self):
+        """POS loads product.product with search_read."""
+        self.env["gold.price.service"].update_all_gold_product_prices(base_gold_price=100.0)
+        variant = self.product.product_variant_id
+        variant.invalidate_recordset()
+        values = variant.read(["lst_price"])[0]
+        self.assertEqual(values["lst_price"], 1050.0)
+
+    def test_sweep_reprices_unread_products(self):
+        self.env["gold.price.service"].update_all_gold_product_prices(base_gold_price=100.0)
+        repriced = self.env["product.template"]._sweep_stale_jewellery_prices()
+        self.assertGreaterEqual(repriced, 1)
+        self.assertEqual(self._stored_list_price(), 1050.0)
+        self.assertEqual(self.env["product.template"]._sweep_stale_jewellery_prices(), 0)
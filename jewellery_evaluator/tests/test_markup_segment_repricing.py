@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+from ..utils import compute_gold_product_price
+
+
+class TestMarkupSegmentRepricing(common.TransactionCase):
+    """Saving settings reprices only the segments whose markup changed, in a job."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        ICP.set_param("jewellery_evaluator.markup_jewellery_foreign", "7.0")
+        ICP.set_param("jewellery_evaluator.applied_gold_price", "100.0")
+        self.env["jewellery.job"].search([]).unlink()
+        product_model = self.env["product.template"].with_context(
+            skip_gold_price_update=True, skip_silver_price_update=True)
+        self.local, self.bar_31g, self.bar_100g = product_model.create([{
+            "name": name,
+            "jewellery_type": jewellery_type,
+            "jewellery_weight_g": weight,
+            "gold_purity": "21K",
+            "list_price": 1.0,
+        } for name, jewellery_type, weight in (
+            ("Segment Ring", "gold_local", 10.0),
+            ("Segment Bar 31g", "gold_bars", 31.0),
+            ("Segment Bar 100g", "gold_bars", 100.0),
+        )])
+
+    def _save_settings(self, vals):
+        self.env["res.config.settings"].create(vals).execute()
+
+    def test_unrelated_change_queues_nothing(self):
+        self._save_settings({"global_diamond_discount": 30})
+        self.assertFalse(self.env["jewellery.job"].search([]))
+
+    def test_silver_price_change_triggers_the_silver_cron(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.silver_fallback_price", "50.0")
+        silver_cron = self.env.ref("jewellery_evaluator.ir_cron_update_silver_prices")
+        triggered = []
+        with mock.patch.object(type(self.env["ir.cron"]), "_trigger", autospec=True,
+                               side_effect=lambda cron, at=None: triggered.append(cron.id)):
+            self._save_settings({"silver_fallback_price": 50.0})
+            self.assertNotIn(silver_cron.id, triggered)
+            self._save_settings({"silver_fallback_price": 55.0})
+        self.assertIn(silver_cron.id, triggered)
+
+    def test_bar_tier_change_reprices_only_its_weight_band(self):
+        self._save_settings({"markup_bars_31g": 150.0})
+        job = self.env["jewellery.job"].search([])
+        self.assertEqual(len(job), 1)
+        self.assertEqual(job.state, "pending")
+        self.assertEqual(job.args, [["bars_31g"]])
+        self.assertEqual(self.bar_31g.list_price, 1.0, "Saving must not reprice inline")
+
+        self.env["jewellery.job"]._run_pending_jobs()
+        self.env.invalidate_all()
+        self.assertEqual(job.state, "done")
+        self.assertEqual((job.progress_done, job.progress_total), (1, 1))
+        _cost, sale, _min_sale = compute_gold_product_price(100.0, "21K", 31.0, 150.0)
+        self.assertEqual(self.bar_31g.list_price, sale)
+        self.assertEqual(self.bar_100g.list_price, 1.0)
+        self.assertEqual(self.local.list_price, 1.0)
+
+    def test_segment_domains(self):
+        products = self.env["product.template"]
+        segment_products = {
+            segment: products.search(products._get_markup_segment_domain(segment))
+            for segment in products._get_markup_snapshot()
+        }
+        self.assertIn(self.local, segment_products["gold_local"])
+        self.assertIn(self.bar_31g, segment_products["bars_31g"])
+        self.assertIn(self.bar_100g, segment_products["bars_100g"])
+        self.assertNotIn(self.bar_31g, segment_products["bars_20g"])
+        self.assertNotIn(self.bar_31g, segment_products["bars_50g"])
+
+    def test_failed_job_is_reported(self):
+        job = self.env["jewellery.job"].enqueue(
+            "Broken", "product.template", "_reprice_markup_segments", ["no_such_segment"],
+            max_retries=0)
+        self.env["jewellery.job"]._run_pending_jobs()
+        self.env.invalidate_all()
+        self.assertEqual(job.state, "failed")
+        self.assertTrue(job.error)
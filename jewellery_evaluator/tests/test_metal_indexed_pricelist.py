@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import odoo.tests.common as common
+
+
+class TestMetalIndexedPricelist(common.TransactionCase):
+    """Pricelist rules pricing gold/silver from the applied metal price at lookup time."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        ICP.set_param("jewellery_evaluator.applied_gold_price", "100.0")
+        self.product = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create({
+            "name": "Indexed Gold Ring",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+            "list_price": 1.0,
+        })
+        self.currency = self.env.company.currency_id
+        self.pricelist = self.env["product.pricelist"].create({
+            "name": "Metal Indexed",
+            "currency_id": self.currency.id,
+            "item_ids": [(0, 0, {
+                "applied_on": "3_global",
+                "compute_price": "metal_indexed",
+            })],
+        })
+
+    def test_price_follows_applied_gold_price(self):
+        variant = self.product.product_variant_id
+        self.assertEqual(self.pricelist._get_product_price(variant, 1.0), 1050.0)
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.applied_gold_price", "200.0")
+        self.assertEqual(self.pricelist._get_product_price(variant, 1.0), 2050.0)
+        self.assertEqual(self.product.list_price, 1.0)
+
+    def test_rule_markup_override(self):
+        self.pricelist.item_ids.write({
+            "metal_override_markup": True,
+            "metal_markup_per_gram": 10.0,
+        })
+        variant = self.product.product_variant_id
+        self.assertEqual(self.pricelist._get_product_price(variant, 1.0), 1100.0)
+
+    def test_other_products_use_sales_price(self):
+        service = self.env["product.product"].create({"name": "Cleaning", "list_price": 30.0})
+        self.assertEqual(self.pricelist._get_product_price(service, 1.0), 30.0)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import odoo.tests.common as common
+
+from ..metrics import REPRICING_SECONDS
+
+
+@common.tagged("post_install", "-at_install")
+class TestMetricsEndpoint(common.HttpCase):
+    """The metrics endpoint serves the worker's metrics in Prometheus text format."""
+
+    URL = "/jewellery_evaluator/metrics"
+
+    def setUp(self):
+        super().setUp()
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.metrics_token", "s3cret")
+
+    def _get(self, token="s3cret"):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return self.url_open(self.URL, headers=headers)
+
+    def test_rejects_missing_or_wrong_token(self):
+        self.assertEqual(self._get(token=None).status_code, 401)
+        self.assertEqual(self._get(token="wrong").status_code, 401)
+
+    def test_serves_prometheus_text(self):
+        self.env["diamond.price.service"].update_all_diamond_product_prices(exchange_rate=50.0)
+        self.assertGreater(REPRICING_SECONDS.count(metal="diamond", success="true"), 0)
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.text
+        self.assertIn("# TYPE jewellery_repricing_seconds histogram", body)
+        self.assertIn('jewellery_repricing_seconds_count{pid="', body)
+        self.assertIn("# TYPE jewellery_pos_order_validation_seconds histogram", body)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+from ..models import silver_price_service
+
+
+class TestStoredPriceCompute(common.TransactionCase):
+    """Stored cost/min-sale computes read the applied price, never a live source."""
+
+    def setUp(self):
+        super().setUp()
+        self.ICP = self.env["ir.config_parameter"].sudo()
+        self.ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        self.ICP.set_param("jewellery_evaluator.silver_markup_per_gram", "2.0")
+        self.product_model = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+            skip_silver_price_update=True,
+        )
+
+    def test_gold_compute_uses_applied_price(self):
+        self.ICP.set_param("jewellery_evaluator.applied_gold_price", "100.0")
+        gold_service = self.env["gold.price.service"]
+        with mock.patch.object(
+            type(gold_service), "_fetch_gold_price_from_api",
+            side_effect=AssertionError("compute must not fetch"),
+        ):
+            product = self.product_model.create({
+                "name": "Compute Gold Ring",
+                "jewellery_type": "gold_local",
+                "jewellery_weight_g": 10.0,
+                "gold_purity": "21K",
+            })
+            self.assertEqual(product.gold_cost_price, 1000.0)
+            product.jewellery_weight_g = 20.0
+            self.assertEqual(product.gold_cost_price, 2000.0)
+
+    def test_gold_compute_uses_fallback_before_first_run(self):
+        self.ICP.set_param("jewellery_evaluator.applied_gold_price", "0.0")
+        self.ICP.set_param("jewellery_evaluator.fallback_price", "80.0")
+        self.assertEqual(self.env["gold.price.service"].get_applied_gold_price(), 80.0)
+
+    def test_silver_compute_does_not_launch_scraper(self):
+        self.ICP.set_param("jewellery_evaluator.applied_silver_price", "50.0")
+        with mock.patch.object(
+            silver_price_service, "_fetch_silver_price_selenium",
+            side_effect=AssertionError("compute must not scrape"),
+        ):
+            product = self.product_model.create({
+                "name": "Compute Silver Ring",
+                "jewellery_type": "silver",
+                "jewellery_weight_g": 10.0,
+                "silver_purity": "999.9",
+            })
+            self.assertEqual(product.silver_cost_price, 500.0)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import json
+
+import odoo.tests.common as common
+
+
+@common.tagged("post_install", "-at_install")
+class TestPriceIngestController(common.HttpCase):
+    """Authenticated push endpoint records ticks and triggers repricing."""
+
+    URL = "/jewellery_evaluator/prices"
+
+    def setUp(self):
+        super().setUp()
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.price_ingest_token", "s3cret"
+        )
+
+    def _post(self, payload, token="s3cret"):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return self.url_open(self.URL, data=json.dumps(payload), headers=headers)
+
+    def test_rejects_missing_or_wrong_token(self):
+        self.assertEqual(self._post({"gold": 5415.0}, token=None).status_code, 401)
+        self.assertEqual(self._post({"gold": 5415.0}, token="wrong").status_code, 401)
+
+    def test_rejects_invalid_price(self):
+        self.assertEqual(self._post({"gold": -1}).status_code, 400)
+        self.assertEqual(self._post({"source": "feed"}).status_code, 400)
+
+    def test_reserved_source_is_only_a_label(self):
+        response = self._post({"gold": 5415.0, "source": "coalesced"})
+        self.assertEqual(response.status_code, 200)
+        tick = self.env["jewellery.price.tick"].browse(response.json()["ticks"])
+        self.assertEqual(tick.source, "push")
+        self.assertEqual(tick.label, "coalesced")
+
+    def test_rejects_non_finite_price(self):
+        Tick = self.env["jewellery.price.tick"]
+        ticks_before = Tick.search_count([])
+        for price in (float("nan"), float("inf"), "1e309"):
+            self.assertEqual(self._post({"gold": price}).status_code, 400)
+        self.assertEqual(Tick.search_count([]), ticks_before)
+
+    def test_push_records_tick_and_triggers_cron(self):
+        cron = self.env.ref("jewellery_evaluator.ir_cron_apply_price_ticks")
+        response = self._post({"gold": 5415.0, "silver": 53.2, "source": "feed"})
+        self.assertEqual(response.status_code, 200)
+        ticks = self.env["jewellery.price.tick"].browse(response.json()["ticks"])
+        self.assertEqual(set(ticks.mapped("metal")), {"gold", "silver"})
+        self.assertEqual(set(ticks.mapped("source")), {"push"})
+        self.assertEqual(set(ticks.mapped("label")), {"feed"})
+        self.assertFalse(any(ticks.mapped("applied")))
+        self.assertTrue(
+            self.env["ir.cron.trigger"].search_count([("cron_id", "=", cron.id)])
+        )
+        self.assertEqual(
+            self.env["ir.config_parameter"].sudo().get_param(
+                "jewellery_evaluator.fallback_price"),
+            "5415.0",
+        )
+
+
+class TestApplyPriceTicks(common.TransactionCase):
+    """The repricing stage applies only the latest pushed tick per metal."""
+
+    def test_apply_latest_gold_tick(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.markup_jewellery_local", "5.0"
+        )
+        product = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create({
+            "name": "Pushed Gold Ring",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+        })
+        Tick = self.env["jewellery.price.tick"]
+        Tick.record_ticks({"gold": 90.0}, source="feed")
+        Tick.record_ticks({"gold": 100.0}, source="feed")
+
+        result = Tick.apply_pending_ticks()
+
+        self.assertTrue(result["gold"]["success"])
+        self.assertEqual(result["gold"]["base_price"], 100.0)
+        self.assertEqual(product.list_price, 1050.0)
+        self.assertFalse(Tick.search_count([("applied", "=", False)]))
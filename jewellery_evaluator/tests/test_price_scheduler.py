@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+from ..models import gold_price_service, price_scheduler
+
+
+class TestPriceScheduler(common.TransactionCase):
+    """Concurrent multi-metal fetch and per-metal repricing."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.gold_api_endpoint", "https://example.com/gold")
+        ICP.set_param("jewellery_evaluator.gold_21k_regex_formula", r"(\d+)")
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        self.scheduler = self.env["jewellery.price.scheduler"]
+
+    def _run(self, gold=100.0, silver=50.0):
+        with mock.patch.object(
+            gold_price_service, "fetch_gold_price", return_value=gold,
+        ), mock.patch.object(
+            price_scheduler, "_fetch_silver_price_selenium", return_value=silver,
+        ):
+            return self.scheduler.run_price_updates()
+
+    def test_cron_record_exists(self):
+        """Orchestrator cron is installed (inactive by default)."""
+        cron = self.env.ref(
+            "jewellery_evaluator.ir_cron_update_all_prices",
+            raise_if_not_found=False,
+        )
+        self.assertTrue(cron)
+        self.assertEqual(cron.code, "model.run_price_updates()")
+
+    def test_reprices_changed_metals(self):
+        """Changed gold price reprices gold products and records the applied price."""
+        product = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create({
+            "name": "Scheduler Gold Ring",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+        })
+        result = self._run(gold=100.0)
+        self.assertTrue(result["gold"]["success"])
+        self.assertEqual(result["fetch"]["gold"]["value"], 100.0)
+        self.assertEqual(product.list_price, 1050.0)
+        self.assertEqual(
+            self.env["ir.config_parameter"].sudo().get_param(
+                "jewellery_evaluator.applied_gold_price"),
+            "100.0",
+        )
+
+    def test_unchanged_price_skips_repricing(self):
+        """A second tick with the same price does not reprice again."""
+        self._run(gold=100.0, silver=50.0)
+        result = self._run(gold=100.0, silver=50.0)
+        self.assertEqual(result["gold"]["message"], "Pricing inputs unchanged")
+        self.assertEqual(result["silver"]["products_updated"], 0)
+
+    def test_failed_gold_source_does_not_block_silver(self):
+        """A failing gold fetch leaves silver repricing unaffected."""
+        with mock.patch.object(
+            gold_price_service, "fetch_gold_price", side_effect=ValueError("boom"),
+        ), mock.patch.object(
+            price_scheduler, "_fetch_silver_price_selenium", return_value=60.0,
+        ):
+            result = self.scheduler.run_price_updates()
+        self.assertFalse(result["gold"]["success"])
+        self.assertIn("boom", result["gold"]["error"])
+        self.assertTrue(result["silver"]["success"])
+        self.assertEqual(result["silver"]["base_price"], 60.0)
+
+    def test_markup_change_reprices_with_same_price(self):
+        """A changed markup setting counts as a pricing input change."""
+        self._run(gold=100.0)
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.markup_jewellery_local", "6.0")
+        result = self._run(gold=100.0)
+        self.assertNotEqual(result["gold"]["message"], "Pricing inputs unchanged")
+
+    def test_on_change_mode_queues_repricing(self):
+        """Event-driven mode records a tick instead of repricing inline."""
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.repricing_mode", "on_change")
+        product = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create({
+            "name": "Queued Gold Ring",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0,
+            "gold_purity": "21K",
+        })
+        result = self._run(gold=100.0)
+        self.assertTrue(result["gold"]["queued"])
+        self.assertNotEqual(product.list_price, 1050.0)
+        ticks = self.env["jewellery.price.tick"].search([
+            ("metal", "=", "gold"), ("applied", "=", False),
+        ])
+        self.assertEqual(ticks[:1].source, "poll")
+
+        self.env["jewellery.price.tick"].apply_pending_ticks()
+        self.assertEqual(product.list_price, 1050.0)
+        result = self._run(gold=100.0)
+        self.assertFalse(result["gold"]["queued"])
+
+    def test_busy_run_lock_hands_value_over(self):
+        """A run finding the metal's run lock taken records its price and exits."""
+        reprice = mock.Mock()
+        with mock.patch.object(type(self.scheduler), "_try_run_lock", return_value=False):
+            result = self.scheduler._run_coalesced("gold", 101.0, reprice)
+        reprice.assert_not_called()
+        self.assertTrue(result["coalesced"])
+        tick = self.env["jewellery.price.tick"].search(
+            [("source", "=", "coalesced"), ("metal", "=", "gold")])
+        self.assertEqual(tick.price, 101.0)
+        self.assertFalse(tick.applied)
+
+    def test_running_job_makes_one_more_pass_with_latest_value(self):
+        """Values recorded during a run are applied by one extra pass of that run."""
+        calls = []
+
+        def reprice(value):
+            calls.append(value)
+            if len(calls) == 1:
+                # Two blocked runs arrive while the first pass is running
+                self.scheduler._record_coalesced_tick("gold", 102.0)
+                self.scheduler._record_coalesced_tick("gold", 103.0)
+            return {"success": True, "products_updated": 0, "base_price": value}
+
+        result = self.scheduler._run_coalesced("gold", 101.0, reprice)
+        self.assertEqual(calls, [101.0, 103.0])
+        self.assertEqual(result["base_price"], 103.0)
+        pending = [("source", "=", "coalesced"), ("applied", "=", False)]
+        # Marked applied only once the run's transaction commits
+        self.assertEqual(len(self.env["jewellery.price.tick"].search(pending)), 2)
+        self.env.cr.postcommit.run()
+        self.assertFalse(self.env["jewellery.price.tick"].search(pending))
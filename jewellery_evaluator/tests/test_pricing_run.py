@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+
+class TestPricingRun(common.TransactionCase):
+    """Price runs report per-stage measurements and are stored as pricing runs."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "37.5")
+        ICP.set_param("jewellery_evaluator.silver_markup_per_gram", "3.35")
+        self.product_model = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+            skip_silver_price_update=True,
+        )
+        self.product_model.create([{
+            "name": "Run Stats Ring",
+            "jewellery_type": "gold_local",
+            "gold_purity": "21K",
+            "jewellery_weight_g": 7.5,
+        }, {
+            "name": "Run Stats Chain",
+            "jewellery_type": "silver",
+            "silver_purity": "999.0",
+            "jewellery_weight_g": 12.0,
+        }])
+        self.runs = self.env["jewellery.pricing.run"]
+
+    def _last_run(self, metal):
+        return self.runs.search([("metal", "=", metal)], limit=1)
+
+    def test_gold_run_reports_stages_and_is_recorded(self):
+        service = self.env["gold.price.service"]
+        with mock.patch.object(
+            type(service), "_fetch_gold_price_from_api", autospec=True,
+            side_effect=lambda svc: svc._set_fetched_gold_price(5000.0) or 5000.0,
+        ):
+            result = service.update_all_gold_product_prices()
+        self.assertTrue(result["success"])
+        stats = result["stats"]
+        self.assertEqual(
+            set(stats["timings"]), {"fetch", "parse", "search", "compute", "write", "flush"})
+        self.assertGreater(stats["query_count"], 0)
+        self.assertGreater(stats["queries"]["write"], 0)
+        self.assertFalse(stats["fallback_used"])
+        self.assertLess(stats["price_age"], 60)
+        self.assertGreaterEqual(
+            stats["duration"], sum(stats["timings"].values()) - 1e-6)
+
+        run = self._last_run("gold")
+        self.assertTrue(run.success)
+        self.assertEqual(run.base_price, 5000.0)
+        self.assertEqual(run.products_updated, result["products_updated"])
+        self.assertEqual(run.query_count, stats["query_count"])
+        self.assertEqual(run.stats["timings"], stats["timings"])
+
+    def test_silver_fallback_is_reported(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.silver_fallback_price", "50.0")
+        service = self.env["silver.price.service"]
+        with mock.patch.object(type(service), "_fetch_silver_price_from_web", return_value=0.0):
+            result = service.update_all_silver_product_prices()
+        self.assertTrue(result["success"])
+        self.assertTrue(result["stats"]["fallback_used"])
+        self.assertTrue(self._last_run("silver").fallback_used)
+
+    def test_failed_run_is_recorded(self):
+        service = self.env["gold.price.service"]
+        with mock.patch.object(
+            type(service), "_fetch_gold_price_from_api", side_effect=ValueError("offline"),
+        ):
+            result = service.update_all_gold_product_prices()
+        self.assertFalse(result["success"])
+        run = self._last_run("gold")
+        self.assertFalse(run.success)
+        self.assertIn("offline", run.message)
+
+    def test_diamond_run_is_recorded(self):
+        result = self.env["diamond.price.service"].update_all_diamond_product_prices(
+            exchange_rate=50.0)
+        self.assertIn("stats", result)
+        self.assertEqual(self._last_run("diamond").base_price, 50.0)
+
+    def test_polls_without_repricing_are_not_recorded(self):
+        service = self.env["diamond.price.service"]
+        service.update_all_diamond_product_prices(exchange_rate=50.0)
+        count = self.runs.search_count([("metal", "=", "diamond")])
+        with mock.patch.object(type(service), "get_usd_to_egp_rate", return_value=50.0):
+            result = service.update_all_diamond_product_prices()
+        self.assertTrue(result["unchanged"])
+        self.assertIn("stats", result)
+        self.assertEqual(self.runs.search_count([("metal", "=", "diamond")]), count)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import odoo.tests.common as common
+
+
+class TestProfiling(common.TransactionCase):
+    """Sampled calls are profiled and stored as attachments when profiling is on."""
+
+    def setUp(self):
+        super().setUp()
+        self.ICP = self.env["ir.config_parameter"].sudo()
+        self.ICP.set_param("jewellery_evaluator.markup_jewellery_local", "37.5")
+        self.profiler = self.env["jewellery.profiler"]
+        self.attachments = self.env["ir.attachment"].sudo()
+
+    def _profiles(self, label):
+        return self.attachments.search([
+            ("name", "=like", f"jewellery_profile_{label}_%"),
+            ("res_model", "=", False),
+        ])
+
+    def _enable(self, rate="1"):
+        self.ICP.set_param("jewellery_evaluator.profiling_mode", "cprofile")
+        self.ICP.set_param("jewellery_evaluator.profiling_sample_rate", rate)
+        self.ICP.set_param("jewellery_evaluator.profiling_top_n", "10")
+
+    def test_off_by_default(self):
+        result = self.profiler._run_profiled("unit", lambda value: value * 2, 21)
+        self.assertEqual(result, 42)
+        self.assertFalse(self._profiles("unit"))
+
+    def test_sampled_call_is_stored(self):
+        self._enable()
+        result = self.profiler._run_profiled("unit", lambda value: value * 2, 21)
+        self.assertEqual(result, 42)
+        profile = self._profiles("unit")
+        self.assertEqual(len(profile), 1)
+        self.assertTrue(profile.raw)
+        self.assertTrue(profile.name.endswith(".prof"))
+        self.assertIn("unit:", profile.description)
+
+    def test_zero_rate_profiles_nothing(self):
+        self._enable(rate="0")
+        self.profiler._run_profiled("unit", lambda: None)
+        self.assertFalse(self._profiles("unit"))
+
+    def test_failing_call_is_still_stored(self):
+        self._enable()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            self.profiler._run_profiled("unit", fail)
+        self.assertEqual(len(self._profiles("unit")), 1)
+
+    def test_product_write_is_profiled_once(self):
+        product = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+            skip_silver_price_update=True,
+        ).create({
+            "name": "Profiled Ring",
+            "jewellery_type": "gold_local",
+            "gold_purity": "21K",
+            "jewellery_weight_g": 5.0,
+        })
+        self._enable()
+        product.write({"name": "Profiled Ring 2"})
+        # Writes nested in the profiled write are not profiled again
+        self.assertEqual(len(self._profiles("product_template_write")), 1)
+        self.assertEqual(product.name, "Profiled Ring 2")
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import unittest.mock as mock
+
+import odoo.tests.common as common
+
+from ..utils import compute_gold_product_price
+
+
+class TestSkipLockedRepricing(common.TransactionCase):
+    """Lock-friendly price runs reprice what they can lock and queue the rest."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "5.0")
+        ICP.set_param("jewellery_evaluator.skip_locked_repricing", "True")
+        self.products = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+        ).create([{
+            "name": f"Locked Gold Ring {i}",
+            "jewellery_type": "gold_local",
+            "jewellery_weight_g": 10.0 + i,
+            "gold_purity": "21K",
+        } for i in range(3)])
+
+    def test_price_run_reprices_unlocked_products(self):
+        result = self.env["gold.price.service"].update_all_gold_product_prices(
+            base_gold_price=100.0)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["skipped_locked"], 0)
+        for product in self.products:
+            cost, sale, _min_sale = compute_gold_product_price(
+                100.0, "21K", product.jewellery_weight_g, 5.0)
+            self.assertEqual((product.gold_cost_price, product.list_price), (cost, sale))
+
+    def test_skipped_products_are_repriced_by_follow_up_job(self):
+        product_model = self.env["product.template"]
+        Job = self.env["jewellery.job"]
+        before = Job.search([])
+        product_model._queue_skipped_repricing("gold", self.products[:2].ids)
+        job = Job.search([]) - before
+        self.assertEqual(len(job), 1)
+        self.assertEqual((job.model_name, job.method_name), (
+            "product.template", "_retry_skipped_repricing"))
+        self.assertEqual(job.args, ["gold", sorted(self.products[:2].ids)])
+        self.assertTrue(job.eta)
+        with mock.patch.object(
+            type(self.env["gold.price.service"]), "get_applied_gold_price",
+            return_value=120.0,
+        ):
+            result = product_model._retry_skipped_repricing(*job.args)
+        self.assertEqual(result, {"products_updated": 2, "skipped": 0})
+        for product, repriced in zip(self.products, (True, True, False), strict=True):
+            cost, _sale, _min_sale = compute_gold_product_price(
+                120.0, "21K", product.jewellery_weight_g, 5.0)
+            self.assertEqual(product.gold_cost_price == cost, repriced, product.name)
+
+    def test_rows_locked_by_the_run_itself_are_not_skipped(self):
+        product_model = self.env["product.template"]
+        self.products.write({"jewellery_weight_g": 20.0})
+        self.env.flush_all()
+        updated, skipped = product_model._reprice_skip_locked("gold", 100.0, self.products.ids)
+        self.assertEqual((updated, skipped), (3, []))
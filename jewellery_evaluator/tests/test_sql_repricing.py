@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import random
+
+import odoo.tests.common as common
+
+from ..utils import (
+    compute_gold_product_price,
+    compute_silver_product_price,
+    get_markup_per_gram,
+)
+
+
+class TestSqlRepricing(common.TransactionCase):
+    """SQL whole-catalog repricing gives the same prices as the Python implementation."""
+
+    def setUp(self):
+        super().setUp()
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("jewellery_evaluator.markup_jewellery_local", "37.5")
+        ICP.set_param("jewellery_evaluator.markup_jewellery_foreign", "52.25")
+        ICP.set_param("jewellery_evaluator.markup_bars_31g", "0")  # default tier markup
+        ICP.set_param("jewellery_evaluator.silver_markup_per_gram", "3.35")
+        self.product_model = self.env["product.template"].with_context(
+            skip_gold_price_update=True,
+            skip_silver_price_update=True,
+        )
+        rng = random.Random(17)
+        vals_list = []
+        for i in range(300):
+            jewellery_type = rng.choice(["gold_local", "gold_foreign", "gold_bars", "silver"])
+            vals = {
+                "name": f"SQL Parity {i}",
+                "jewellery_type": jewellery_type,
+                "jewellery_weight_g": rng.choice([
+                    round(rng.uniform(0.01, 60), 2), round(rng.uniform(60, 1500), 2),
+                    1.75, 3.75, 25.5, 40.5, 375.0, 999.99, 1000.0,
+                ]),
+            }
+            if jewellery_type == "silver":
+                vals["silver_purity"] = rng.choice(["999.0", "999.9"])
+            else:
+                vals["gold_purity"] = rng.choice(["24K", "21K", "18K"])
+            vals_list.append(vals)
+        self.products = self.product_model.create(vals_list)
+
+    def test_gold_parity_with_python(self):
+        base = 5415.37
+        gold = self.products.filtered("is_gold_product")
+        updated = self.product_model._sql_update_gold_prices(base)
+        self.assertEqual(updated, len(gold))
+        for product in gold:
+            gold_type = product._map_jewellery_type_to_gold_type(product.jewellery_type)
+            markup = get_markup_per_gram(
+                self.env, gold_type,
+                weight_g=product.jewellery_weight_g if gold_type == "bars" else None)
+            cost, sale, min_sale = compute_gold_product_price(
+                base, product.gold_purity, product.jewellery_weight_g, markup)
+            self.assertEqual(
+                (product.gold_cost_price, product.list_price, product.gold_min_sale_price),
+                (cost, sale, min_sale),
+                product.name,
+            )
+
+    def test_silver_parity_with_python(self):
+        base = 53.27
+        silver = self.products.filtered("is_silver_product")
+        updated = self.product_model._sql_update_silver_prices(base)
+        self.assertEqual(updated, len(silver))
+        for product in silver:
+            cost, sale, min_sale = compute_silver_product_price(
+                base, product.jewellery_weight_g, 3.35)
+            self.assertEqual(
+                (product.silver_cost_price, product.list_price, product.silver_min_sale_price),
+                (cost, sale, min_sale),
+                product.name,
+            )
+
+    def test_gold_cron_uses_sql_engine(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.repricing_engine", "sql")
+        result = self.env["gold.price.service"].update_all_gold_product_prices(
+            base_gold_price=100.0)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["products_updated"], len(self.products.filtered("is_gold_product")))
+
+    def test_stream_gold_parity_with_python(self):
+        base = 5415.37
+        gold = self.products.filtered("is_gold_product")
+        updated = self.product_model._stream_update_gold_prices(base)
+        self.assertEqual(updated, len(gold))
+        for product in gold:
+            gold_type = product._map_jewellery_type_to_gold_type(product.jewellery_type)
+            markup = get_markup_per_gram(
+                self.env, gold_type,
+                weight_g=product.jewellery_weight_g if gold_type == "bars" else None)
+            self.assertEqual(
+                (product.gold_cost_price, product.list_price, product.gold_min_sale_price),
+                compute_gold_product_price(
+                    base, product.gold_purity, product.jewellery_weight_g, markup),
+                product.name,
+            )
+
+    def test_stream_silver_parity_with_python(self):
+        base = 53.27
+        silver = self.products.filtered("is_silver_product")
+        updated = self.product_model._stream_update_silver_prices(base)
+        self.assertEqual(updated, len(silver))
+        for product in silver:
+            self.assertEqual(
+                (product.silver_cost_price, product.list_price, product.silver_min_sale_price),
+                compute_silver_product_price(base, product.jewellery_weight_g, 3.35),
+                product.name,
+            )
+
+    def test_silver_cron_uses_stream_engine(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.repricing_engine", "stream")
+        result = self.env["silver.price.service"].update_all_silver_product_prices(
+            base_silver=53.27)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["products_updated"],
+                         len(self.products.filtered("is_silver_product")))
+
+    def test_copy_apply_gives_same_prices_as_orm_writes(self):
+        base = 5415.37
+        gold = self.products.filtered("is_gold_product")
+        gold.update_gold_prices(base)
+        expected = {p.id: (p.list_price, p.gold_cost_price, p.gold_min_sale_price) for p in gold}
+        gold.write({"list_price": 0.0, "gold_cost_price": 0.0, "gold_min_sale_price": 0.0})
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.price_apply_backend", "copy")
+        gold.update_gold_prices(base)
+        for product in gold:
+            self.assertEqual(
+                (product.list_price, product.gold_cost_price, product.gold_min_sale_price),
+                expected[product.id],
+                product.name,
+            )
+
+    def test_copy_apply_silver_and_stream(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "jewellery_evaluator.price_apply_backend", "copy")
+        silver = self.products.filtered("is_silver_product")
+        silver.update_silver_prices(53.27)
+        for product in silver:
+            self.assertEqual(
+                (product.silver_cost_price, product.list_price, product.silver_min_sale_price),
+                compute_silver_product_price(53.27, product.jewellery_weight_g, 3.35),
+                product.name,
+            )
+        updated = self.product_model._stream_update_gold_prices(5415.37)
+        self.assertEqual(updated, len(self.products.filtered("is_gold_product")))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+import datetime
+import unittest.mock as mock
+
+import odoo.tests.common as common
+from odoo.exceptions import UserError
+
+from ..models.diamond_price_service import USD_EGP_RATES_CHANGED
+
+RATE_FILE = """date,usd_egp
+2026-03-01,50.0
+2026-03-05,52.0
+"""
+
+
+class TestUsdEgpRates(common.TransactionCase):
+    """USD/EGP rates come from res.currency.rate, imported from rate files."""
+
+    def setUp(self):
+        super().setUp()
+        self.service = self.env["diamond.price.service"]
+        self.usd = self.env.ref("base.USD")
+        self.egp = self.env.ref("base.EGP")
+        if self.env.company.currency_id not in self.usd | self.egp:
+            self.skipTest("USD/EGP rates are imported for USD or EGP companies only")
+        self.env["res.currency.rate"].search([
+            ("currency_id", "in", (self.usd.id, self.egp.id)),
+        ]).unlink()
+
+    def test_import_and_history_lookup(self):
+        self.assertEqual(self.service.import_usd_egp_rates(RATE_FILE), 2)
+        rate_at = self.service.get_usd_to_egp_rate
+        self.assertAlmostEqual(rate_at(datetime.date(2026, 3, 1)), 50.0)
+        self.assertAlmostEqual(rate_at(datetime.date(2026, 3, 4)), 50.0)
+        self.assertAlmostEqual(rate_at(datetime.datetime(2026, 3, 5, 12, 0)), 52.0)
+        self.assertAlmostEqual(rate_at(datetime.date(2030, 1, 1)), 52.0)
+
+    def test_import_updates_existing_dates_and_refreshes_cache(self):
+        self.service.import_usd_egp_rates(RATE_FILE)
+        self.assertAlmostEqual(self.service.get_usd_to_egp_rate(datetime.date(2026, 3, 5)), 52.0)
+        self.service.import_usd_egp_rates("2026-03-05,53.5\n")
+        self.assertEqual(self.env["res.currency.rate"].search_count([
+            ("currency_id", "in", (self.usd.id, self.egp.id)),
+            ("company_id", "=", self.env.company.id),
+        ]), 2)
+        self.assertAlmostEqual(self.service.get_usd_to_egp_rate(datetime.date(2026, 3, 5)), 53.5)
+
+    def test_invalid_file_and_missing_rates(self):
+        with self.assertRaises(UserError):
+            self.service.import_usd_egp_rates("2026-03-01,-1\n")
+        self.assertEqual(self.service.get_usd_to_egp_rate(), 50.0)
+
+    def test_diamond_run_skipped_when_rate_unchanged(self):
+        self.service.import_usd_egp_rates(RATE_FILE)
+        first = self.service.update_all_diamond_product_prices()
+        self.assertTrue(first["success"])
+        with mock.patch.object(
+            type(self.service), "_reprice_all_diamond_products",
+        ) as reprice:
+            second = self.service.update_all_diamond_product_prices()
+        reprice.assert_not_called()
+        self.assertEqual(second["message"], "USD/EGP rate unchanged")
+
+    def test_product_writes_read_rate_once(self):
+        products = self.env["product.template"].create([{
+            "name": f"Rate Ring {i}",
+            "jewellery_type": "diamond_jewellery",
+        } for i in range(3)])
+        with mock.patch.object(
+            type(self.service), "get_usd_to_egp_rate", return_value=50.0,
+        ) as get_rate:
+            products.write({"diamond_usd_price": 10.0})
+        self.assertEqual(get_rate.call_count, 1)
+
+    def test_cache_follows_usd_egp_rates_only(self):
+        self.service.import_usd_egp_rates(RATE_FILE)
+        data = self.env.cr.precommit.data
+        data.pop(USD_EGP_RATES_CHANGED, None)
+        version = self.service._get_usd_egp_rates_version()
+        eur = self.env.ref("base.EUR")
+        with mock.patch.object(type(self.env.registry), "clear_cache") as clear_cache:
+            self.env["res.currency.rate"].create({
+                "name": "2026-03-02", "rate": 1.1, "currency_id": eur.id,
+            })
+            self.env.flush_all()
+            self.assertNotIn(USD_EGP_RATES_CHANGED, data)
+            self.assertEqual(self.service._get_usd_egp_rates_version(), version)
+            self.service.import_usd_egp_rates("2026-03-05,53.5\n")
+            self.assertTrue(data.get(USD_EGP_RATES_CHANGED))
+            self.assertAlmostEqual(
+                self.service.get_usd_to_egp_rate(datetime.date(2026, 3, 5)), 53.5)
+        clear_cache.assert_not_called()
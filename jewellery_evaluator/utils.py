@@ -3,6 +3,8 @@
 # Author: Mohamed A. Abdallah
 # Website: https://www.revenax.com
 
+import bisect
+import hashlib
 import re
 from decimal import ROUND_HALF_UP, Decimal
 
@@ -14,6 +16,18 @@ BAR_TIER_PARAM_SUFFIXES = [
 # Fallback EGP/gram when config param is missing or zero (same order as tiers above).
 BAR_TIER_DEFAULT_MARKUP = [200.0, 200.0, 125.0,
                            120.0, 120.0, 115.0, 100.0, 100.0, 80.0, 80.0, 80.0]
+# Purity factors relative to 21K, which is what the API returns.
+# 24K = 8/7 of 21K; 18K = 7/8 of 21K (Decimal context precision, 28 digits).
+GOLD_PURITY_FACTORS = {
+    '24K': Decimal('8') / Decimal('7'),
+    '21K': Decimal('1.0'),
+    '18K': Decimal('7') / Decimal('8'),
+}
+# Every system parameter that changes gold product prices besides the base price.
+GOLD_MARKUP_PARAM_KEYS = [
+    'jewellery_evaluator.markup_jewellery_local',
+    'jewellery_evaluator.markup_jewellery_foreign',
+] + [f'jewellery_evaluator.markup_bars_{suffix}' for suffix in BAR_TIER_PARAM_SUFFIXES]
 
 
 def _get_markup_bars_by_weight(env, weight_g: float) -> float:
@@ -52,6 +66,76 @@ def _get_markup_bars_by_weight(env, weight_g: float) -> float:
     return val if val > 0 else BAR_TIER_DEFAULT_MARKUP[idx]
 
 
+def bar_tier_upper_bounds() -> list[float]:
+    """
+    Upper weight bound (inclusive) of each bar tier below 500g, matching the
+    closest-neighbor lookup of _get_markup_bars_by_weight (ties go to the lower
+    tier). Weights above the last bound and below 1000g use the 500g tier;
+    1000g and above use the 1000g tier.
+
+    Returns:
+        list: Midpoints between consecutive tiers, one per tier from 1g to 250g.
+    """
+    below_1000 = BAR_TIER_WEIGHTS[:-1]
+    return [(low + high) / 2 for low, high in zip(below_1000, below_1000[1:], strict=False)]
+
+
+def resolve_bar_tier_markup(weight_g: float, tier_markups: list[float]) -> float:
+    """
+    Bars markup per gram from already read tier markups (see get_bar_tier_markups).
+    Same result as _get_markup_bars_by_weight without a config lookup per product.
+
+    Args:
+        weight_g: Bar weight in grams
+        tier_markups: Markup per gram of every tier, in BAR_TIER_WEIGHTS order
+
+    Returns:
+        float: Markup per gram, 0.0 for a non-positive weight
+    """
+    if weight_g <= 0:
+        return 0.0
+    if weight_g >= 1000:
+        return tier_markups[-1]
+    return tier_markups[bisect.bisect_left(bar_tier_upper_bounds(), weight_g)]
+
+
+def bar_tier_weight_conditions(index: int) -> list[tuple[str, float]]:
+    """
+    Weight conditions selecting the bars priced by one tier, i.e. the weights
+    resolve_bar_tier_markup maps to that tier.
+
+    Args:
+        index: Tier index in BAR_TIER_WEIGHTS order
+
+    Returns:
+        list: (operator, weight_g) conditions, all of which must hold
+    """
+    bounds = bar_tier_upper_bounds()
+    if index == len(BAR_TIER_WEIGHTS) - 1:
+        return [('>=', 1000.0)]
+    low = bounds[index - 1] if index > 0 else 0.0
+    if index == len(bounds):
+        return [('>', low), ('<', 1000.0)]
+    return [('>', low), ('<=', bounds[index])]
+
+
+def get_bar_tier_markups(env) -> list[float]:
+    """
+    Read the markup per gram of every bar tier, in BAR_TIER_WEIGHTS order.
+    Uses BAR_TIER_DEFAULT_MARKUP when a config param is missing or zero.
+    """
+    ICP = env['ir.config_parameter'].sudo()
+    markups = []
+    for suffix, default in zip(BAR_TIER_PARAM_SUFFIXES, BAR_TIER_DEFAULT_MARKUP, strict=True):
+        raw = ICP.get_param(f'jewellery_evaluator.markup_bars_{suffix}', '0.0')
+        try:
+            val = float(raw)
+        except (TypeError, ValueError):
+            val = 0.0
+        markups.append(val if val > 0 else default)
+    return markups
+
+
 def get_silver_markup_per_gram(env) -> float:
     """Read silver markup per gram from system parameters."""
     raw = env['ir.config_parameter'].sudo().get_param(
@@ -154,6 +238,30 @@ def parse_gold_price_with_regex(text: str, pattern: str) -> float:
     return price
 
 
+_PRICE_NUMERIC = re.compile(r'[\d,]+(?:\.\d+)?')
+
+
+def parse_price_text(text: str | None) -> float | None:
+    """
+    Extract a numeric price from a scraped cell text like '53.20 EGP'.
+
+    Args:
+        text: Text content of the price element.
+
+    Returns:
+        float | None: The price, or None if the text holds no number.
+    """
+    if not text or not text.strip():
+        return None
+    m = _PRICE_NUMERIC.search(text.strip().replace(',', ''))
+    if not m:
+        return None
+    try:
+        return float(m.group(0).replace(',', ''))
+    except (ValueError, TypeError):
+        return None
+
+
 def compute_gold_product_price(
     base_gold_price_21k: float,
     purity: str,
@@ -175,15 +283,7 @@ def compute_gold_product_price(
             - sale_price: Sale price (cost + markup), rounded to nearest 50
             - min_sale_price: Minimum sale price (cost + 70% markup), rounded to nearest 50
     """
-    # Purity factors mapping (relative to 21K, which is what the API returns)
-    # 24K = 8/7 of 21K; 18K = 7/8 of 21K
-    purity_factors = {
-        '24K': Decimal('8') / Decimal('7'),         # 8/7 of 21K
-        '21K': Decimal('1.0'),                       # 1.0000
-        '18K': Decimal('7') / Decimal('8'),          # 7/8 of 21K
-    }
-
-    purity_factor = purity_factors.get(purity, Decimal('0'))
+    purity_factor = GOLD_PURITY_FACTORS.get(purity, Decimal('0'))
     if purity_factor <= 0:
         raise ValueError(f'Invalid purity: {purity}')
 
@@ -291,3 +391,81 @@ def compute_silver_product_price(
     ) * round_to_50
 
     return (float(cost), float(sale_price), float(min_sale_price))
+
+
+def percentile(values, pct: float) -> float:
+    """
+    Return the pct-th percentile of values using linear interpolation.
+
+    Args:
+        values: Iterable of numbers (need not be sorted).
+        pct: Percentile in range 0-100.
+
+    Returns:
+        float: Interpolated percentile.
+
+    Raises:
+        ValueError: If values is empty or pct is out of range.
+    """
+    ordered = sorted(float(v) for v in values)
+    if not ordered:
+        raise ValueError('Cannot compute a percentile of no values.')
+    if pct < 0 or pct > 100:
+        raise ValueError(f'Percentile must be between 0 and 100, got: {pct}')
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def median_consensus(prices, tolerance_pct: float) -> tuple[float, list[float]]:
+    """
+    Median of prices after rejecting values too far from the raw median.
+
+    Args:
+        prices: Iterable of positive prices from independent sources.
+        tolerance_pct: Maximum deviation from the median, in percent, for a
+            price to be accepted.
+
+    Returns:
+        tuple: (consensus_price, rejected_prices)
+
+    Raises:
+        ValueError: If prices is empty, tolerance is negative, or no price lies
+            within tolerance of the median (sources disagree).
+    """
+    values = [float(p) for p in prices]
+    if not values:
+        raise ValueError('No prices available for consensus.')
+    if tolerance_pct < 0:
+        raise ValueError(f'Tolerance cannot be negative, got: {tolerance_pct}')
+    raw_median = percentile(values, 50)
+    limit = abs(raw_median) * tolerance_pct / 100.0
+    accepted = [v for v in values if abs(v - raw_median) <= limit]
+    rejected = [v for v in values if abs(v - raw_median) > limit]
+    if not accepted:
+        raise ValueError(
+            f'Sources disagree beyond {tolerance_pct:g}% tolerance: {values}')
+    return percentile(accepted, 50), rejected
+
+
+def compute_pricing_signature(values) -> str:
+    """
+    Stable fingerprint of the inputs that determine a metal's catalog prices.
+
+    Numbers are rounded to 4 decimals so float noise (e.g. '80' vs '80.0') does
+    not look like a change; other values are compared as strings.
+
+    Args:
+        values: Iterable of inputs (base price, FX rate, markup values, ...).
+
+    Returns:
+        str: Hex digest; equal inputs always give the same digest.
+    """
+    parts = []
+    for value in values:
+        try:
+            parts.append(f'{float(value):.4f}')
+        except (TypeError, ValueError):
+            parts.append(str(value))
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
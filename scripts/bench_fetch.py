@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark the gold/silver fetch+parse path offline against the replay feed server.
+
+Starts scripts/replay_feed_server.py in-process (or uses --base-url), then runs
+the same fetch code the module uses:
+
+  gold    price_feeds.fetch_gold_price (what _fetch_gold_price_from_api calls)
+  silver  HTTP GET + parse of the scraper's price cell; with --silver-selenium the
+          real Selenium scraper from scripts/selenium_automation.py (needs Chrome)
+  tick    both sources through price_feeds.fetch_concurrently with per-source
+          timeouts, as in one jewellery.price.scheduler run
+
+For every source it reports latency percentiles and how often the module would
+have fallen back to the stored price, broken down by failure kind.
+
+Run:
+  python scripts/bench_fetch.py --iterations 200 --latency-ms 80 --jitter-ms 40 --error-rate 0.05
+  python scripts/bench_fetch.py --json bench_fetch.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import types
+from html.parser import HTMLParser
+
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_PACKAGE_DIR = os.path.join(_SCRIPTS_DIR, "..", "jewellery_evaluator")
+sys.path.insert(0, _SCRIPTS_DIR)
+
+# Load the ORM-free helpers without importing Odoo (same approach as tests/conftest.py).
+_pure_package = types.ModuleType("jewellery_evaluator_pure")
+_pure_package.__path__ = [os.path.abspath(_PACKAGE_DIR)]
+sys.modules.setdefault("jewellery_evaluator_pure", _pure_package)
+
+import requests  # noqa: E402
+from jewellery_evaluator_pure.price_feeds import (  # noqa: E402
+    GOLD_REQUEST_HEADERS,
+    fetch_concurrently,
+    fetch_gold_price,
+)
+from jewellery_evaluator_pure.utils import parse_price_text, percentile  # noqa: E402
+from replay_feed_server import ReplayFeedServer, add_profile_arguments, profile_from_args  # noqa: E402
+
+GOLD_REGEX = r"الذهب عيار 21 هو (\d+(?:\.\d+)?)"
+PERCENTILES = (50, 90, 95, 99)
+
+
+class _PriceCellParser(HTMLParser):
+    """Collect the text of the 3rd cell of the first tbody row (the scraper's XPath target)."""
+
+    def __init__(self):
+        super().__init__()
+        self._in_tbody = False
+        self._row = 0
+        self._cell = 0
+        self._capture = False
+        self.text = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tbody":
+            self._in_tbody = True
+        elif tag == "tr" and self._in_tbody:
+            self._row += 1
+            self._cell = 0
+        elif tag == "td" and self._in_tbody and self._row == 1:
+            self._cell += 1
+            self._capture = self._cell == 3
+
+    def handle_endtag(self, tag):
+        if tag == "td":
+            self._capture = False
+        elif tag == "tbody":
+            self._in_tbody = False
+
+    def handle_data(self, data):
+        if self._capture:
+            self.text += data
+
+
+def fetch_silver_static(url, timeout):
+    """GET the silver page and parse the price cell without a browser."""
+    response = requests.get(url, headers=GOLD_REQUEST_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    parser = _PriceCellParser()
+    parser.feed(response.text)
+    return parse_price_text(parser.text)
+
+
+def fetch_silver_selenium(url):
+    import selenium_automation  # exits when selenium is missing
+
+    driver = selenium_automation.create_driver()
+    try:
+        driver.get(url)
+        from selenium.webdriver.support.ui import WebDriverWait
+        el = WebDriverWait(driver, 30).until(selenium_automation._text_ready)
+        return parse_price_text(el.text)
+    finally:
+        driver.quit()
+
+
+def _failure_kind(exc):
+    if isinstance(exc, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return "http_error"
+    if isinstance(exc, requests.exceptions.RequestException):
+        return "connection"
+    if isinstance(exc, ValueError):
+        return "parse"
+    return type(exc).__name__
+
+
+def run_source(fn, iterations):
+    """Call fn iterations times; return (latencies_all, latencies_ok, failures by kind)."""
+    latencies, ok_latencies, failures = [], [], {}
+    for _i in range(iterations):
+        started = time.perf_counter()
+        try:
+            value = fn()
+            kind = None if value and value > 0 else "no_price"
+        except Exception as e:
+            kind = _failure_kind(e)
+        elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        if kind is None:
+            ok_latencies.append(elapsed)
+        else:
+            failures[kind] = failures.get(kind, 0) + 1
+    return latencies, ok_latencies, failures
+
+
+def run_ticks(jobs, iterations):
+    """Run the scheduler's concurrent fetch stage iterations times."""
+    latencies, ok_latencies, failures = [], [], {}
+    for _i in range(iterations):
+        started = time.perf_counter()
+        outcomes = fetch_concurrently(jobs)
+        elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        failed = [o.source for o in outcomes.values() if not o.value]
+        for source in failed:
+            failures[source] = failures.get(source, 0) + 1
+        if not failed:
+            ok_latencies.append(elapsed)
+    return latencies, ok_latencies, failures
+
+
+def summarize(latencies, ok_latencies, failures):
+    ms = [v * 1000.0 for v in latencies]
+    fallbacks = len(latencies) - len(ok_latencies)
+    summary = {
+        "requests": len(latencies),
+        "fallbacks": fallbacks,
+        "fallback_rate": round(fallbacks / len(latencies), 4) if latencies else 0.0,
+        "failures": failures,
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ms, pct), 3) if ms else 0.0
+    ok_ms = [v * 1000.0 for v in ok_latencies]
+    summary["ok_p50_ms"] = round(percentile(ok_ms, 50), 3) if ok_ms else 0.0
+    return summary
+
+
+def print_report(results):
+    header = f"{'source':<8} {'reqs':>6} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'max':>9} {'fallback':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, s in results.items():
+        print(f"{name:<8} {s['requests']:>6} {s['p50_ms']:>8.1f}ms {s['p90_ms']:>7.1f}ms "
+              f"{s['p95_ms']:>7.1f}ms {s['p99_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms "
+              f"{s['fallback_rate'] * 100:>8.1f}%")
+        if s["failures"]:
+            print(f"{'':<8} failures: " + ", ".join(f"{k}={v}" for k, v in sorted(s["failures"].items())))
+
+
+def run_benchmark(gold_url, silver_url, iterations, gold_timeout, silver_timeout,
+                  silver_selenium=False):
+    """Run every benchmark against the given feed URLs and return the per-source summaries."""
+    def gold():
+        return fetch_gold_price(gold_url, GOLD_REGEX, timeout=gold_timeout)
+
+    def silver():
+        if silver_selenium:
+            return fetch_silver_selenium(silver_url)
+        return fetch_silver_static(silver_url, silver_timeout)
+
+    return {
+        "gold": summarize(*run_source(gold, iterations)),
+        "silver": summarize(*run_source(silver, iterations)),
+        "tick": summarize(*run_ticks(
+            {"gold": (gold, gold_timeout), "silver": (silver, silver_timeout)}, iterations)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline fetch+parse latency benchmark.")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--gold-timeout", type=float, default=10.0)
+    parser.add_argument("--silver-timeout", type=float, default=45.0)
+    parser.add_argument("--base-url", default=None,
+                        help="Use an already running replay server instead of starting one")
+    parser.add_argument("--silver-selenium", action="store_true",
+                        help="Scrape silver with headless Chrome instead of a plain GET")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+    else:
+        server = ReplayFeedServer(profile_from_args(args), seed=args.seed).start()
+        base_url = server.url("")
+    try:
+        results = run_benchmark(
+            f"{base_url}/gold", f"{base_url}/silver", args.iterations,
+            args.gold_timeout, args.silver_timeout, silver_selenium=args.silver_selenium)
+    finally:
+        if server:
+            server.stop()
+
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"profile": vars(profile_from_args(args)), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks of the pure pricing helpers, compared against a JSON baseline.
+
+Benchmarked on generated inputs with realistic distributions (seeded):
+
+  gold_price        compute_gold_product_price over a catalog mix of purities,
+                    jewellery weights and bar weights
+  silver_price      compute_silver_product_price over jewellery weights
+  bars_markup       _get_markup_bars_by_weight over tier, off-tier and 1kg+ bars
+  markup_per_gram   get_markup_per_gram over local, foreign and bars products
+  gold_regex_*      parse_gold_price_with_regex on the recorded gold page grown to
+                    about 1 KiB, 256 KiB and 1 MiB with news and price table markup
+
+Every case reports the best time per call over --repeat runs. Absolute times
+depend on the machine, so each case is also timed relative to a fixed
+calibration workload run in alternation with it (median ratio over the runs);
+baselines are compared on that ratio, which holds across machines of similar
+Python versions and absorbs most background load.
+
+Run:
+  python scripts/bench_pricing.py                     # report only
+  python scripts/bench_pricing.py --save              # rewrite bench_pricing_baseline.json
+  python scripts/bench_pricing.py --compare --tolerance 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import types
+from decimal import Decimal
+
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_PACKAGE_DIR = os.path.join(_SCRIPTS_DIR, "..", "jewellery_evaluator")
+_GOLD_PAGE = os.path.join(_SCRIPTS_DIR, "..", "tests", "fixtures", "feeds", "gold_21k.html")
+
+# Load the ORM-free helpers without importing Odoo (same approach as tests/conftest.py).
+_pure_package = types.ModuleType("jewellery_evaluator_pure")
+_pure_package.__path__ = [os.path.abspath(_PACKAGE_DIR)]
+sys.modules.setdefault("jewellery_evaluator_pure", _pure_package)
+
+from jewellery_evaluator_pure.utils import (  # noqa: E402
+    BAR_TIER_DEFAULT_MARKUP,
+    BAR_TIER_PARAM_SUFFIXES,
+    BAR_TIER_WEIGHTS,
+    _get_markup_bars_by_weight,
+    compute_gold_product_price,
+    compute_silver_product_price,
+    get_markup_per_gram,
+    parse_gold_price_with_regex,
+)
+
+GOLD_REGEX = r"الذهب عيار 21 هو (\d+(?:\.\d+)?)"
+GOLD_PAGE_PRICE = 5415.0
+DEFAULT_BASELINE = os.path.join(_SCRIPTS_DIR, "bench_pricing_baseline.json")
+DEFAULT_TOLERANCE = 0.5
+CATALOG_SIZE = 2000
+PAGE_SIZES_KB = {"gold_regex_1kb": 0, "gold_regex_256kb": 256, "gold_regex_1mb": 1024}
+
+
+class _FakeICP:
+    def __init__(self, params):
+        self._params = params
+
+    def sudo(self):
+        return self
+
+    def get_param(self, key, default=False):
+        return self._params.get(key, default)
+
+
+class FakeEnv:
+    """Just enough of an Odoo environment for the config lookups of utils."""
+
+    def __init__(self, params):
+        self._icp = _FakeICP(params)
+
+    def __getitem__(self, model):
+        return self._icp
+
+
+def markup_params():
+    params = {
+        "jewellery_evaluator.markup_jewellery_local": "37.5",
+        "jewellery_evaluator.markup_jewellery_foreign": "55.0",
+    }
+    for suffix, markup in zip(BAR_TIER_PARAM_SUFFIXES, BAR_TIER_DEFAULT_MARKUP, strict=True):
+        params[f"jewellery_evaluator.markup_bars_{suffix}"] = str(markup)
+    return params
+
+
+def _jewellery_weight(rng, median_g):
+    """Jewellery weights are right-skewed: mostly light pieces, a few heavy sets."""
+    return round(min(max(rng.lognormvariate(0, 0.6) * median_g, 0.5), 250.0), 2)
+
+
+def _bar_weight(rng):
+    """Most bars are minted at a tier weight; some are off-tier or over 1 kg."""
+    if rng.random() < 0.8:
+        return float(rng.choice(BAR_TIER_WEIGHTS))
+    return round(rng.uniform(0.5, 1500.0), 2)
+
+
+def generate_catalog(size, seed=1):
+    """
+    Gold, silver and bars products as (kind, gold_type, purity, weight_g, markup)
+    tuples, in the proportions of a typical shop catalog.
+    """
+    rng = random.Random(seed)
+    env = FakeEnv(markup_params())
+    products = []
+    for _i in range(size):
+        roll = rng.random()
+        if roll < 0.55:
+            gold_type = rng.choices(["jewellery_local", "jewellery_foreign"], weights=[3, 1])[0]
+            purity = rng.choices(["21K", "18K", "24K"], weights=[70, 25, 5])[0]
+            weight = _jewellery_weight(rng, 7.5)
+        elif roll < 0.7:
+            gold_type, purity, weight = "bars", "24K", _bar_weight(rng)
+        else:
+            products.append(("silver", None, "999.0", _jewellery_weight(rng, 15.0), 3.35))
+            continue
+        products.append(("gold", gold_type, purity, weight,
+                         get_markup_per_gram(env, gold_type, weight)))
+    return products
+
+
+def grow_gold_page(page, extra_kb, seed=1):
+    """
+    Grow the recorded gold page by about extra_kb KiB of news blocks and price
+    tables for other karats, inserted before the prices so the regex scans them.
+    """
+    if extra_kb <= 0:
+        return page
+    rng = random.Random(seed)
+    blocks = []
+    size = 0
+    while size < extra_kb * 1024:
+        karat = rng.choice([18, 24, 14])
+        price = rng.randint(3500, 6500)
+        block = (
+            '<article class="news"><h2>أخبار سوق الذهب</h2>'
+            f"<p>ارتفع سعر جرام الذهب عيار {karat} هو الآخر إلى {price} جنيها في التعاملات "
+            f"المسائية، بزيادة {rng.randint(5, 60)} جنيها عن الإغلاق السابق.</p>"
+            '<table class="history"><tbody>'
+            + "".join(f"<tr><td>{day}/10</td><td>{price - day * 3}.00</td></tr>"
+                      for day in range(1, 8))
+            + "</tbody></table></article>\n"
+        )
+        blocks.append(block)
+        size += len(block.encode("utf-8"))
+    return page.replace("<main>", "<main>\n" + "".join(blocks), 1)
+
+
+def _calibration():
+    """Fixed mix of Decimal, float, string and dict work the helpers are made of."""
+    total = Decimal("0")
+    lookup = {f"k{i}": str(i * 1.5) for i in range(32)}
+    for i in range(200):
+        value = Decimal(str(i * 1.25)) * Decimal("1.1428")
+        total += value.quantize(Decimal("0.01"))
+        float(lookup[f"k{i % 32}"])
+    return total
+
+
+def build_cases(seed=1):
+    """
+    Benchmark cases as name -> (calls per run, function running them all once).
+    """
+    catalog = generate_catalog(CATALOG_SIZE, seed)
+    gold = [(purity, weight, markup) for kind, _t, purity, weight, markup in catalog
+            if kind == "gold"]
+    silver = [(weight, markup) for kind, _t, _p, weight, markup in catalog if kind == "silver"]
+    env = FakeEnv(markup_params())
+    rng = random.Random(seed)
+    bar_weights = [_bar_weight(rng) for _i in range(CATALOG_SIZE)]
+    markup_inputs = [(gold_type, weight) for kind, gold_type, _p, weight, _m in catalog
+                     if kind == "gold"]
+    with open(_GOLD_PAGE, encoding="utf-8") as f:
+        page = f.read()
+
+    def gold_price():
+        for purity, weight, markup in gold:
+            compute_gold_product_price(5415.0, purity, weight, markup)
+
+    def silver_price():
+        for weight, markup in silver:
+            compute_silver_product_price(53.2, weight, markup)
+
+    def bars_markup():
+        for weight in bar_weights:
+            _get_markup_bars_by_weight(env, weight)
+
+    def markup_per_gram():
+        for gold_type, weight in markup_inputs:
+            get_markup_per_gram(env, gold_type, weight)
+
+    cases = {
+        "calibration": (1, _calibration),
+        "gold_price": (len(gold), gold_price),
+        "silver_price": (len(silver), silver_price),
+        "bars_markup": (len(bar_weights), bars_markup),
+        "markup_per_gram": (len(markup_inputs), markup_per_gram),
+    }
+    for name, extra_kb in PAGE_SIZES_KB.items():
+        text = grow_gold_page(page, extra_kb, seed)
+
+        def parse(text=text):
+            if parse_gold_price_with_regex(text, GOLD_REGEX) != GOLD_PAGE_PRICE:
+                raise AssertionError("grown gold page no longer parses to the recorded price")
+
+        cases[name] = (1, parse)
+    return cases
+
+
+def _loops_for(run, min_run_seconds):
+    """Number of back-to-back calls of run lasting at least min_run_seconds."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _i in range(loops):
+            run()
+        if time.perf_counter() - started >= min_run_seconds:
+            return loops
+        loops *= 2
+
+
+def _timed(run, loops):
+    started = time.perf_counter()
+    for _i in range(loops):
+        run()
+    return time.perf_counter() - started
+
+
+def measure(run, calls, calibrate, repeat, min_run_seconds=0.05):
+    """
+    Time run against the calibration workload, alternating the two so that
+    both see the same machine load.
+
+    Returns:
+        float: Best time per call in microseconds
+        float: Median over the repeats of the time per call divided by the
+            calibration time
+    """
+    loops = _loops_for(run, min_run_seconds)
+    calibration_loops = _loops_for(calibrate, min_run_seconds)
+    best, ratios = float("inf"), []
+    for _i in range(repeat):
+        calibration = _timed(calibrate, calibration_loops) / calibration_loops
+        per_call = _timed(run, loops) / (loops * calls)
+        best = min(best, per_call)
+        ratios.append(per_call / calibration)
+    return best * 1e6, statistics.median(ratios)
+
+
+def run_benchmark(repeat=7, seed=1, only=None):
+    """
+    Measure every case (or those in only) and return
+    {name: {'us_per_call': float, 'relative': float}}; relative is the time
+    per call divided by the calibration time.
+    """
+    cases = build_cases(seed)
+    calibrate = cases.pop("calibration")[1]
+    results = {}
+    for name, (calls, run) in cases.items():
+        if only and name not in only:
+            continue
+        us, relative = measure(run, calls, calibrate, repeat)
+        results[name] = {"us_per_call": round(us, 4), "relative": round(relative, 6)}
+    calibration_us = _timed(calibrate, 100) / 100 * 1e6
+    return {"calibration_us": round(calibration_us, 4), "cases": results}
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare relative times of results against baseline.
+
+    Returns:
+        list: (name, baseline relative, current relative, change) per case in
+            both, change being the fractional slowdown (negative when faster)
+        list: Names of the cases slower than tolerance allows
+    """
+    rows, regressions = [], []
+    for name, current in sorted(results["cases"].items()):
+        base = baseline["cases"].get(name)
+        if not base:
+            continue
+        change = current["relative"] / base["relative"] - 1.0
+        rows.append((name, base["relative"], current["relative"], change))
+        if change > tolerance:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_report(results, rows=None):
+    print(f"calibration: {results['calibration_us']:.1f}us")
+    header = f"{'case':<18} {'us/call':>10} {'relative':>10}"
+    if rows is not None:
+        header += f" {'baseline':>10} {'change':>8}"
+    print(header)
+    print("-" * len(header))
+    by_name = {row[0]: row for row in rows or []}
+    for name, case in results["cases"].items():
+        line = f"{name:<18} {case['us_per_call']:>10.2f} {case['relative']:>10.4f}"
+        if name in by_name:
+            _name, base, _current, change = by_name[name]
+            line += f" {base:>10.4f} {change * 100:>+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pure pricing helper benchmarks.")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--case", action="append", dest="cases", help="Run only this case")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Write the results as the new baseline (default: %(const)s)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Fail when a case is slower than this baseline allows "
+                             "(default: %(const)s)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown relative to the baseline (0.5 = 50%%)")
+    args = parser.parse_args()
+
+    results = run_benchmark(repeat=args.repeat, seed=args.seed, only=args.cases)
+    results["python"] = platform.python_version()
+
+    rows, regressions = None, []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.tolerance)
+        if baseline.get("python", "").rsplit(".", 1)[0] != results["python"].rsplit(".", 1)[0]:
+            print(f"Note: baseline recorded with Python {baseline.get('python')}, "
+                  f"running {results['python']}; consider make bench-pricing-baseline")
+    print_report(results, rows)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if regressions:
+        print(f"Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the repricing paths on the catalog of a database.
+
+Serves the recorded gold and silver pages with scripts/replay_feed_server.py
+and points the module at it, then runs update_all_gold_product_prices (fetch
+included), update_all_silver_product_prices (price from the replayed silver
+page) and update_all_diamond_product_prices through every selected repricing
+path:
+
+  orm          product by product (batches of 100, write through the price writer)
+  orm_copy     product by product, prices applied with COPY
+  skip_locked  product by product, skipping locked rows
+  sql          one UPDATE per metal
+  stream       chunked server-side cursor reads, bulk writes
+
+Prices of the benchmarked metal are zeroed before each run, so every run
+reprices the whole catalog. For every run it reports products repriced per
+second, stage timings and SQL query count from the pricing run stats, and the
+peak memory of the process (peak Python allocations too with BENCH_TRACE_MEMORY=1,
+at a large slowdown). Query counts only cover the run's own cursor.
+
+Runs commit, and the configuration touched is restored at the end; use a
+throwaway database, e.g. one seeded with scripts/seed_catalog.py.
+
+Run inside Odoo shell, from the project root:
+  odoo shell -d YOUR_DATABASE -c /path/to/odoo.conf
+
+Then in the shell:
+  import os; os.environ["BENCH_PATHS"] = "orm,sql,stream"
+  exec(open("scripts/bench_repricing.py").read())
+
+Options (environment variables):
+  BENCH_METALS          comma-separated metals (default gold,silver,diamond)
+  BENCH_PATHS           comma-separated paths (default all of the above)
+  BENCH_RUNS            runs per metal and path (default 3)
+  BENCH_FEED_LATENCY_MS latency of the replayed feed (default 0)
+  BENCH_TRACE_MEMORY    1 to measure peak Python allocations with tracemalloc
+  BENCH_JSON            write every run to this file
+"""
+
+import json
+import os
+import resource
+import statistics
+import sys
+import tracemalloc
+
+try:
+    _SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+except NameError:  # exec'd from the Odoo shell at the project root
+    _SCRIPTS_DIR = os.path.abspath("scripts")
+sys.path.insert(0, _SCRIPTS_DIR)
+
+from bench_fetch import GOLD_REGEX, fetch_silver_static  # noqa: E402
+from replay_feed_server import FeedProfile, ReplayFeedServer  # noqa: E402
+
+METALS = ("gold", "silver", "diamond")
+# System parameters (without the jewellery_evaluator. prefix) selecting each path
+PATH_PARAMS = {
+    "orm": {},
+    "orm_copy": {"price_apply_backend": "copy"},
+    "skip_locked": {"skip_locked_repricing": "1"},
+    "sql": {"repricing_engine": "sql"},
+    "stream": {"repricing_engine": "stream"},
+}
+# Every path starts from these, so one path's settings never leak into the next
+BASE_PARAMS = {
+    "repricing_engine": "orm",
+    "price_apply_backend": "standard",
+    "skip_locked_repricing": False,
+    "lazy_repricing": False,
+    "repricing_mode": "interval",
+}
+# Diamond runs always price from the grid or USD ticket price, whatever the path
+DIAMOND_PATHS = ("orm",)
+RESET_SQL = {
+    "gold": "UPDATE product_template SET list_price = 0, gold_cost_price = 0, "
+            "gold_min_sale_price = 0 "
+            "WHERE jewellery_type IN ('gold_local', 'gold_foreign', 'gold_bars')",
+    "silver": "UPDATE product_template SET list_price = 0, silver_cost_price = 0, "
+              "silver_min_sale_price = 0 WHERE jewellery_type = 'silver'",
+    "diamond": "UPDATE product_template SET list_price = 0 "
+               "WHERE jewellery_type = 'diamond_jewellery'",
+}
+# USD to EGP rate of diamond runs
+DIAMOND_RATE = 48.55
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize_runs(runs):
+    """
+    Median of the runs of every (metal, path).
+
+    Returns:
+        list: dicts with metal, path, runs, products, duration, rows_per_sec,
+            query_count, peak_rss_mb and peak_alloc_mb (None when not traced)
+    """
+    groups = {}
+    for run in runs:
+        groups.setdefault((run["metal"], run["path"]), []).append(run)
+    summary = []
+    for (metal, path), group in groups.items():
+        ok = [run for run in group if run["success"]] or group
+        allocs = [run["peak_alloc_mb"] for run in ok if run["peak_alloc_mb"] is not None]
+        summary.append({
+            "metal": metal,
+            "path": path,
+            "runs": len(group),
+            "failed": len(group) - len([run for run in group if run["success"]]),
+            "products": max(run["products_updated"] for run in ok),
+            "duration": statistics.median(run["duration"] for run in ok),
+            "rows_per_sec": statistics.median(run["rows_per_sec"] for run in ok),
+            "query_count": statistics.median(run["query_count"] for run in ok),
+            "peak_rss_mb": max(run["peak_rss_mb"] for run in ok),
+            "peak_alloc_mb": max(allocs) if allocs else None,
+        })
+    return summary
+
+
+def print_report(summary):
+    header = (f"{'metal':<8} {'path':<12} {'runs':>4} {'products':>9} {'seconds':>9} "
+              f"{'rows/s':>9} {'queries':>8} {'rss MB':>7} {'alloc MB':>9}")
+    print(header)
+    print("-" * len(header))
+    for row in summary:
+        alloc = f"{row['peak_alloc_mb']:.1f}" if row["peak_alloc_mb"] is not None else "-"
+        failed = f"  ({row['failed']} failed)" if row["failed"] else ""
+        print(f"{row['metal']:<8} {row['path']:<12} {row['runs']:>4} {row['products']:>9} "
+              f"{row['duration']:>9.2f} {row['rows_per_sec']:>9.0f} {row['query_count']:>8.0f} "
+              f"{row['peak_rss_mb']:>7.0f} {alloc:>9}{failed}")
+
+
+def _set_params(icp, params):
+    for key, value in params.items():
+        icp.set_param(f"jewellery_evaluator.{key}", value)
+
+
+def _run_once(env, metal, silver_url, trace_memory):
+    """Zero the metal's prices, reprice it and return the run's measurements."""
+    env.cr.execute(RESET_SQL[metal])
+    env.cr.commit()
+    env.invalidate_all()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    if metal == "gold":
+        result = env["gold.price.service"].update_all_gold_product_prices()
+    elif metal == "silver":
+        base_silver = fetch_silver_static(silver_url, timeout=10)
+        result = env["silver.price.service"].update_all_silver_product_prices(base_silver)
+    else:
+        result = env["diamond.price.service"].update_all_diamond_product_prices(DIAMOND_RATE)
+    env.cr.commit()
+    stats = result.get("stats") or {}
+    duration = stats.get("duration") or 0.0
+    updated = result.get("products_updated") or 0
+    return {
+        "success": bool(result.get("success")),
+        "message": result.get("message"),
+        "products_updated": updated,
+        "duration": duration,
+        "rows_per_sec": updated / duration if duration else 0.0,
+        "query_count": stats.get("query_count", 0),
+        "timings": stats.get("timings", {}),
+        "fallback_used": stats.get("fallback_used", False),
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_alloc_mb": tracemalloc.get_traced_memory()[1] / 2**20 if trace_memory else None,
+    }
+
+
+def run_benchmark(env, metals=METALS, paths=tuple(PATH_PARAMS), runs=3, latency_ms=0.0,
+                  trace_memory=False):
+    """
+    Run every metal through every path runs times against the replayed feed.
+
+    Returns:
+        list: One dict per run, with metal, path and the run's measurements
+    """
+    unknown = set(metals) - set(METALS) | set(paths) - set(PATH_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown metals or paths: {', '.join(sorted(unknown))}")
+    ICP = env["ir.config_parameter"].sudo()
+    touched = set(BASE_PARAMS) | {"gold_api_endpoint", "gold_21k_regex_formula"}
+    for params in PATH_PARAMS.values():
+        touched |= set(params)
+    saved = {key: ICP.get_param(f"jewellery_evaluator.{key}") for key in touched}
+    results = []
+    server = ReplayFeedServer(FeedProfile(latency_ms=latency_ms), seed=1).start()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        _set_params(ICP, {"gold_api_endpoint": server.url("/gold"),
+                          "gold_21k_regex_formula": GOLD_REGEX})
+        for metal in metals:
+            for path in paths:
+                if metal == "diamond" and path not in DIAMOND_PATHS:
+                    continue
+                params = dict(BASE_PARAMS, **PATH_PARAMS[path])
+                _set_params(ICP, params)
+                env.cr.commit()
+                for index in range(runs):
+                    run = _run_once(env, metal, server.url("/silver"), trace_memory)
+                    results.append(dict(run, metal=metal, path=path, run=index + 1))
+                    print(f"{metal} {path} #{index + 1}: {run['products_updated']} products "
+                          f"in {run['duration']:.2f}s ({run['rows_per_sec']:.0f}/s)"
+                          + ("" if run["success"] else f" FAILED: {run['message']}"))
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        server.stop()
+        env.cr.rollback()
+        _set_params(ICP, saved)
+        env.cr.commit()
+    return results
+
+
+def _main(env):
+    runs = run_benchmark(
+        env,
+        metals=os.environ.get("BENCH_METALS", ",".join(METALS)).split(","),
+        paths=os.environ.get("BENCH_PATHS", ",".join(PATH_PARAMS)).split(","),
+        runs=int(os.environ.get("BENCH_RUNS", "3")),
+        latency_ms=float(os.environ.get("BENCH_FEED_LATENCY_MS", "0")),
+        trace_memory=os.environ.get("BENCH_TRACE_MEMORY") == "1",
+    )
+    print_report(summarize_runs(runs))
+    if os.environ.get("BENCH_JSON"):
+        with open(os.environ["BENCH_JSON"], "w") as f:
+            json.dump({"runs": runs, "summary": summarize_runs(runs)}, f, indent=2)
+
+
+# When run inside Odoo shell, 'env' is the environment
+try:
+    env
+except NameError:
+    print("Run this script inside Odoo shell: odoo shell -d DB -c odoo.conf")
+    print("Then: exec(open('scripts/bench_repricing.py').read())")
+else:
+    _main(env)  # noqa: F821
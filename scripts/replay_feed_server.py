@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the gold and silver price pages.
+
+Replays the recorded pages in tests/fixtures/feeds with configurable latency,
+jitter, error rate, broken-page rate and page size, so the fetch path can be
+exercised and benchmarked without the live internet.
+
+Routes:
+  /gold    recorded gold page (21K price in the summary line)
+  /silver  recorded silver page (silver 999 price at the scraper's XPath)
+
+Run:
+  python scripts/replay_feed_server.py --port 8765 --latency-ms 120 --jitter-ms 60 --error-rate 0.05
+
+Then point the module at it (Settings → Gold API Endpoint = http://127.0.0.1:8765/gold,
+system parameter jewellery_evaluator.silver_page_url = http://127.0.0.1:8765/silver),
+or run scripts/bench_fetch.py, which starts its own server.
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "tests", "fixtures", "feeds")
+ROUTES = {
+    "/gold": "gold_21k.html",
+    "/silver": "silver_999.html",
+}
+# Served with HTTP 200 instead of the page: what a feed returns during maintenance.
+BROKEN_PAGE = b"<html><body><p>Prices are being updated, please try again later.</p></body></html>"
+
+
+@dataclass
+class FeedProfile:
+    """How the replayed feed misbehaves. Rates are probabilities in [0, 1]."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    broken_rate: float = 0.0
+    pad_kb: int = 0
+
+
+class ReplayFeedServer:
+    """Threaded HTTP server replaying the recorded feed pages; usable as a context manager."""
+
+    def __init__(self, profile=None, host="127.0.0.1", port=0,
+                 fixture_dir=FIXTURE_DIR, seed=None):
+        self.profile = profile or FeedProfile()
+        self.pages = {}
+        for route, filename in ROUTES.items():
+            with open(os.path.join(fixture_dir, filename), "rb") as f:
+                self.pages[route] = self._pad(f.read(), self.profile.pad_kb)
+        self.requests = dict.fromkeys(ROUTES, 0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @staticmethod
+    def _pad(page, pad_kb):
+        """Grow the page to roughly pad_kb extra KiB with an HTML comment before </body>."""
+        if pad_kb <= 0:
+            return page
+        filler = b"<!-- " + b"x" * (pad_kb * 1024) + b" -->\n"
+        head, sep, tail = page.rpartition(b"</body>")
+        return head + filler + sep + tail if sep else page + filler
+
+    def url(self, route):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{route}"
+
+    def _draw(self):
+        """Return (delay_seconds, outcome) for one request: outcome is 'ok', 'error' or 'broken'."""
+        p = self.profile
+        with self._lock:
+            jitter = self._random.uniform(-p.jitter_ms, p.jitter_ms) if p.jitter_ms else 0.0
+            roll = self._random.random()
+        delay = max(0.0, p.latency_ms + jitter) / 1000.0
+        if roll < p.error_rate:
+            return delay, "error"
+        if roll < p.error_rate + p.broken_rate:
+            return delay, "broken"
+        return delay, "ok"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = urlsplit(self.path).path
+                if route not in server.pages:
+                    self.send_error(404)
+                    return
+                with server._lock:
+                    server.requests[route] += 1
+                delay, outcome = server._draw()
+                time.sleep(delay)
+                if outcome == "error":
+                    self.send_error(503, "Service Unavailable")
+                    return
+                body = BROKEN_PAGE if outcome == "broken" else server.pages[route]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="replay_feed_server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response delay")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- delay jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 503 answers")
+    parser.add_argument("--broken-rate", type=float, default=0.0,
+                        help="Share of HTTP 200 answers without a price")
+    parser.add_argument("--pad-kb", type=int, default=0, help="Extra KiB added to every page")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+
+
+def profile_from_args(args):
+    return FeedProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        broken_rate=args.broken_rate, pad_kb=args.pad_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    server = ReplayFeedServer(profile_from_args(args), host=args.host, port=args.port,
+                              seed=args.seed)
+    print("Replaying feeds at", ", ".join(server.url(route) for route in ROUTES))
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
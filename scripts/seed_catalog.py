@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Seed a synthetic jewellery catalog for scale tests and repricing benchmarks.
+
+Creates SIZE product templates with the type, purity, weight and stone mix of
+a typical shop, ring size variants on part of the gold jewellery, and stock
+quants in the main warehouse. Seeded products have internal references
+SEED-0000001, SEED-0000002, ... and are created unpriced (run the price crons
+or scripts/bench_repricing.py afterwards). Every chunk is committed, so use a
+throwaway database.
+
+Run inside Odoo shell, from the project root:
+  odoo shell -d YOUR_DATABASE -c /path/to/odoo.conf
+
+Then in the shell:
+  import os; os.environ["SEED_CATALOG_SIZE"] = "100000"
+  exec(open("scripts/seed_catalog.py").read())
+
+Options (environment variables):
+  SEED_CATALOG_SIZE    product templates to create (default 10000; try 10000, 100000, 1000000)
+  SEED_CATALOG_SEED    random seed (default 1); the same seed gives the same catalog
+  SEED_CATALOG_CHUNK   templates per transaction (default 1000)
+  SEED_CATALOG_PURGE   1 to delete previously seeded products first
+
+Expect a few hundred templates per second through the ORM: minutes for 100k,
+about an hour for 1M.
+"""
+
+import os
+import random
+import resource
+import time
+
+SEED_PREFIX = "SEED-"
+# Share of the catalog per jewellery type
+TYPE_WEIGHTS = {
+    "gold_local": 45,
+    "gold_foreign": 15,
+    "gold_bars": 8,
+    "silver": 25,
+    "diamond_jewellery": 7,
+}
+GOLD_PURITY_WEIGHTS = {"21K": 70, "18K": 25, "24K": 5}
+# Weights bars are minted at (grams), with the share of each
+BAR_WEIGHTS = {1: 10, 2.5: 10, 5: 15, 10: 20, 20: 10, 31.1: 12, 50: 8, 100: 8, 250: 4,
+               500: 2, 1000: 1}
+# Median weight in grams of each jewellery type; weights are log-normal around it
+MEDIAN_WEIGHT_G = {"gold_local": 7.5, "gold_foreign": 5.0, "silver": 15.0, "diamond_jewellery": 4.0}
+PIECE_NAMES = ["Ring", "Chain", "Bracelet", "Earrings", "Pendant", "Necklace", "Anklet", "Set"]
+DIAMOND_SHAPE_WEIGHTS = {"round": 55, "princess": 10, "oval": 8, "cushion": 7, "emerald": 5,
+                         "pear": 5, "marquise": 3, "radiant": 3, "asscher": 2, "heart": 2}
+DIAMOND_COLORS = "DEFGHIJKLM"
+DIAMOND_CLARITIES = ("FL", "IF", "VVS1", "VVS2", "VS1", "VS2", "SI1", "SI2", "SI3", "I1", "I2", "I3")
+# Share of gold rings sold in several sizes, and the sizes offered
+RING_VARIANT_RATE = 0.3
+RING_SIZES = [str(size) for size in range(12, 24)]
+# Share of products with stock on hand
+IN_STOCK_RATE = 0.8
+
+
+def _pick(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _weight(rng, median_g):
+    return round(min(max(rng.lognormvariate(0, 0.6) * median_g, 0.3), 500.0), 2)
+
+
+def generate_products(size, seed=1, start=1):
+    """
+    Values of the seeded product templates, in order.
+
+    Yields:
+        tuple: (product.template values, ring sizes or [] for a single
+            variant, units on hand per variant)
+    """
+    rng = random.Random(seed)
+    for number in range(start, start + size):
+        jewellery_type = _pick(rng, TYPE_WEIGHTS)
+        piece = rng.choice(PIECE_NAMES)
+        vals = {
+            "default_code": f"{SEED_PREFIX}{number:07d}",
+            "detailed_type": "product",
+            "jewellery_type": jewellery_type,
+            "making_fee": float(rng.choice([0, 0, 50, 100, 150, 250])),
+        }
+        sizes = []
+        if jewellery_type == "gold_bars":
+            weight = float(_pick(rng, BAR_WEIGHTS))
+            vals.update(name=f"Gold Bar {weight:g} g", gold_purity="24K", jewellery_weight_g=weight)
+        elif jewellery_type == "silver":
+            vals.update(name=f"Silver {piece} {number}",
+                        silver_purity=rng.choices(["999.0", "999.9"], weights=[80, 20])[0],
+                        jewellery_weight_g=_weight(rng, MEDIAN_WEIGHT_G["silver"]))
+        elif jewellery_type == "diamond_jewellery":
+            carat = round(min(max(rng.lognormvariate(0, 0.7) * 0.5, 0.05), 5.0), 2)
+            vals.update(name=f"Diamond {piece} {number}",
+                        jewellery_weight_g=_weight(rng, MEDIAN_WEIGHT_G["diamond_jewellery"]),
+                        diamond_carat=carat,
+                        diamond_shape=_pick(rng, DIAMOND_SHAPE_WEIGHTS),
+                        diamond_color=rng.choice(DIAMOND_COLORS[:7]),
+                        diamond_clarity=rng.choice(DIAMOND_CLARITIES[2:9]),
+                        diamond_usd_price=round(carat * rng.uniform(1500, 6000), 2))
+        else:
+            origin = "Local" if jewellery_type == "gold_local" else "Imported"
+            vals.update(name=f"{origin} Gold {piece} {number}",
+                        gold_purity=_pick(rng, GOLD_PURITY_WEIGHTS),
+                        jewellery_weight_g=_weight(rng, MEDIAN_WEIGHT_G[jewellery_type]))
+            if piece == "Ring" and rng.random() < RING_VARIANT_RATE:
+                first = rng.randrange(len(RING_SIZES) - 6)
+                sizes = RING_SIZES[first:first + rng.randint(3, 6)]
+        on_hand = rng.randint(1, 3) if rng.random() < IN_STOCK_RATE else 0
+        yield vals, sizes, on_hand
+
+
+def _ring_size_values(env, sizes):
+    """Ring size attribute values by name, created on first use."""
+    Attribute = env["product.attribute"]
+    attribute = Attribute.search([("name", "=", "Ring Size")], limit=1) or Attribute.create({
+        "name": "Ring Size",
+        "create_variant": "always",
+    })
+    existing = {value.name: value.id for value in attribute.value_ids}
+    missing = [size for size in sizes if size not in existing]
+    if missing:
+        for value in env["product.attribute.value"].create(
+                [{"name": size, "attribute_id": attribute.id} for size in missing]):
+            existing[value.name] = value.id
+    return attribute, existing
+
+
+def purge_catalog(env, chunk=1000):
+    """Delete every seeded product, chunk templates per transaction."""
+    Template = env["product.template"].with_context(active_test=False)
+    total = 0
+    while True:
+        templates = Template.search([("default_code", "=like", f"{SEED_PREFIX}%")], limit=chunk)
+        if not templates:
+            break
+        env["stock.quant"].sudo().search(
+            [("product_id", "in", templates.product_variant_ids.ids)]).unlink()
+        total += len(templates)
+        templates.unlink()
+        env.cr.commit()
+    print(f"Deleted {total} seeded product templates.")
+
+
+def seed_catalog(env, size, seed=1, chunk=1000):
+    """
+    Create size seeded product templates after the ones already seeded,
+    committing every chunk. Returns the number of variants created.
+    """
+    Template = env["product.template"].with_context(
+        skip_gold_price_update=True,
+        skip_silver_price_update=True,
+        skip_diamond_price_update=True,
+        tracking_disable=True,
+        mail_create_nolog=True,
+        mail_notrack=True,
+    )
+    Quant = env["stock.quant"].sudo()
+    location = env["stock.warehouse"].search(
+        [("company_id", "=", env.company.id)], limit=1).lot_stock_id
+    attribute, size_value_ids = _ring_size_values(env, RING_SIZES)
+    start = Template.with_context(active_test=False).search_count(
+        [("default_code", "=like", f"{SEED_PREFIX}%")]) + 1
+
+    started = time.perf_counter()
+    created = variants = 0
+    pending = []
+    for vals, sizes, on_hand in generate_products(size, seed, start):
+        if sizes:
+            vals["attribute_line_ids"] = [(0, 0, {
+                "attribute_id": attribute.id,
+                "value_ids": [(6, 0, [size_value_ids[name] for name in sizes])],
+            })]
+        pending.append((vals, on_hand))
+        if len(pending) < chunk and created + len(pending) < size:
+            continue
+        templates = Template.create([vals for vals, _on_hand in pending])
+        quants = []
+        for template, (_vals, on_hand) in zip(templates, pending, strict=True):
+            variants += len(template.product_variant_ids)
+            if on_hand and location:
+                quants.extend({"product_id": variant.id, "location_id": location.id,
+                               "quantity": on_hand} for variant in template.product_variant_ids)
+        if quants:
+            Quant.create(quants)
+        created += len(pending)
+        pending = []
+        env.cr.commit()
+        env.invalidate_all()
+        elapsed = time.perf_counter() - started
+        print(f"{created}/{size} templates ({variants} variants), "
+              f"{created / elapsed:.0f} templates/s")
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Seeded {created} templates and {variants} variants in "
+          f"{time.perf_counter() - started:.0f}s (peak RSS {peak_mb:.0f} MB).")
+    return variants
+
+
+def _main(env):
+    if os.environ.get("SEED_CATALOG_PURGE") == "1":
+        purge_catalog(env)
+    seed_catalog(
+        env,
+        int(os.environ.get("SEED_CATALOG_SIZE", "10000")),
+        seed=int(os.environ.get("SEED_CATALOG_SEED", "1")),
+        chunk=int(os.environ.get("SEED_CATALOG_CHUNK", "1000")),
+    )
+
+
+# When run inside Odoo shell, 'env' is the environment
+try:
+    env
+except NameError:
+    print("Run this script inside Odoo shell: odoo shell -d DB -c odoo.conf")
+    print("Then: exec(open('scripts/seed_catalog.py').read())")
+else:
+    _main(env)  # noqa: F821
@@ -2,8 +2,14 @@
 """
 Selenium: render dahabmasr.com, get silver 999 price from XPath element.
 Optionally push to Odoo when ODOO_URL, ODOO_DB, ODOO_USER, ODOO_PASSWORD are set.
+When ODOO_URL and ODOO_INGEST_TOKEN are set, the price is POSTed to the module's
+/jewellery_evaluator/prices endpoint instead (repricing is queued immediately).
+
+Set SILVER_PAGE_URL to scrape another page (e.g. scripts/replay_feed_server.py at
+http://127.0.0.1:8765/silver) instead of dahabmasr.com.
 
 Run: ODOO_URL=... ODOO_DB=... ODOO_USER=... ODOO_PASSWORD=... .venv/bin/python scripts/selenium_automation.py
+ or: ODOO_URL=... ODOO_INGEST_TOKEN=... .venv/bin/python scripts/selenium_automation.py
 """
 
 import os
@@ -18,7 +24,7 @@ except ImportError:
     print("Selenium not installed. Run: pip install -r requirements-dev.txt")
     sys.exit(1)
 
-SILVER_PAGE = "https://dahabmasr.com/silver-price-today-en"
+SILVER_PAGE = os.environ.get("SILVER_PAGE_URL") or "https://dahabmasr.com/silver-price-today-en"
 PRICE_CELL_XPATH = "/html/body/div[3]/main/div[2]/div/div[2]/section/div/div[2]/div[1]/table/tbody/tr[1]/td[3]"
 _PRICE_NUMERIC = re.compile(r"[\d,]+(?:\.\d+)?")
 
@@ -61,8 +67,27 @@ def create_driver():
     return d
 
 
+def _push_to_ingest_endpoint(url, token, price):
+    import json
+    import urllib.request
+    req = urllib.request.Request(
+        f"{url}/jewellery_evaluator/prices",
+        data=json.dumps({"silver": float(price), "source": "selenium_automation"}).encode(),
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=15) as resp:
+        return resp.status == 200
+
+
 def _push_to_odoo(price):
     url = (os.environ.get("ODOO_URL") or "").rstrip("/")
+    token = os.environ.get("ODOO_INGEST_TOKEN", "")
+    if url and token:
+        try:
+            return _push_to_ingest_endpoint(url, token, price)
+        except Exception:
+            return False
     db, user, pwd = os.environ.get("ODOO_DB", ""), os.environ.get(
         "ODOO_USER", ""), os.environ.get("ODOO_PASSWORD", "")
     if not url or not db or not user or not pwd:
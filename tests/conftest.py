@@ -10,6 +10,7 @@ Pytest configuration - ensures utils module is available for tests.
 import importlib.util
 import os
 import sys
+import types
 
 # Add project root to path
 _project_root = os.path.join(os.path.dirname(__file__), '..')
@@ -39,3 +40,10 @@ if os.path.exists(_utils_path):
 
     # Make utils available to all tests
     sys.modules['jewellery_evaluator_utils'] = utils_module
+
+# Expose the pure helper modules (utils, price_feeds, ...) as a package so their
+# relative imports resolve, without running the Odoo-dependent __init__.py.
+_package_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "jewellery_evaluator"))
+_pure_package = types.ModuleType("jewellery_evaluator_pure")
+_pure_package.__path__ = [_package_dir]
+sys.modules.setdefault("jewellery_evaluator_pure", _pure_package)
@@ -95,3 +95,65 @@ if __name__ == '__main__':
     test_bars_exact_tier()
     test_bars_zero_weight_returns_zero()
     print('All bar tier markup tests passed.')
+
+
+def test_sql_tier_bounds_match_closest_neighbor_lookup():
+    """The tier bounds used by SQL repricing give the same markup as the Python lookup."""
+    from jewellery_evaluator_utils import bar_tier_upper_bounds, get_bar_tier_markups
+
+    env = _make_env({
+        f'jewellery_evaluator.markup_bars_{suffix}': str(100 + i)
+        for i, suffix in enumerate(
+            ['1g', '2_5g', '5g', '10g', '20g', '31g', '50g', '100g', '250g', '500g', '1000g'])
+    })
+    bounds = bar_tier_upper_bounds()
+    markups = get_bar_tier_markups(env)
+
+    def sql_lookup(weight):
+        if weight >= 1000:
+            return markups[-1]
+        for bound, markup in zip(bounds, markups, strict=False):
+            if weight <= bound:
+                return markup
+        return markups[-2]
+
+    weights = [w / 100 for w in range(1, 120001, 7)] + [
+        1.75, 1.76, 3.75, 7.5, 15, 25.5, 40.5, 75, 175, 375, 999.99, 1000, 5000]
+    for weight in weights:
+        assert sql_lookup(weight) == _get_markup_bars_by_weight(env, weight), weight
+
+
+def test_resolve_bar_tier_markup_matches_closest_neighbor_lookup():
+    """Streaming repricing resolves bar markups from tiers read once, like the per-product lookup."""
+    from jewellery_evaluator_utils import get_bar_tier_markups, resolve_bar_tier_markup
+
+    env = _make_env({
+        'jewellery_evaluator.markup_bars_5g': '0',  # default tier markup
+        'jewellery_evaluator.markup_bars_50g': '97',
+    })
+    markups = get_bar_tier_markups(env)
+    weights = [w / 100 for w in range(-100, 120001, 11)] + [
+        1.75, 1.76, 3.75, 7.5, 15, 25.5, 40.5, 75, 175, 375, 999.99, 1000, 5000]
+    for weight in weights:
+        assert resolve_bar_tier_markup(weight, markups) == _get_markup_bars_by_weight(env, weight), weight
+
+
+def test_bar_tier_weight_conditions_select_exactly_the_resolved_tier():
+    """Each tier's weight conditions hold for the weights resolved to it, and only those."""
+    import operator
+
+    from jewellery_evaluator_utils import (
+        BAR_TIER_WEIGHTS,
+        bar_tier_weight_conditions,
+        resolve_bar_tier_markup,
+    )
+
+    ops = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+    tiers = [float(index) for index in range(len(BAR_TIER_WEIGHTS))]
+    conditions = [bar_tier_weight_conditions(index) for index in range(len(tiers))]
+    weights = [w / 100 for w in range(1, 120001, 13)] + [
+        1.75, 1.76, 3.75, 7.5, 15, 25.5, 40.5, 75, 175, 375, 999.99, 1000, 5000]
+    for weight in weights:
+        matching = [index for index, conds in enumerate(conditions)
+                    if all(ops[op](weight, value) for op, value in conds)]
+        assert matching == [int(resolve_bar_tier_markup(weight, tiers))], weight
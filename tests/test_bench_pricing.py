@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Tests for the pricing helper benchmark inputs and baseline comparison."""
+
+import importlib.util
+import json
+import os
+
+from jewellery_evaluator_pure.utils import parse_gold_price_with_regex
+
+_scripts_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+_spec = importlib.util.spec_from_file_location(
+    "bench_pricing", os.path.join(_scripts_dir, "bench_pricing.py"))
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+
+def _results(**relative):
+    return {"cases": {name: {"us_per_call": 1.0, "relative": value}
+                      for name, value in relative.items()}}
+
+
+def test_catalog_is_seeded_and_mixed():
+    catalog = bench.generate_catalog(500, seed=3)
+    assert catalog == bench.generate_catalog(500, seed=3)
+    kinds = {kind for kind, *_rest in catalog}
+    assert kinds == {"gold", "silver"}
+    assert {gold_type for kind, gold_type, *_rest in catalog if kind == "gold"} == {
+        "jewellery_local", "jewellery_foreign", "bars"}
+    assert all(weight > 0 and markup >= 0 for _k, _t, _p, weight, markup in catalog)
+
+
+def test_grown_gold_page_keeps_the_recorded_price():
+    with open(bench._GOLD_PAGE, encoding="utf-8") as f:
+        page = f.read()
+    grown = bench.grow_gold_page(page, 64)
+    assert len(grown.encode("utf-8")) > 64 * 1024
+    assert parse_gold_price_with_regex(grown, bench.GOLD_REGEX) == bench.GOLD_PAGE_PRICE
+
+
+def test_compare_flags_only_significant_slowdowns():
+    baseline = _results(fast=1.0, slow=1.0, gone=1.0)
+    rows, regressions = bench.compare(_results(fast=0.5, slow=1.6, new=9.0), baseline, 0.5)
+    assert regressions == ["slow"]
+    assert [row[0] for row in rows] == ["fast", "slow"]
+    assert rows[0][3] == -0.5
+
+
+def test_stored_baseline_covers_every_case():
+    with open(bench.DEFAULT_BASELINE) as f:
+        baseline = json.load(f)
+    assert set(baseline["cases"]) == set(bench.build_cases()) - {"calibration"}
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Tests for the synthetic catalog generator and the repricing benchmark summary."""
+
+import importlib.util
+import os
+
+from jewellery_evaluator_pure.diamond_grid import (
+    DIAMOND_CLARITY_SELECTION,
+    DIAMOND_COLOR_SELECTION,
+    DIAMOND_SHAPE_SELECTION,
+)
+
+_scripts_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_scripts_dir, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+seed = _load_script("seed_catalog")
+bench = _load_script("bench_repricing")
+
+
+def test_generated_catalog_is_seeded_and_numbered():
+    first = list(seed.generate_products(200, seed=5))
+    assert first == list(seed.generate_products(200, seed=5))
+    codes = [vals["default_code"] for vals, _sizes, _on_hand in first]
+    assert codes[0] == "SEED-0000001"
+    assert len(set(codes)) == 200
+    later = next(seed.generate_products(1, seed=5, start=201))
+    assert later[0]["default_code"] == "SEED-0000201"
+
+
+def test_generated_products_are_priceable():
+    shapes = {key for key, _label in DIAMOND_SHAPE_SELECTION}
+    colors = {key for key, _label in DIAMOND_COLOR_SELECTION}
+    clarities = {key for key, _label in DIAMOND_CLARITY_SELECTION}
+    types = {}
+    for vals, sizes, on_hand in seed.generate_products(5000, seed=2):
+        jewellery_type = vals["jewellery_type"]
+        types[jewellery_type] = types.get(jewellery_type, 0) + 1
+        assert vals["jewellery_weight_g"] > 0
+        assert on_hand >= 0
+        if jewellery_type.startswith("gold"):
+            assert vals["gold_purity"] in {"21K", "18K", "24K"}
+        elif jewellery_type == "silver":
+            assert vals["silver_purity"] in {"999.0", "999.9"}
+        else:
+            assert vals["diamond_shape"] in shapes
+            assert vals["diamond_color"] in colors
+            assert vals["diamond_clarity"] in clarities
+            assert vals["diamond_carat"] > 0
+        if sizes:
+            assert jewellery_type in {"gold_local", "gold_foreign"}
+            assert set(sizes) <= set(seed.RING_SIZES)
+    assert set(types) == set(seed.TYPE_WEIGHTS)
+    # Shares follow TYPE_WEIGHTS within a few points
+    assert abs(types["gold_local"] / 5000 - 0.45) < 0.03
+    assert abs(types["silver"] / 5000 - 0.25) < 0.03
+
+
+def _run(path, duration, updated=1000, success=True, alloc=None):
+    return {"metal": "gold", "path": path, "success": success, "products_updated": updated,
+            "duration": duration, "rows_per_sec": updated / duration, "query_count": 10,
+            "peak_rss_mb": 100.0, "peak_alloc_mb": alloc}
+
+
+def test_summary_takes_medians_of_successful_runs():
+    summary = bench.summarize_runs([
+        _run("sql", 1.0), _run("sql", 2.0), _run("sql", 4.0),
+        _run("orm", 10.0, alloc=5.0), _run("orm", 0.1, updated=0, success=False),
+    ])
+    by_path = {row["path"]: row for row in summary}
+    assert by_path["sql"]["duration"] == 2.0
+    assert by_path["sql"]["rows_per_sec"] == 500.0
+    assert by_path["sql"]["peak_alloc_mb"] is None
+    assert by_path["orm"]["runs"] == 2
+    assert by_path["orm"]["failed"] == 1
+    assert by_path["orm"]["duration"] == 10.0
+    assert by_path["orm"]["peak_alloc_mb"] == 5.0
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for percentile and median consensus helpers."""
+
+import pytest
+from jewellery_evaluator_utils import median_consensus, percentile
+
+
+def test_percentile_interpolates():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([10, 20, 30], 0) == 10
+    assert percentile([10, 20, 30], 100) == 30
+    assert percentile([5.0], 95) == 5.0
+
+
+def test_percentile_rejects_empty_and_out_of_range():
+    with pytest.raises(ValueError):
+        percentile([], 50)
+    with pytest.raises(ValueError):
+        percentile([1, 2], 101)
+
+
+def test_median_consensus_accepts_close_values():
+    value, rejected = median_consensus([5400.0, 5410.0, 5420.0], 1.0)
+    assert value == 5410.0
+    assert rejected == []
+
+
+def test_median_consensus_rejects_outliers():
+    value, rejected = median_consensus([5400.0, 5410.0, 5420.0, 100.0, 9000.0], 2.0)
+    assert value == 5410.0
+    assert sorted(rejected) == [100.0, 9000.0]
+
+
+def test_median_consensus_two_sources_disagreeing_raises():
+    """Two sources further apart than the tolerance have no consensus."""
+    with pytest.raises(ValueError, match='disagree'):
+        median_consensus([5000.0, 6000.0], 2.0)
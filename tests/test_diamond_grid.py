@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for diamond price grid parsing and lookups."""
+
+import io
+import os
+
+import pytest
+from jewellery_evaluator_pure.diamond_grid import DiamondPriceGrid, GridCell, iter_grid_cells
+
+GRID_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "grids", "diamond_grid.csv")
+
+
+def load_grid():
+    with open(GRID_FILE, newline="", encoding="utf-8") as f:
+        return list(iter_grid_cells(f))
+
+
+def test_iter_grid_cells_normalizes_grades():
+    cells = load_grid()
+    assert len(cells) == 5
+    assert cells[3] == GridCell("round", "G", "VS1", 0.30, 0.39, 2100.0)
+    assert cells[3].key == ("round", "G", "VS1", 0.30)
+
+
+def test_iter_grid_cells_is_lazy():
+    lines = iter(["shape,color,clarity,carat_from,carat_to,price_per_carat\n",
+                  "round,D,IF,0.3,0.39,4200\n", "oops\n"])
+    cells = iter_grid_cells(lines)
+    assert next(cells).price_per_carat == 4200.0
+    with pytest.raises(ValueError, match="Line 3"):
+        next(cells)
+
+
+@pytest.mark.parametrize("line, message", [
+    ("square,D,IF,0.3,0.39,4200", "unknown grade"),
+    ("round,D,IF,0.3,abc,4200", "invalid number"),
+    ("round,D,IF,0.5,0.4,4200", "invalid carat band"),
+    ("round,D,IF,0.3,0.39,0", "must be positive"),
+])
+def test_iter_grid_cells_rejects_bad_lines(line, message):
+    content = "shape,color,clarity,carat_from,carat_to,price_per_carat\n" + line + "\n"
+    with pytest.raises(ValueError, match=message):
+        list(iter_grid_cells(io.StringIO(content)))
+
+
+def test_iter_grid_cells_requires_columns():
+    with pytest.raises(ValueError, match="Missing grid columns: carat_to"):
+        list(iter_grid_cells(io.StringIO("shape,color,clarity,carat_from,price_per_carat\n")))
+
+
+def test_grid_lookup_by_grade_and_band():
+    grid = DiamondPriceGrid(load_grid())
+    assert len(grid) == 5
+    assert grid.lookup(0.45, "Round", "d", "if").price_per_carat == 5100.0
+    assert grid.lookup(0.40, "round", "D", "IF").carat_from == 0.40
+    assert grid.lookup(0.69, "round", "D", "IF").price_per_carat == 7600.0
+    assert grid.price_usd(0.5, "round", "D", "IF") == 3800.0
+
+
+def test_grid_lookup_misses():
+    grid = DiamondPriceGrid(load_grid())
+    assert grid.lookup(0.25, "round", "D", "IF") is None  # below first band
+    assert grid.lookup(0.395, "round", "D", "IF") is None  # gap between bands
+    assert grid.lookup(0.8, "round", "D", "IF") is None  # above last band
+    assert grid.lookup(0.35, "oval", "D", "IF") is None  # unknown grade
+    assert grid.price_usd(0.0, "round", "D", "IF") is None
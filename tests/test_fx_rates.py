@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for rate files and rate history lookups."""
+
+import os
+from datetime import date, datetime
+
+import pytest
+from jewellery_evaluator_pure.fx_rates import RateHistory, parse_rate_file
+
+RATE_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "rates", "usd_egp.csv")
+
+
+def test_parse_rate_file_sorts_and_skips_header_comments_blanks():
+    with open(RATE_FILE, encoding="utf-8") as f:
+        points = parse_rate_file(f.read())
+    assert points == [
+        (date(2026, 3, 1), 50.35),
+        (date(2026, 3, 2), 50.41),
+        (date(2026, 3, 5), 50.9),
+    ]
+
+
+def test_parse_rate_file_last_line_for_a_date_wins():
+    assert parse_rate_file("2026-03-01,50\n2026-03-01,51\n") == [(date(2026, 3, 1), 51.0)]
+
+
+@pytest.mark.parametrize("content, message", [
+    ("2026-03-01,50\n03/02/2026,51\n", "Line 2: invalid date"),
+    ("2026-03-01,fifty\n", "Line 1: invalid rate"),
+    ("2026-03-01,0\n", "Line 1: rate must be positive"),
+    ("2026-03-01\n", "Line 1: expected"),
+])
+def test_parse_rate_file_rejects_bad_lines(content, message):
+    with pytest.raises(ValueError, match=message):
+        parse_rate_file(content)
+
+
+def test_rate_history_returns_rate_in_effect():
+    history = RateHistory([(date(2026, 3, 5), 50.9), (date(2026, 3, 1), 50.35)])
+    assert len(history) == 2
+    assert history.rate_at(date(2026, 2, 28)) is None
+    assert history.rate_at(date(2026, 3, 1)) == 50.35
+    assert history.rate_at(date(2026, 3, 4)) == 50.35
+    assert history.rate_at(datetime(2026, 3, 5, 23, 59)) == 50.9
+    assert history.rate_at(date(2027, 1, 1)) == 50.9
+
+
+def test_rate_history_default():
+    assert RateHistory([], default=1.0).rate_at(date(2026, 3, 1)) == 1.0
+
+
+def test_date_at_returns_date_of_rate_in_effect():
+    history = RateHistory([(date(2026, 3, 5), 51.0), (date(2026, 3, 1), 50.0)], default=49.0)
+    assert history.date_at(date(2026, 3, 4)) == date(2026, 3, 1)
+    assert history.date_at(datetime(2026, 3, 5, 23, 0)) == date(2026, 3, 5)
+    assert history.date_at(date(2026, 2, 28)) is None
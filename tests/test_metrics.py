@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for in-process metrics and their Prometheus rendering."""
+
+import threading
+
+import pytest
+from jewellery_evaluator_pure.metrics import Registry
+
+
+def test_counter_renders_help_type_and_labelled_samples():
+    registry = Registry()
+    fetches = registry.counter("demo_fetches_total", "Fetches.", ("source",))
+    fetches.inc(source="gold")
+    fetches.inc(2, source="gold")
+    fetches.inc(source="silver")
+    assert registry.render() == (
+        "# HELP demo_fetches_total Fetches.\n"
+        "# TYPE demo_fetches_total counter\n"
+        'demo_fetches_total{source="gold"} 3\n'
+        'demo_fetches_total{source="silver"} 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = Registry()
+    latency = registry.histogram("demo_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+    lines = registry.render({"pid": 42}).splitlines()
+    assert 'demo_seconds_bucket{pid="42",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{pid="42",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{pid="42",le="+Inf"} 4' in lines
+    assert 'demo_seconds_sum{pid="42"} 4.25' in lines
+    assert 'demo_seconds_count{pid="42"} 4' in lines
+
+
+def test_histogram_time_observes_even_on_error():
+    registry = Registry()
+    latency = registry.histogram("demo_seconds", "Latency.")
+    with pytest.raises(RuntimeError), latency.time():
+        raise RuntimeError("boom")
+    assert latency.count() == 1
+
+
+def test_gauge_is_set_and_label_values_escaped():
+    registry = Registry()
+    age = registry.gauge("demo_age_seconds", "Age.", ("metal",))
+    age.set(12.5, metal='go"ld')
+    age.set(3, metal='go"ld')
+    assert 'demo_age_seconds{metal="go\\"ld"} 3' in registry.render()
+
+
+def test_wrong_labels_and_duplicates_are_rejected():
+    registry = Registry()
+    fetches = registry.counter("demo_total", "Demo.", ("source",))
+    with pytest.raises(ValueError):
+        fetches.inc(host="x")
+    with pytest.raises(ValueError):
+        fetches.inc(-1, source="gold")
+    with pytest.raises(ValueError):
+        registry.counter("demo_total", "Again.")
+
+
+def test_counter_is_thread_safe():
+    registry = Registry()
+    hits = registry.counter("demo_hits_total", "Hits.")
+
+    def work():
+        for _i in range(1000):
+            hits.inc()
+
+    threads = [threading.Thread(target=work) for _t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert hits.value() == 8000
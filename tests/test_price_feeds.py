@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for concurrent, hedged and consensus price feed fetching."""
+
+import time
+
+import pytest
+from jewellery_evaluator_pure.price_feeds import (
+    MIN_HEDGE_SAMPLES,
+    LatencyTracker,
+    fetch_concurrently,
+    fetch_with_consensus,
+)
+
+
+def _slow(value, delay):
+    def fn():
+        time.sleep(delay)
+        return value
+    return fn
+
+
+def _failing():
+    raise ValueError('Price not found in API response (regex did not match).')
+
+
+def test_fetch_concurrently_returns_all_values():
+    """Every source that answers in time gets its value."""
+    outcomes = fetch_concurrently({
+        'gold': (_slow(5415.0, 0.01), 1.0),
+        'silver': (_slow(53.2, 0.01), 1.0),
+    })
+    assert outcomes['gold'].value == 5415.0
+    assert outcomes['silver'].value == 53.2
+    assert outcomes['gold'].error is None
+
+
+def test_fetch_concurrently_runs_sources_in_parallel():
+    """Total wall time is close to the slowest source, not the sum."""
+    started = time.monotonic()
+    fetch_concurrently({
+        'a': (_slow(1.0, 0.2), 1.0),
+        'b': (_slow(2.0, 0.2), 1.0),
+        'c': (_slow(3.0, 0.2), 1.0),
+    })
+    assert time.monotonic() - started < 0.5
+
+
+def test_slow_source_times_out_without_delaying_others():
+    """A source exceeding its own timeout is reported as failed."""
+    started = time.monotonic()
+    outcomes = fetch_concurrently({
+        'gold': (_slow(5415.0, 0.01), 1.0),
+        'silver': (_slow(53.2, 2.0), 0.1),
+    })
+    assert time.monotonic() - started < 1.0
+    assert outcomes['gold'].value == 5415.0
+    assert outcomes['silver'].value is None
+    assert 'timed out' in outcomes['silver'].error
+
+
+def test_failing_source_reports_error():
+    """Exceptions are captured in the outcome instead of propagating."""
+    outcomes = fetch_concurrently({'gold': (_failing, 1.0)})
+    assert outcomes['gold'].value is None
+    assert 'regex did not match' in outcomes['gold'].error
+
+
+def test_no_jobs_returns_empty():
+    assert fetch_concurrently({}) == {}
+
+
+def _tracker_with_p95(key, seconds):
+    tracker = LatencyTracker()
+    for _ in range(MIN_HEDGE_SAMPLES):
+        tracker.record(key, seconds)
+    return tracker
+
+
+def test_hedge_delay_defaults_without_samples():
+    """Too few samples fall back to the default hedge delay."""
+    tracker = LatencyTracker()
+    tracker.record('primary', 0.1)
+    assert tracker.hedge_delay('primary', default=1.5) == 1.5
+
+
+def test_hedged_fetch_skips_backup_when_primary_is_fast():
+    """The backup is never fired when the primary answers within its p95."""
+    calls = []
+
+    def backup():
+        calls.append('backup')
+        return 9999.0
+
+    result = fetch_with_consensus(
+        [('primary', _slow(5415.0, 0.01)), ('backup', backup)],
+        timeout=1.0,
+        tracker=_tracker_with_p95('primary', 0.5),
+    )
+    assert result.value == 5415.0
+    assert calls == []
+
+
+def test_hedged_fetch_fires_backup_after_p95_delay():
+    """A slow primary is hedged: the backup answer wins."""
+    started = time.monotonic()
+    result = fetch_with_consensus(
+        [('primary', _slow(5415.0, 1.0)), ('backup', _slow(5420.0, 0.01))],
+        timeout=2.0,
+        tracker=_tracker_with_p95('primary', 0.05),
+    )
+    assert result.value == 5420.0
+    assert time.monotonic() - started < 0.5
+
+
+def test_hedged_fetch_fails_over_immediately_on_error():
+    """A failing primary triggers the backup without waiting for the hedge delay."""
+    started = time.monotonic()
+    result = fetch_with_consensus(
+        [('primary', _failing), ('backup', _slow(5420.0, 0.01))],
+        timeout=5.0,
+        tracker=_tracker_with_p95('primary', 3.0),
+    )
+    assert result.value == 5420.0
+    assert time.monotonic() - started < 0.5
+
+
+def test_median_mode_rejects_outlier():
+    """Median mode queries every source and drops values beyond the tolerance."""
+    result = fetch_with_consensus(
+        [
+            ('a', _slow(5400.0, 0.01)),
+            ('b', _slow(5410.0, 0.01)),
+            ('c', _slow(9000.0, 0.01)),
+        ],
+        timeout=1.0,
+        mode='median',
+        tolerance_pct=2.0,
+    )
+    assert result.value == 5405.0
+    assert result.rejected == [9000.0]
+
+
+def test_consensus_raises_when_no_source_answers():
+    """ValueError lists each source's error when nothing returns a price."""
+    with pytest.raises(ValueError, match='No gold price source returned a price'):
+        fetch_with_consensus([('a', _failing)], timeout=1.0)
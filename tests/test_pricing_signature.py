@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for the pricing-input signature used for change detection."""
+
+from jewellery_evaluator_utils import GOLD_MARKUP_PARAM_KEYS, compute_pricing_signature
+
+
+def test_signature_ignores_float_formatting():
+    """'80' and 80.0 are the same markup."""
+    assert compute_pricing_signature([5415, '80']) == compute_pricing_signature([5415.0, '80.0'])
+
+
+def test_signature_changes_with_any_input():
+    base = compute_pricing_signature([5415.0, 80.0, 50.0])
+    assert compute_pricing_signature([5416.0, 80.0, 50.0]) != base
+    assert compute_pricing_signature([5415.0, 81.0, 50.0]) != base
+    assert compute_pricing_signature([5415.0, 80.0, 51.0]) != base
+
+
+def test_signature_keeps_non_numeric_values():
+    assert compute_pricing_signature(['first', 1]) != compute_pricing_signature(['median', 1])
+
+
+def test_gold_markup_keys_cover_all_bar_tiers():
+    assert 'jewellery_evaluator.markup_jewellery_local' in GOLD_MARKUP_PARAM_KEYS
+    assert 'jewellery_evaluator.markup_bars_1000g' in GOLD_MARKUP_PARAM_KEYS
+    assert len(GOLD_MARKUP_PARAM_KEYS) == 13
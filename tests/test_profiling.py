@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for sampled call profiling."""
+
+import marshal
+import pstats
+
+from jewellery_evaluator_pure.profiling import CallProfiler, should_sample
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def test_should_sample_bounds():
+    assert not should_sample(0.0, rand=lambda: 0.0)
+    assert should_sample(1.0, rand=lambda: 0.999)
+    assert should_sample(0.25, rand=lambda: 0.2)
+    assert not should_sample(0.25, rand=lambda: 0.3)
+
+
+def test_profile_dump_is_loadable_by_pstats(tmp_path):
+    with CallProfiler() as profiler:
+        busy(1000)
+    assert profiler.active
+    assert profiler.elapsed > 0
+    path = tmp_path / "run.prof"
+    path.write_bytes(profiler.dump())
+    stats = pstats.Stats(str(path))
+    assert any(name == "busy" for _file, _line, name in stats.stats)
+    assert isinstance(marshal.loads(path.read_bytes()), dict)
+
+
+def test_summary_lists_top_functions():
+    with CallProfiler() as profiler:
+        busy(1000)
+    summary = profiler.summary(top_n=5)
+    assert "busy" in summary
+    assert "cumulative" in summary
+
+
+def test_nested_profiler_stays_idle():
+    with CallProfiler() as outer:
+        with CallProfiler() as inner:
+            busy(10)
+    assert outer.active
+    assert not inner.active
+    assert inner.dump() == b""
+    assert inner.summary() == ""
+    with CallProfiler() as after:
+        busy(10)
+    assert after.active
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Offline fetch path: replay feed server, recorded pages and benchmark harness."""
+
+import importlib.util
+import os
+import time
+
+import pytest
+import requests
+from jewellery_evaluator_pure import metrics, run_stats
+from jewellery_evaluator_pure.price_feeds import fetch_gold_price
+
+_scripts_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_scripts_dir, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+replay = _load_script("replay_feed_server")
+bench = _load_script("bench_fetch")
+
+
+def _server(**profile):
+    return replay.ReplayFeedServer(replay.FeedProfile(**profile), seed=7)
+
+
+def test_recorded_gold_page_parses_with_module_fetch():
+    """The recorded gold page yields the 21K price through fetch_gold_price."""
+    with _server() as server:
+        assert fetch_gold_price(server.url("/gold"), bench.GOLD_REGEX, timeout=5) == 5415.0
+
+
+def test_module_fetch_records_bytes_and_parse_stage():
+    """A recording run counts the response bytes and times parsing separately."""
+    stats = run_stats.RunStats()
+    with _server() as server, run_stats.recording(stats):
+        with run_stats.stage("fetch"):
+            fetch_gold_price(server.url("/gold"), bench.GOLD_REGEX, timeout=5)
+    summary = stats.as_dict()
+    assert summary["bytes_fetched"] > 0
+    assert summary["timings"]["fetch"] > 0
+    assert summary["timings"]["parse"] > 0
+
+
+def test_module_fetch_observes_latency_by_outcome():
+    """Gold fetches are counted per host and outcome."""
+    with _server() as server:
+        host = "127.0.0.1"
+        before = metrics.PRICE_FETCH_SECONDS.count(source="gold", host=host, outcome="ok")
+        fetch_gold_price(server.url("/gold"), bench.GOLD_REGEX, timeout=5)
+    after = metrics.PRICE_FETCH_SECONDS.count(source="gold", host=host, outcome="ok")
+    assert after == before + 1
+
+
+def test_recorded_silver_page_parses_price_cell():
+    """The scraper's price cell (first row, third column) holds the silver 999 price."""
+    with _server() as server:
+        assert bench.fetch_silver_static(server.url("/silver"), timeout=5) == 53.2
+
+
+def test_error_rate_returns_http_errors():
+    with _server(error_rate=1.0) as server:
+        with pytest.raises(requests.exceptions.HTTPError):
+            fetch_gold_price(server.url("/gold"), bench.GOLD_REGEX, timeout=5)
+
+
+def test_broken_page_fails_parsing():
+    """A 200 answer without a price surfaces as a parse error, not a bogus price."""
+    with _server(broken_rate=1.0) as server:
+        with pytest.raises(ValueError):
+            fetch_gold_price(server.url("/gold"), bench.GOLD_REGEX, timeout=5)
+        assert bench.fetch_silver_static(server.url("/silver"), timeout=5) is None
+
+
+def test_latency_and_padding_are_applied():
+    with _server(latency_ms=80, pad_kb=32) as server:
+        started = time.monotonic()
+        response = requests.get(server.url("/gold"), timeout=5)
+        assert time.monotonic() - started >= 0.08
+        assert len(response.content) > 32 * 1024
+        assert "عيار 21 هو 5415" in response.text
+        assert server.requests["/gold"] == 1
+
+
+def test_benchmark_reports_fallbacks():
+    """Every failed fetch is counted as a fallback with its failure kind."""
+    with _server(error_rate=1.0) as server:
+        results = bench.run_benchmark(
+            server.url("/gold"), server.url("/silver"), 3, gold_timeout=5, silver_timeout=5)
+    assert results["gold"]["fallback_rate"] == 1.0
+    assert results["gold"]["failures"] == {"http_error": 3}
+    assert results["tick"]["failures"] == {"gold": 3, "silver": 3}
+    assert results["tick"]["p50_ms"] > 0
+
+
+def test_parse_price_text():
+    """Scraped cell text is reduced to its number."""
+    assert bench.parse_price_text("53.20 EGP") == 53.2
+    assert bench.parse_price_text("1,234.50 EGP") == 1234.5
+    assert bench.parse_price_text("--") is None
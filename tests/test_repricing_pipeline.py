@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for the streaming repricing pipeline stages."""
+
+import re
+
+from jewellery_evaluator_pure.repricing_pipeline import (
+    CopyPriceWriter,
+    ValuesPriceWriter,
+    compute_gold_prices,
+    compute_silver_prices,
+    gold_markup_resolver,
+    iter_row_chunks,
+)
+from jewellery_evaluator_pure.utils import (
+    BAR_TIER_DEFAULT_MARKUP,
+    compute_gold_product_price,
+    compute_silver_product_price,
+)
+
+
+class FakeCursor:
+    """Serves preset rows to DECLARE/FETCH and records every statement."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+        self.rowcount = -1
+        self._result = []
+        self.copied = []
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+        fetch = re.match(r'FETCH FORWARD (\d+)', query)
+        if fetch:
+            size = int(fetch.group(1))
+            self._result, self.rows = self.rows[:size], self.rows[size:]
+        elif query.startswith('UPDATE') and '::int' in query:
+            self.rowcount = query.count('::int')
+        elif query.startswith('UPDATE'):
+            self.rowcount = len(self.copied)
+
+    def copy_expert(self, query, data):
+        self.statements.append((query, None))
+        self.copied.extend(line.split('\t') for line in data.read().splitlines())
+
+    def fetchall(self):
+        result, self._result = self._result, []
+        return result
+
+
+def test_iter_row_chunks_fetches_in_chunks_and_closes():
+    cursor = FakeCursor([(i,) for i in range(5)])
+    chunks = list(iter_row_chunks(cursor, 'c1', 'SELECT id FROM t WHERE x = %s', [1], chunk_size=2))
+    assert chunks == [[(0,), (1,)], [(2,), (3,)], [(4,)]]
+    queries = [query for query, _params in cursor.statements]
+    assert queries[0] == 'DECLARE c1 NO SCROLL CURSOR FOR SELECT id FROM t WHERE x = %s'
+    assert cursor.statements[0][1] == [1]
+    assert queries[-1] == 'CLOSE c1'
+
+
+def test_iter_row_chunks_is_lazy():
+    cursor = FakeCursor([(i,) for i in range(10)])
+    chunks = iter_row_chunks(cursor, 'c1', 'SELECT id FROM t', [], chunk_size=3)
+    assert cursor.statements == []
+    next(chunks)
+    assert len(cursor.statements) == 2  # DECLARE + first FETCH only
+
+
+def test_gold_markup_resolver():
+    markup_for = gold_markup_resolver(40.0, 55.0, BAR_TIER_DEFAULT_MARKUP)
+    assert markup_for('gold_local', 12.0) == 40.0
+    assert markup_for('gold_foreign', 12.0) == 55.0
+    assert markup_for('gold_bars', 3.0) == 200.0
+    assert markup_for('gold_bars', 1200.0) == 80.0
+    assert markup_for('silver', 12.0) == 0.0
+
+
+def test_compute_gold_prices_matches_helper_and_skips_like_orm():
+    markup_for = gold_markup_resolver(40.0, 0.0, BAR_TIER_DEFAULT_MARKUP)
+    chunks = [
+        [(1, 'gold_local', '21K', 10.0), (2, 'gold_foreign', '21K', 10.0)],  # 2: no markup
+        [(3, 'gold_bars', '24K', 31.0), (4, 'gold_local', '14K', 5.0)],  # 4: invalid purity
+    ]
+    rows = list(compute_gold_prices(chunks, 5000.0, markup_for))
+    cost, sale, min_sale = compute_gold_product_price(5000.0, '21K', 10.0, 40.0)
+    bar_cost, bar_sale, bar_min = compute_gold_product_price(5000.0, '24K', 31.0, 115.0)
+    assert rows == [(1, sale, cost, min_sale), (3, bar_sale, bar_cost, bar_min)]
+
+
+def test_compute_silver_prices():
+    rows = list(compute_silver_prices([[(7, 20.0), (8, 0.0)]], 55.0, 3.0))
+    cost, sale, min_sale = compute_silver_product_price(55.0, 20.0, 3.0)
+    assert rows == [(7, sale, cost, min_sale)]
+
+
+def test_values_writer_buffers_and_flushes():
+    cursor = FakeCursor()
+    with ValuesPriceWriter(cursor, ['list_price', 'cost'], uid=2, buffer_size=2) as writer:
+        writer.write_many([(1, 100.0, 90.0), (2, 200.0, 180.0), (3, 300.0, 270.0)])
+        assert len(cursor.statements) == 1
+    assert len(cursor.statements) == 2
+    assert writer.updated == 3
+    query, params = cursor.statements[0]
+    assert query.startswith('UPDATE product_template AS t SET list_price = v.v0, cost = v.v1, write_uid = %s')
+    assert 'AS v(id, v0, v1) WHERE t.id = v.id' in query
+    assert query.count('%s') == len(params)
+    assert params == [2, 1, 100.0, 90.0, 2, 200.0, 180.0]
+
+
+def test_values_writer_does_not_flush_on_error():
+    cursor = FakeCursor()
+    try:
+        with ValuesPriceWriter(cursor, ['list_price'], uid=2) as writer:
+            writer.write((1, 100.0))
+            raise RuntimeError('compute failed')
+    except RuntimeError:
+        pass
+    assert cursor.statements == []
+
+
+def test_copy_writer_copies_blocks_then_updates_once():
+    cursor = FakeCursor()
+    with CopyPriceWriter(cursor, ['list_price', 'cost'], uid=2, buffer_size=2) as writer:
+        writer.write_many([(1, 100.0, 90.0), (2, 200.5, None), (3, 300.0, 270.0)])
+    queries = [query for query, _params in cursor.statements]
+    assert queries[:2] == [
+        'DROP TABLE IF EXISTS jewellery_price_apply',
+        'CREATE TEMP TABLE jewellery_price_apply (id int4 NOT NULL, v0 numeric, v1 numeric) '
+        'ON COMMIT DROP',
+    ]
+    assert queries.count('COPY jewellery_price_apply (id, v0, v1) FROM STDIN') == 2
+    updates = [statement for statement in cursor.statements if statement[0].startswith('UPDATE')]
+    assert len(updates) == 1
+    assert updates[0][0].endswith('FROM jewellery_price_apply AS v WHERE t.id = v.id')
+    assert updates[0][1] == [2]
+    assert queries[-1] == 'DROP TABLE jewellery_price_apply'
+    assert cursor.copied == [['1', '100.0', '90.0'], ['2', '200.5', '\\N'], ['3', '300.0', '270.0']]
+    assert writer.updated == 3
+
+
+def test_copy_writer_without_rows_touches_nothing():
+    cursor = FakeCursor()
+    with CopyPriceWriter(cursor, ['list_price'], uid=2) as writer:
+        writer.write_many([])
+    assert cursor.statements == []
+    assert writer.updated == 0
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Revenax Digital Services
+# Author: Mohamed A. Abdallah
+# Website: https://www.revenax.com
+
+"""Unit tests for pricing run instrumentation."""
+
+from jewellery_evaluator_pure import run_stats
+from jewellery_evaluator_pure.run_stats import RunStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.queries = 0
+
+    def __call__(self):
+        return self.now
+
+    def tick(self, seconds, queries=0):
+        self.now += seconds
+        self.queries += queries
+
+
+def make_stats():
+    clock = FakeClock()
+    return RunStats(query_count=lambda: clock.queries, clock=clock), clock
+
+
+def test_stage_charges_time_and_queries():
+    stats, clock = make_stats()
+    with stats.stage("search"):
+        clock.tick(0.5, queries=2)
+    clock.tick(1.0, queries=7)  # outside any stage
+    summary = stats.as_dict()
+    assert summary["timings"]["search"] == 0.5
+    assert summary["queries"]["search"] == 2
+    assert summary["query_count"] == 2
+    assert summary["duration"] == 1.5
+
+
+def test_nested_stages_are_exclusive():
+    stats, clock = make_stats()
+    with stats.stage("fetch"):
+        clock.tick(1.0, queries=1)
+        with stats.stage("parse"):
+            clock.tick(0.25)
+        clock.tick(0.5, queries=1)
+    summary = stats.as_dict()
+    assert summary["timings"]["fetch"] == 1.5
+    assert summary["timings"]["parse"] == 0.25
+    assert summary["queries"]["fetch"] == 2
+    assert summary["queries"]["parse"] == 0
+
+
+def test_repeated_stage_accumulates():
+    stats, clock = make_stats()
+    for _batch in range(3):
+        with stats.stage("write"):
+            clock.tick(0.1, queries=1)
+    assert stats.as_dict()["queries"]["write"] == 3
+    assert round(stats.as_dict()["timings"]["write"], 6) == 0.3
+
+
+def test_module_helpers_are_noops_without_recording():
+    assert run_stats.current() is None
+    with run_stats.stage("fetch"):
+        run_stats.add_bytes(10)
+        run_stats.mark_fallback()
+    assert run_stats.current() is None
+
+
+def test_module_helpers_record_into_active_run():
+    stats, clock = make_stats()
+    with run_stats.recording(stats):
+        assert run_stats.current() is stats
+        with run_stats.stage("compute"):
+            clock.tick(2.0)
+        run_stats.add_bytes(1024)
+        run_stats.add_bytes(512)
+        run_stats.mark_fallback()
+    assert run_stats.current() is None
+    summary = stats.as_dict()
+    assert summary["timings"]["compute"] == 2.0
+    assert summary["bytes_fetched"] == 1536
+    assert summary["fallback_used"] is True
+    assert summary["price_age"] is None
+
+
+def test_stage_is_closed_on_error():
+    stats, clock = make_stats()
+    try:
+        with stats.stage("write"):
+            clock.tick(0.75)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    clock.tick(1.0)
+    assert stats.as_dict()["timings"]["write"] == 0.75